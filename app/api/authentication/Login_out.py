@@ -1,12 +1,17 @@
 from fastapi import APIRouter,Depends,HTTPException,status,Request,Form
 from fastapi.security import OAuth2PasswordRequestForm,OAuth2PasswordBearer
 from sqlalchemy.orm import Session
-from app.core.database import get_db
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.database import get_db,get_async_db
 from app.models.login_user import LoginUser
 
-from app.core.security import verify_password,create_access_token
+from app.core.security import verify_password_async,create_access_token
 from datetime import datetime,timedelta
 from app.core.security import get_current_user,decode_jwt
+from app.core.revocation import revocation_store,token_jti
+from app.core.principal_cache import principal_cache
+from app.core.activity_tracker import activity_tracker
 from jose import JWTError
 import pytz
 oauth2_scheme=OAuth2PasswordBearer(tokenUrl="/login")
@@ -34,33 +39,38 @@ class OAuth2PasswordRequestFormWithRemember(OAuth2PasswordRequestForm):
             500: {"description": "Internal Server Error - Login failed"},
     }            
 )
-def login(
+async def login(
     request: OAuth2PasswordRequestFormWithRemember = Depends(),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
  
 ):
     try:
-        user = db.query(LoginUser).filter(LoginUser.email == request.username).first()
+        result = await db.execute(select(LoginUser).filter(LoginUser.email == request.username))
+        user = result.scalars().first()
 
-        if not user or not verify_password(request.password, user.hashed_password):
+        # bcrypt runs in the hashing pool, not on the event loop / shared threadpool
+        if not user or not await verify_password_async(request.password, user.hashed_password):
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Invalid credentials",
                 headers={"WWW-Authenticate": "Bearer"},
             )
         access_token_expires = timedelta(days=30) if request.remember_me else timedelta(hours=1)
-        user.last_activity = datetime.now()
-        db.commit()
-
         access_token = create_access_token(data={"sub": request.username,"role":user.role,"user_id":user.user_id,"name":user.First_name},expries_delta=access_token_expires)
-
-        return {
+        response = {
             "user_id":user.user_id,
             "name":user.First_name,
             "role":user.role,
             "access_token": access_token,
             "token_type": "Bearer"
         }
+
+        # Buffered; written in batches by the activity tracker
+        activity_tracker.touch(user.user_table_id)
+
+        return response
+    except HTTPException as e:
+        raise e
     except Exception as e:
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=f"An unexpected error occurred during login. Please try again later.")
 
@@ -82,17 +92,23 @@ def logout(
     try:
         
         token_data = decode_jwt(token)
+        jti = token_jti(token_data, token)
+        if revocation_store.is_revoked(jti):
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Token has already been invalidated.")
+
         now_user = db.query(LoginUser).filter(LoginUser.email == token_data["sub"]).first()
 
         if now_user is None:
             raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Token is valid but no matching user found.")
 
-        if now_user.last_activity and abs(datetime.now() - now_user.last_activity) > timedelta(days=1):
+        last_activity = activity_tracker.last_activity(now_user.user_table_id, now_user.last_activity)
+        if last_activity and abs(datetime.now() - last_activity) > timedelta(days=1):
             raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="User has been inactive for more than one day.")
 
-        
-
         exp = token_data.get("exp")
+        revocation_store.revoke(jti, datetime.utcfromtimestamp(exp), user_id=token_data.get("user_id"))
+        principal_cache.invalidate_token(token)
+
         expires_at_utc = datetime.utcfromtimestamp(exp).replace(tzinfo=pytz.UTC)
 
         ist = pytz.timezone("Asia/Kolkata")
@@ -122,12 +138,10 @@ def logout(
     }
 )
 def check_user(
-    current_user: LoginUser = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: LoginUser = Depends(get_current_user)
 ):
     try:
-        current_user.last_activity = datetime.utcnow()
-        db.commit()
+        activity_tracker.touch(current_user.user_table_id)
         return {
             "user_id": current_user.user_id,
             "email": current_user.email,
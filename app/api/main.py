@@ -5,6 +5,8 @@ from app.api.routers import Customer
 from app.api.routers import Customerkyc
 from app.api.routers import AccountRouter
 from app.api.routers import LoanRouter
+from app.api.routers import MetricsRouter
+from app.api.routers import ReconciliationRouter
 
 api_router=APIRouter()
 api_router.include_router(Login_out.router,tags=["Login"])
@@ -13,3 +15,5 @@ api_router.include_router(Customer.router,tags=["Customer"])
 api_router.include_router(Customerkyc.router,tags=["Customer KYC"])
 api_router.include_router(AccountRouter.router,tags=["Accounts"])
 api_router.include_router(LoanRouter.router,tags=["Loans"])
+api_router.include_router(MetricsRouter.router,tags=["Metrics"])
+api_router.include_router(ReconciliationRouter.router,tags=["Reconciliation"])
@@ -1,5 +1,7 @@
-from fastapi import APIRouter, Depends, HTTPException, Form, status,Query
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Form, Header, status,Query,Request
+from fastapi.responses import StreamingResponse
+from sqlalchemy import String, literal, select, tuple_, type_coerce
+from sqlalchemy.orm import Session, joinedload
 from app.core.database import get_db
 from app.models.CustomerModel import Customer
 from app.models.AccountModel import Account, AccountTypeEnum
@@ -7,20 +9,46 @@ from app.models.TransactionModel import Transaction, TransactionTypeEnum
 from app.models.login_user import LoginUser
 from app.function.validation import validate_email, validate_phone_number
 from app.core.security import get_current_user
-import random
+from app.core.query_stats import query_budget
+from app.core.idempotency import idempotency_store
+from app.core.balance_cache import balance_cache, BalanceEntry
+from app.core.hot_accounts import hot_accounts
+from app.core.group_commit import group_commit
+from app.core.velocity import velocity_guard
+from app.function.account_number import account_numbers, is_valid_account_number
+from app.function.ledger import post_movement, post_credit, post_batch, BatchLine, BatchConflict, IN_CHUNK, transfer, fold_slots, set_balance_slots, slot_total
+from app.function.pagination import encode_cursor, decode_cursor
+from app.function.statement import StatementFormat, MEDIA_TYPES, STATEMENT_COLUMNS, stream_statement
+from app.core.archive import archive_table, archived_months
+from app.core.config import settings
+from enum import Enum
+from datetime import datetime, timezone
+from typing import Optional
+import csv
+import io
+import json
 
 router = APIRouter(prefix="/accounts")
 
-def generate_account_number():
-    # Example: 12-digit random number
-    return str(random.randint(100000000000, 999999999999))
+def check_account_number(account_number: str):
+    # Rejects typos via the check digit without a database round trip
+    if not is_valid_account_number(account_number):
+        raise HTTPException(status_code=400, detail=f"Invalid account number {account_number}")
 
-@router.post("/create", status_code=status.HTTP_201_CREATED)
+def run_posting(db: Session, idempotency_key: Optional[str], posting):
+    # Keyed requests post on their own session so the idempotency record commits with them;
+    # the rest join the group commit and share one commit (and fsync) per batch
+    if settings.GROUP_COMMIT_ENABLED and not idempotency_key:
+        return group_commit.submit(posting)
+    return posting(db)
+
+@router.post("/create", status_code=status.HTTP_201_CREATED, dependencies=[Depends(query_budget(14))])
 def create_account(
     customer_code: str = Form(...),
     account_type: AccountTypeEnum = Form(...),
     initial_deposit: float = Form(...),
     secret_code: str = Form(...),
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key", max_length=255),
     db: Session = Depends(get_db),
     current_user: LoginUser = Depends(get_current_user)
 ):
@@ -45,91 +73,108 @@ def create_account(
             detail=f"Minimum initial deposit for {account_type.value} is {min_deposit}"
         )
 
-    # 3️⃣ Generate account number
-    account_number = generate_account_number()
-
-    # 4️⃣ Create account
-    new_account = Account(
-        account_number=account_number,
-        customer_id=customer.customer_table_id,
-        secret_code=secret_code,
-        account_type=account_type,
-        balance=initial_deposit
-    )
-    db.add(new_account)
-    db.commit()
-    db.refresh(new_account)
-
-    # 5️⃣ Log initial deposit as transaction
-    transaction = Transaction(
-        account_id=new_account.account_id,
-        transaction_type="Deposit",
-        amount=initial_deposit,
-        description="Initial deposit"
+    request_hash = idempotency_store.fingerprint(
+        customer_code=customer_code, account_type=account_type.value,
+        initial_deposit=initial_deposit, secret_code=secret_code,
     )
-    
-    db.add(transaction)
-    db.commit()
+    with idempotency_store.guard(
+        db, idempotency_key, f"create:{current_user.user_table_id}", request_hash, status.HTTP_201_CREATED
+    ) as guard:
+        if guard.replay is not None:
+            return guard.replay  # 🔁 retried request: same account, not a second one
 
-    return {
-        "status": "success",
-        "message": f"{account_type.value} account created for {customer.first_name}",
-        "data": {
-            "account_number": new_account.account_number,
-            "account_type": new_account.account_type,
-            "balance": new_account.balance
-        }
-    }
+        # 3️⃣ Take a pre-validated, unique account number from the pool
+        account_number = account_numbers.take(db)
 
+        # 4️⃣ Create account
+        new_account = Account(
+            account_number=account_number,
+            customer_id=customer.customer_table_id,
+            secret_code=secret_code,
+            account_type=account_type,
+            balance=initial_deposit
+        )
+        db.add(new_account)
+        db.flush()  # assigns account_id
+        account_id, owner_login_id = new_account.account_id, customer.login_id
 
+        # 5️⃣ Log initial deposit as transaction (same commit as the account)
+        transaction = Transaction(
+            account_id=new_account.account_id,
+            transaction_type="Deposit",
+            amount=initial_deposit,
+            description="Initial deposit"
+        )
+        db.add(transaction)
+        customer_name = customer.first_name
 
-@router.post("/deposit", status_code=status.HTTP_200_OK)
+        response = guard.commit({
+            "status": "success",
+            "message": f"{account_type.value} account created for {customer_name}",
+            "data": {
+                "account_number": account_number,
+                "account_type": account_type.value,
+                "balance": initial_deposit
+            }
+        })
+        if guard.committed:
+            balance_cache.put(account_number, BalanceEntry(account_id, owner_login_id, initial_deposit, 0))
+        return response
+
+
+
+@router.post("/deposit", status_code=status.HTTP_200_OK, dependencies=[Depends(query_budget(8))])
 def deposit_amount(
     account_number: str = Form(...),
     amount: float = Form(...),
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key", max_length=255),
     db: Session = Depends(get_db)
 ):
-    # Fetch account
-    account = db.query(Account).filter(Account.account_number == account_number).first()
-    if not account:
-        raise HTTPException(status_code=404, detail=f"Account {account_number} not found")
+    check_account_number(account_number)
     if amount <= 0:
         raise HTTPException(status_code=400, detail="Deposit amount must be greater than zero")
 
-    # Update balance
-    account.balance += amount
-    db.add(account)
+    request_hash = idempotency_store.fingerprint(account_number=account_number, amount=amount)
+    with idempotency_store.guard(db, idempotency_key, f"deposit:{account_number}", request_hash, status.HTTP_200_OK) as guard:
+        if guard.replay is not None:
+            return guard.replay
 
-    # Log transaction
-    transaction = Transaction(
-        account_id=account.account_id,
-        transaction_type="Deposit",
-        amount=amount,
-        description="Deposit"
-    )
-    db.add(transaction)
-    db.commit()
-    db.refresh(account)
+        # Atomic balance (or hot-account slot) update + transaction row (+ idempotency record), one commit
+        result = run_posting(db, idempotency_key, lambda session: post_credit(
+            session, amount, "Deposit", account_number, shard_key=idempotency_key, commit=False
+        ))
+        if not result.applied:
+            raise HTTPException(status_code=404, detail=f"Account {account_number} not found")
 
-    return {
-        "status": "success",
-        "message": f"Deposited {amount} to account {account_number}",
-        "data": {
-            "account_number": account.account_number,
-            "balance": account.balance
-        }
-    }
+        response = guard.commit({
+            "status": "success",
+            "message": f"Deposited {amount} to account {account_number}",
+            "data": {
+                "account_number": account_number,
+                "balance": result.balance
+            }
+        })
+        if guard.committed and result.version is not None:
+            balance_cache.apply(account_number, result.balance, result.version)  # write-through
+        return response
     
-@router.post("/withdraw", status_code=status.HTTP_200_OK)
+@router.post("/withdraw", status_code=status.HTTP_200_OK, dependencies=[Depends(query_budget(9))])
 def withdraw_amount(
     account_number: str = Form(...),
     amount: float = Form(...),
     secret_code: str = Form(...),
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key", max_length=255),
     db: Session = Depends(get_db),
     current_user: LoginUser = Depends(get_current_user)
 ):
+    check_account_number(account_number)
     # Fetch account
-    account = db.query(Account).filter(Account.account_number == account_number).first()
+    account = (
+        db.query(Account)
+        .options(joinedload(Account.customer))
+        .filter(Account.account_number == account_number)
+        .first()
+    )
     if not account:
         raise HTTPException(status_code=404, detail=f"Account {account_number} not found")
     if account.secret_code != secret_code:
@@ -139,91 +184,481 @@ def withdraw_amount(
     if amount <= 0:
         raise HTTPException(status_code=400, detail="Withdrawal amount must be greater than zero")
 
-    if amount > account.balance:
-        raise HTTPException(status_code=400, detail="Insufficient balance")
+    request_hash = idempotency_store.fingerprint(account_number=account_number, amount=amount)
+    with idempotency_store.guard(
+        db, idempotency_key, f"withdraw:{current_user.user_table_id}", request_hash, status.HTTP_200_OK
+    ) as guard:
+        if guard.replay is not None:
+            return guard.replay
+
+        # 🚦 Velocity limits from in-memory sliding windows, no query
+        admission = velocity_guard.admit(account.account_id, current_user.user_table_id, amount)
+        if admission.rejected:
+            raise HTTPException(status_code=429, detail=f"Withdrawal limit reached: {admission.rejected}")
+
+        def posting(session: Session):
+            if account.balance_slots:
+                fold_slots(session, account.account_id)  # 🔥 hot account: consolidate slot credits under lock first
+            # Conditional UPDATE: 0 rows affected means the balance would go negative
+            return post_movement(session, -amount, "Withdrawal", account_id=account.account_id, commit=False)
+
+        try:
+            result = run_posting(db, idempotency_key, posting)
+            if not result.applied:
+                raise HTTPException(status_code=400, detail="Insufficient balance")
+
+            response = guard.commit({
+                "status": "success",
+                "message": f"Withdrawn {amount} from account {account_number}",
+                "data": {
+                    "account_number": account_number,
+                    "balance": result.balance
+                }
+            })
+        finally:
+            if not guard.committed:
+                velocity_guard.cancel(admission)  # only committed withdrawals count
+        if guard.committed:
+            balance_cache.apply(account_number, result.balance, result.version)  # write-through
+        return response
+
 
-    # Update balance
-    account.balance -= amount
-    db.add(account)
 
-    # Log transaction
-    transaction = Transaction(
-        account_id=account.account_id,
-        transaction_type="Withdrawal",
-        amount=amount,
-        description="Withdrawal"
+@router.post("/transfer", status_code=status.HTTP_200_OK, dependencies=[Depends(query_budget(10))])
+def transfer_amount(
+    from_account_number: str = Form(...),
+    to_account_number: str = Form(...),
+    amount: float = Form(...),
+    secret_code: str = Form(...),
+    description: str = Form(None),
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key", max_length=255),
+    db: Session = Depends(get_db),
+    current_user: LoginUser = Depends(get_current_user)
+):
+    check_account_number(from_account_number)
+    check_account_number(to_account_number)
+    if from_account_number == to_account_number:
+        raise HTTPException(status_code=400, detail="Cannot transfer to the same account")
+    if amount <= 0:
+        raise HTTPException(status_code=400, detail="Transfer amount must be greater than zero")
+
+    # Resolve both accounts (and the sender's owner) in one query
+    rows = db.query(
+        Account.account_id, Account.account_number, Account.secret_code, Account.status, Account.balance_slots,
+        Customer.login_id
+    ).join(Customer, Account.customer_id == Customer.customer_table_id).filter(
+        Account.account_number.in_([from_account_number, to_account_number])
+    ).all()
+    accounts = {row.account_number: row for row in rows}
+
+    source = accounts.get(from_account_number)
+    target = accounts.get(to_account_number)
+    if not source:
+        raise HTTPException(status_code=404, detail=f"Account {from_account_number} not found")
+    if not target:
+        raise HTTPException(status_code=404, detail=f"Account {to_account_number} not found")
+    if source.secret_code != secret_code:
+        raise HTTPException(status_code=403, detail="Invalid secret code")
+    if source.login_id != current_user.user_table_id:
+        raise HTTPException(status_code=403, detail="Not authorized to transfer from this account")
+    if source.status != "Active" or target.status != "Active":
+        raise HTTPException(status_code=400, detail="Both accounts must be active")
+
+    request_hash = idempotency_store.fingerprint(
+        from_account_number=from_account_number, to_account_number=to_account_number,
+        amount=amount, description=description,
     )
-    db.add(transaction)
-    db.commit()
-    db.refresh(account)
+    with idempotency_store.guard(
+        db, idempotency_key, f"transfer:{current_user.user_table_id}", request_hash, status.HTTP_200_OK
+    ) as guard:
+        if guard.replay is not None:
+            return guard.replay
+
+        # 🚦 The debit leg counts against the same velocity limits as a withdrawal
+        admission = velocity_guard.admit(source.account_id, current_user.user_table_id, amount)
+        if admission.rejected:
+            raise HTTPException(status_code=429, detail=f"Withdrawal limit reached: {admission.rejected}")
+
+        try:
+            # Both legs (+ idempotency record) in one commit
+            result = transfer(
+                db, source.account_id, target.account_id, amount,
+                description or f"Transfer {from_account_number} -> {to_account_number}",
+                fold_source=bool(source.balance_slots), commit=False
+            )
+            if not result.applied:
+                raise HTTPException(status_code=400, detail="Insufficient balance")
+
+            response = guard.commit({
+                "status": "success",
+                "message": f"Transferred {amount} from account {from_account_number} to {to_account_number}",
+                "data": {
+                    "reference": result.reference,
+                    "from_account_number": from_account_number,
+                    "to_account_number": to_account_number,
+                    "balance": result.from_balance
+                }
+            })
+        finally:
+            if not guard.committed:
+                velocity_guard.cancel(admission)
+        if guard.committed:
+            balance_cache.apply(from_account_number, result.from_balance, result.from_version)
+            balance_cache.apply(to_account_number, result.to_balance, result.to_version)
+        return response
+
+
+# Current user, one account read per IN_CHUNK numbers, then UPDATE, balance read-back and INSERT
+# for a full-size batch on its first attempt; hot-account folds and retries come on top
+BATCH_QUERY_BUDGET = 1 + (settings.BATCH_POSTING_MAX_LINES + IN_CHUNK - 1) // IN_CHUNK + 3
+
+
+class BatchMode(str, Enum):
+    PARTIAL = "partial"
+    ALL_OR_NOTHING = "all_or_nothing"
+
+
+def _parse_batch_rows(rows: list):
+    # Returns (valid BatchLines, rejected line reports); line numbers start at 1
+    lines, rejected = [], []
+    for number, row in enumerate(rows, start=1):
+        account_number = str(row.get("account_number") or "").strip()
+        posting_type = str(row.get("type") or "Deposit").strip().capitalize()
+        try:
+            amount = float(row.get("amount"))
+        except (TypeError, ValueError):
+            amount = None
 
+        if not is_valid_account_number(account_number):
+            error = "Invalid account number"
+        elif amount is None or amount <= 0:
+            error = "Amount must be a number greater than zero"
+        elif posting_type not in (TransactionTypeEnum.DEPOSIT.value, TransactionTypeEnum.WITHDRAWAL.value):
+            error = "Type must be Deposit or Withdrawal"
+        else:
+            delta = amount if posting_type == TransactionTypeEnum.DEPOSIT.value else -amount
+            lines.append(BatchLine(number, account_number, delta, row.get("description") or posting_type))
+            continue
+        rejected.append({"line": number, "account_number": account_number, "status": "rejected", "error": error})
+    return lines, rejected
+
+
+async def read_body(request: Request) -> bytes:
+    # Raw JSON or CSV body, read on the event loop so the endpoint itself can run in the threadpool
+    return await request.body()
+
+@router.post("/postings/batch", status_code=status.HTTP_200_OK, dependencies=[Depends(query_budget(BATCH_QUERY_BUDGET))])
+def post_batch_postings(
+    request: Request,
+    body: bytes = Depends(read_body),
+    mode: BatchMode = Query(BatchMode.PARTIAL, description="partial: apply valid lines; all_or_nothing: apply only if every line is valid"),
+    db: Session = Depends(get_db),
+    current_user: LoginUser = Depends(get_current_user)
+):
+    """
+    Bulk deposits/withdrawals (payroll, settlement) in one database transaction.
+    Body is JSON ({"postings": [...]} or a list) or CSV with the header
+    account_number,amount,type,description.
+    """
+    if current_user.role not in ["Admin"]:
+        raise HTTPException(status_code=403, detail="Not authorized to post batches")
+
+    content_type = request.headers.get("content-type", "")
+    try:
+        if "csv" in content_type:
+            rows = list(csv.DictReader(io.StringIO(body.decode("utf-8-sig"))))
+        else:
+            payload = json.loads(body or b"[]")
+            rows = payload.get("postings", []) if isinstance(payload, dict) else payload
+    except (UnicodeDecodeError, ValueError, AttributeError):
+        raise HTTPException(status_code=400, detail="Body must be JSON or CSV postings")
+    if not isinstance(rows, list) or not all(isinstance(row, dict) for row in rows):
+        raise HTTPException(status_code=400, detail="Postings must be a list of objects")
+    if not rows:
+        raise HTTPException(status_code=400, detail="No postings in request")
+    if len(rows) > settings.BATCH_POSTING_MAX_LINES:
+        raise HTTPException(status_code=413, detail=f"At most {settings.BATCH_POSTING_MAX_LINES} postings per batch")
+
+    lines, rejected = _parse_batch_rows(rows)
+    all_or_nothing = mode == BatchMode.ALL_OR_NOTHING
+
+    if all_or_nothing and rejected:
+        results = rejected + [
+            {"line": line.line, "account_number": line.account_number, "status": "not_applied",
+             "error": "Batch rejected (all-or-nothing)"}
+            for line in lines
+        ]
+    elif lines:
+        try:
+            results = rejected + post_batch(db, lines, all_or_nothing)
+        except BatchConflict as e:
+            raise HTTPException(status_code=409, detail=f"{e}; retry the batch")
+    else:
+        results = rejected
+    results.sort(key=lambda result: result["line"])
+    # Batch updates report no per-account version, so drop those entries instead
+    balance_cache.invalidate(*{result["account_number"] for result in results if result["status"] == "applied"})
+
+    applied = sum(1 for result in results if result["status"] == "applied")
     return {
-        "status": "success",
-        "message": f"Withdrawn {amount} from account {account_number}",
+        "status": "success" if applied == len(results) else ("partial" if applied else "failed"),
+        "message": f"Applied {applied} of {len(results)} postings",
         "data": {
-            "account_number": account.account_number,
-            "balance": account.balance
+            "mode": mode.value,
+            "applied": applied,
+            "rejected": len(results) - applied,
+            "results": results
         }
     }
 
 
+def _db_timestamp(value: datetime) -> str:
+    # Timestamps are stored by the database clock (UTC) as "YYYY-MM-DD HH:MM:SS"
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value.strftime("%Y-%m-%d %H:%M:%S")
+
 
-@router.get("/transactions/{account_number}", status_code=status.HTTP_200_OK)
+def _history_select(table, account_id: int, cursor=None, from_date=None, to_date=None,
+                    transaction_type=None, min_amount=None, max_amount=None):
+    # Same query for the hot table and every monthly archive table (identical columns).
+    # Stored timestamp text is compared as-is so cursor boundaries match rows exactly.
+    stored_timestamp = type_coerce(table.c.timestamp, String)
+    stmt = select(
+        table.c.transaction_id,
+        table.c.transaction_type,
+        table.c.amount,
+        table.c.description,
+        table.c.reference,
+        table.c.timestamp,
+        stored_timestamp.label("stored_timestamp"),
+    ).where(table.c.account_id == account_id)
+    if cursor:
+        stmt = stmt.where(
+            tuple_(stored_timestamp, table.c.transaction_id) < tuple_(literal(cursor[0]), literal(cursor[1]))
+        )
+    if from_date:
+        stmt = stmt.where(stored_timestamp >= from_date)
+    if to_date:
+        stmt = stmt.where(stored_timestamp < to_date)
+    if transaction_type:
+        stmt = stmt.where(table.c.transaction_type == transaction_type)
+    if min_amount is not None:
+        stmt = stmt.where(table.c.amount >= min_amount)
+    if max_amount is not None:
+        stmt = stmt.where(table.c.amount <= max_amount)
+    return stmt
+
+
+@router.get("/transactions/{account_number}", status_code=status.HTTP_200_OK, dependencies=[Depends(query_budget(6))])
 def get_transaction_history(
     account_number: str,
     current_user: LoginUser = Depends(get_current_user),
     db: Session = Depends(get_db),
-    limit: int = Query(20, description="Number of recent transactions to fetch")
+    limit: int = Query(20, ge=1, le=200, description="Number of transactions per page"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    from_date: Optional[datetime] = Query(None, description="Only transactions at or after this time"),
+    to_date: Optional[datetime] = Query(None, description="Only transactions before this time"),
+    transaction_type: Optional[TransactionTypeEnum] = Query(None),
+    min_amount: Optional[float] = Query(None, ge=0),
+    max_amount: Optional[float] = Query(None, ge=0),
 ):
+    check_account_number(account_number)
     # Fetch account
-    account = db.query(Account).filter(Account.account_number == account_number).first()
+    account = (
+        db.query(Account)
+        .options(joinedload(Account.customer))
+        .filter(Account.account_number == account_number)
+        .first()
+    )
     if not account:
         raise HTTPException(status_code=404, detail=f"Account {account_number} not found")
     if account.customer.login_id != current_user.user_table_id:
         raise HTTPException(status_code=403, detail="Not authorized to withdraw from this account")
 
-    transactions = (
-        db.query(Transaction)
-        .filter(Transaction.account_id == account.account_id)
-        .order_by(Transaction.timestamp.desc())
-        .limit(limit)
-        .all()
+    seek = None
+    if cursor:
+        last_timestamp, last_id = decode_cursor(cursor, 2)
+        if not isinstance(last_timestamp, str) or not isinstance(last_id, int):
+            raise HTTPException(status_code=400, detail="Invalid pagination cursor.")
+        seek = (last_timestamp, last_id)
+    filters = dict(
+        cursor=seek,
+        from_date=_db_timestamp(from_date) if from_date else None,
+        to_date=_db_timestamp(to_date) if to_date else None,
+        transaction_type=transaction_type.value if transaction_type else None,
+        min_amount=min_amount,
+        max_amount=max_amount,
     )
 
+    # Keyset pagination: seek past the last (timestamp, transaction_id) seen instead of
+    # OFFSET, so every page is an index range scan on ix_transactions_history_covering.
+    def page(table, size):
+        stmt = _history_select(table, account.account_id, **filters)
+        return db.execute(
+            stmt.order_by(table.c.timestamp.desc(), table.c.transaction_id.desc()).limit(size)
+        ).all()
+
+    rows = page(Transaction.__table__, limit + 1)
+    if len(rows) <= limit:
+        # 🗄️ Hot rows exhausted: continue into archived months, newest first
+        upper = [value[:7] for value in (seek and seek[0], filters["to_date"]) if value]
+        last_month = min(upper) if upper else None
+        first_month = filters["from_date"][:7] if filters["from_date"] else None
+        for month in reversed(archived_months(db, account.account_id, first_month, last_month)):
+            rows += page(archive_table(month), limit + 1 - len(rows))
+            if len(rows) > limit:
+                break
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(str(rows[-1].stored_timestamp), rows[-1].transaction_id)
+
     return {
         "status": "success",
-        "message": f"Last {len(transactions)} transactions for account {account_number}",
-        "current_balance": account.balance,
+        "message": f"{len(rows)} transactions for account {account_number}",
+        "current_balance": account.balance + (
+            db.execute(select(slot_total(account.account_id))).scalar_one() if account.balance_slots else 0.0
+        ),
+        "next_cursor": next_cursor,
         "data": [
             {
+                "transaction_id": t.transaction_id,
                 "transaction_type": t.transaction_type,
                 "amount": t.amount,
                 "description": t.description,
+                "reference": t.reference,
                 "timestamp": t.timestamp
             }
-            for t in transactions
+            for t in rows
         ]
     }
 
 
-@router.get("/balance/{account_number}", status_code=status.HTTP_200_OK)
-def get_account_balance(
+@router.get("/{account_number}/statement", status_code=status.HTTP_200_OK, dependencies=[Depends(query_budget(4))])
+def download_statement(
     account_number: str,
+    format: StatementFormat = Query(StatementFormat.CSV, description="csv, ndjson or xlsx"),
+    from_date: Optional[datetime] = Query(None, description="Only transactions at or after this time"),
+    to_date: Optional[datetime] = Query(None, description="Only transactions before this time"),
     current_user: LoginUser = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
-    # Fetch account
-    account = db.query(Account).filter(Account.account_number == account_number).first()
+    check_account_number(account_number)
+    account = (
+        db.query(Account)
+        .options(joinedload(Account.customer))
+        .filter(Account.account_number == account_number)
+        .first()
+    )
     if not account:
         raise HTTPException(status_code=404, detail=f"Account {account_number} not found")
-    if account.customer.login_id != current_user.user_table_id:
+    if current_user.role not in ["Admin", "Auditor", "superadmin"] and account.customer.login_id != current_user.user_table_id:
+        raise HTTPException(status_code=403, detail="Not authorized to view this account's statement")
+
+    # 📄 Oldest first: archived months, then the hot table; rows are streamed, never collected
+    start = _db_timestamp(from_date) if from_date else None
+    end = _db_timestamp(to_date) if to_date else None
+    tables = [
+        archive_table(month)
+        for month in archived_months(db, account.account_id, start and start[:7], end and end[:7])
+    ]
+    tables.append(Transaction.__table__)
+    statements = []
+    for table in tables:
+        stored_timestamp = type_coerce(table.c.timestamp, String)
+        stmt = select(*(table.c[name] for name in STATEMENT_COLUMNS)).where(table.c.account_id == account.account_id)
+        if start:
+            stmt = stmt.where(stored_timestamp >= start)
+        if end:
+            stmt = stmt.where(stored_timestamp < end)
+        statements.append(stmt.order_by(table.c.timestamp, table.c.transaction_id))
+
+    return StreamingResponse(
+        stream_statement(statements, format),
+        media_type=MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="statement_{account_number}.{format.value}"'},
+    )
+
+
+@router.get("/balance/{account_number}", status_code=status.HTTP_200_OK, dependencies=[Depends(query_budget(3))])
+def get_account_balance(
+    account_number: str,
+    current_user: LoginUser = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    check_account_number(account_number)
+    # ⚡ Served from the write-through cache when its version is still current
+    entry = balance_cache.get(account_number)
+    if entry is not None:
+        # Primary-key read of the version stamp: catches commits made by other workers
+        current = db.execute(
+            select(Account.version, Account.balance_slots).where(Account.account_id == entry.account_id)
+        ).first()
+        if current is None or current.balance_slots or current.version != entry.version:
+            balance_cache.invalidate(account_number)
+            entry = None
+    if entry is None:
+        read_epoch = balance_cache.epoch()
+        row = (
+            db.query(
+                Account.account_id, Customer.login_id, Account.version, Account.balance_slots,
+                (Account.balance + slot_total(Account.account_id)).label("balance"),
+            )
+            .join(Customer, Account.customer_id == Customer.customer_table_id)
+            .filter(Account.account_number == account_number)
+            .first()
+        )
+        if not row:
+            raise HTTPException(status_code=404, detail=f"Account {account_number} not found")
+        entry = BalanceEntry(row.account_id, row.login_id, row.balance, row.version)
+        if not row.balance_slots:
+            # Hot-account credits do not bump the version, so those balances are never cached
+            balance_cache.put(account_number, entry, read_epoch)
+    if entry.owner_login_id != current_user.user_table_id:
         raise HTTPException(status_code=403, detail="Not authorized to view this account balance")
 
     return {
         "status": "success",
         "message": f"Current balance for account {account_number}",
         "data": {
-            "account_number": account.account_number,
-            "balance": account.balance
+            "account_number": account_number,
+            "balance": entry.balance
         }
-    }
\ No newline at end of file
+    }
+
+
+@router.put("/{account_number}/hot-mode", status_code=status.HTTP_200_OK)
+def set_hot_mode(
+    account_number: str,
+    slots: int = Form(..., ge=0, le=settings.HOT_ACCOUNT_MAX_SLOTS, description="Credit slots; 0 switches hot mode off"),
+    current_user: LoginUser = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Hot-account mode for merchant/settlement accounts: deposits are spread
+    over `slots` sub-balances and folded back into the main balance lazily.
+    """
+    if current_user.role not in ["Admin"]:
+        raise HTTPException(status_code=403, detail="Not authorized to change hot-account mode")
+    check_account_number(account_number)
+    account = db.query(Account.account_id).filter(Account.account_number == account_number).first()
+    if not account:
+        raise HTTPException(status_code=404, detail=f"Account {account_number} not found")
+
+    # 🔥 Fold pending slot credits and recreate the slots in one transaction
+    folded = set_balance_slots(db, account.account_id, slots)
+    db.commit()
+    hot_accounts.set(account_number, account.account_id, slots)
+    balance_cache.invalidate(account_number)
+
+    return {
+        "status": "success",
+        "message": f"Hot-account mode {'enabled' if slots else 'disabled'} for account {account_number}",
+        "data": {
+            "account_number": account_number,
+            "balance_slots": slots,
+            "folded": round(folded, 2)
+        }
+    }
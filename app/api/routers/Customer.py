@@ -4,13 +4,17 @@ from datetime import date, datetime
 from app.models.login_user import LoginUser
 from app.function.validation import validate_email, validate_phone_number
 from app.core.security import get_current_user
-from app.core.database import get_db
+from app.core.database import get_db,get_async_db
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.models.CustomerModel import Customer
-from app.function.generating_id import generate_Customer_code
+from app.function.generating_id import generate_Customer_code_async
 import os
 from fastapi.responses import FileResponse
 from enum import Enum
-from app.enumsfolder.CustomerEnum import GenderEnum, MaritalStatusEnum,AccountTypeEnum
+from app.enumsfolder.CustomerEnum import GenderEnum, MaritalStatusEnum,AccountTypeEnum,KYCStatusEnum,CustomerStatusEnum
+from app.function.customer_listing import list_customers
+from typing import Optional
 router = APIRouter()
 UPLOAD_DIR = "uploads/customers/"
 
@@ -37,7 +41,7 @@ async def create_customer(
     signature_image: UploadFile = File(None),
 
     notes: str = Form(None),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: LoginUser = Depends(get_current_user)
 ):
     if current_user.role != "Customer":
@@ -50,9 +54,10 @@ async def create_customer(
     validate_phone_number(phone_number)
 
     # 🔹 Check for duplicates
-    existing_customer = db.query(Customer).filter(
+    result = await db.execute(select(Customer).filter(
         (Customer.email == email) | (Customer.phone_number == phone_number)
-    ).first()
+    ))
+    existing_customer = result.scalars().first()
 
     if existing_customer:
         raise HTTPException(
@@ -61,7 +66,7 @@ async def create_customer(
         )
         
     os.makedirs(UPLOAD_DIR, exist_ok=True)
-    customer_code = generate_Customer_code(db)
+    customer_code = await generate_Customer_code_async()
     
     profile_path = None
     signature_path = None
@@ -119,8 +124,8 @@ async def create_customer(
     )
 
     db.add(new_customer)
-    db.commit()
-    db.refresh(new_customer)
+    await db.commit()
+    await db.refresh(new_customer)
 
     return {
         "status": "success",
@@ -138,7 +143,15 @@ async def create_customer(
 @router.get("/get-all-customer", status_code=status.HTTP_200_OK)
 def get_all_customers(
     db: Session = Depends(get_db),
-    current_user: LoginUser = Depends(get_current_user)
+    current_user: LoginUser = Depends(get_current_user),
+    limit: int = Query(50, ge=1, le=500, description="Number of customers per page"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    status_filter: Optional[CustomerStatusEnum] = Query(None, alias="status"),
+    kyc_status: Optional[KYCStatusEnum] = Query(None),
+    city: Optional[str] = Query(None),
+    country: Optional[str] = Query(None),
+    account_type: Optional[AccountTypeEnum] = Query(None),
+    include_total: bool = Query(False, description="Also count all matching customers (slower)"),
 ):
     # Authorization: Only "Customer Care" role can view customers
     roles=["superadmin","Admin"]
@@ -148,33 +161,31 @@ def get_all_customers(
             detail="Not authorized to access this resource. Only Admins are allowed."
         )
 
-    customers = db.query(Customer).order_by(Customer.created_at.desc()).all()
+    # Keyset page with only the listed columns loaded
+    page = list_customers(
+        db,
+        limit,
+        cursor=cursor,
+        status=status_filter.value if status_filter else None,
+        kyc_status=kyc_status.value if kyc_status else None,
+        city=city,
+        country=country,
+        account_type=account_type.value if account_type else None,
+        include_total=include_total,
+    )
 
-    if not customers:
+    if not page["data"] and not cursor:
         return {
             "status": "success",
             "message": "No customers found.",
+            "total_customers": page["total_customers"],
+            "next_cursor": None,
             "data": []
         }
 
-    customer_list = []
-    for cust in customers:
-        customer_list.append({
-            "customer_code": cust.customer_code,
-            "full_name": f"{cust.first_name} {cust.last_name or ''}".strip(),
-            "email": cust.email,
-            "phone_number": cust.phone_number,
-            "account_type": cust.account_type,
-            "status": cust.status,
-            "city": cust.city,
-            "country": cust.country,
-            "created_at": cust.created_at,
-        })
-
     return {
         "status": "success",
-        "total_customers": len(customer_list),
-        "data": customer_list
+        **page
     }
 
 
@@ -262,13 +273,14 @@ async def update_customer_identity(
     aadhaar_file: UploadFile = File(None),
     driving_license_file: UploadFile = File(None),
     voter_id_file: UploadFile = File(None),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: LoginUser = Depends(get_current_user)
 ):
     if current_user.role != "Customer":
         raise HTTPException(403, "Only Customer care allowed")
 
-    customer = db.query(Customer).filter(Customer.login_id == current_user.user_table_id).first()
+    result = await db.execute(select(Customer).filter(Customer.login_id == current_user.user_table_id))
+    customer = result.scalars().first()
     if not customer:
         raise HTTPException(404, "Customer not found")
 
@@ -299,8 +311,8 @@ async def update_customer_identity(
     customer.voter_id_number = voter_id_number or customer.voter_id_number
     customer.pan_number = pan_number or customer.pan_number
 
-    db.commit()
-    db.refresh(customer)
+    await db.commit()
+    await db.refresh(customer)
 
     return {
         "status": "success",
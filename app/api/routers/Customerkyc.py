@@ -12,48 +12,44 @@ import os
 from fastapi.responses import FileResponse
 from enum import Enum
 from app.enumsfolder.CustomerEnum import GenderEnum, MaritalStatusEnum,AccountTypeEnum,KYCStatusEnum
+from app.function.customer_search import search_customers
 router = APIRouter()
 
-@router.get("/get-all-customer", status_code=status.HTTP_200_OK)
-def get_all_customers(
+@router.get("/customers/search", status_code=status.HTTP_200_OK)
+def search_customer(
+    q: str = Query(..., min_length=1, max_length=200, description="Partial name, email, phone, city or customer code"),
+    limit: int = Query(20, ge=1, le=100, description="Maximum number of results"),
     db: Session = Depends(get_db),
     current_user: LoginUser = Depends(get_current_user)
 ):
-    # Authorization: Only "Customer Care" role can view customers
-    roles=["superadmin","Admin"]
-    if current_user.role not in roles:
+    # Authorization
+    role_allowed = ["Admin", "superadmin", "Auditor"]
+
+    if current_user.role not in role_allowed:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
-            detail="Not authorized to access this resource. Only Admins are allowed."
+            detail="You do not have permission to access this resource."
         )
 
-    customers = db.query(Customer).order_by(Customer.created_at.desc()).all()
-
-    if not customers:
-        return {
-            "status": "success",
-            "message": "No customers found.",
-            "data": []
-        }
-
-    customer_list = []
-    for cust in customers:
-        customer_list.append({
-            "customer_code": cust.customer_code,
-            "full_name": f"{cust.first_name} {cust.last_name or ''}".strip(),
-            "email": cust.email,
-            "phone_number": cust.phone_number,
-            "account_type": cust.account_type,
-            "status": cust.status,
-            "city": cust.city,
-            "country": cust.country,
-            "created_at": cust.created_at,
-        })
+    # 🔎 Prefix match on every term, best bm25 rank first (full-text index, no LIKE scan)
+    rows = search_customers(db, q, limit)
 
     return {
         "status": "success",
-        "total_customers": len(customer_list),
-        "data": customer_list
+        "message": f"{len(rows)} customers match '{q}'.",
+        "data": [
+            {
+                "customer_code": row.customer_code,
+                "full_name": f"{row.first_name} {row.last_name or ''}".strip(),
+                "email": row.email,
+                "phone_number": row.phone_number,
+                "city": row.city,
+                "status": row.status,
+                "kyc_status": row.kyc_status,
+                "score": round(abs(row.score), 4),
+            }
+            for row in rows
+        ]
     }
 
 @router.get("/get-customer-kyc", status_code=status.HTTP_200_OK)
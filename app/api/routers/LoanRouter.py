@@ -1,15 +1,18 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Form, File, UploadFile
 from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import datetime
 import math
 import os
-from app.function.generating_id import  generate_Loan_code
-from app.core.database import get_db
+from app.function.generating_id import  generate_Loan_code_async
+from app.core.database import get_db, get_async_db
 from app.models.LoanModel import Loan
 from app.models.CustomerModel import Customer 
 from app.models.login_user import LoginUser  # Assuming models are imported
 from app.core.security import get_current_user  # Assuming auth dependency
+from app.core.query_stats import query_budget
+from sqlalchemy.orm import joinedload
 import enum
 
 UPLOAD_DIR = "uploads/customers/"  # Assume utils for validations, dir
@@ -41,7 +44,7 @@ async def apply_for_loan(
     loan_reason : str = Form(None),
     supporting_doc: UploadFile = File(None),
 
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: LoginUser = Depends(get_current_user)
 ):
     if current_user.role != "Customer":  # Assuming 'Customer' for customers
@@ -59,15 +62,17 @@ async def apply_for_loan(
         )
 
     # 🔹 Fetch customer from current user
-    customer = db.query(Customer).filter(Customer.login_id == current_user.user_table_id).first()
+    result = await db.execute(select(Customer).filter(Customer.login_id == current_user.user_table_id))
+    customer = result.scalars().first()
     if not customer:
         raise HTTPException(status_code=404, detail="Customer not found")
 
     # 🔹 Check for existing pending loans (optional)
-    existing_loan = db.query(Loan).filter(
+    result = await db.execute(select(Loan).filter(
         Loan.customer_id == customer.customer_table_id,
         Loan.status == "Pending"
-    ).first()
+    ))
+    existing_loan = result.scalars().first()
     if existing_loan:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -94,7 +99,7 @@ async def apply_for_loan(
 
     # 🔹 Create new loan application
     new_loan = Loan(
-        loan_code=generate_Loan_code(db),
+        loan_code=await generate_Loan_code_async(),
         customer_id=customer.customer_table_id,
         loan_type=loan_type,
         amount=amount,
@@ -109,8 +114,8 @@ async def apply_for_loan(
     
 
     db.add(new_loan)
-    db.commit()
-    db.refresh(new_loan)
+    await db.commit()
+    await db.refresh(new_loan)
 
     return {
         "status": "success",
@@ -126,7 +131,7 @@ async def apply_for_loan(
     }
     
     
-@router.get("/my-loans", status_code=status.HTTP_200_OK)
+@router.get("/my-loans", status_code=status.HTTP_200_OK, dependencies=[Depends(query_budget(3))])
 def get_my_loans(
     current_user: LoginUser = Depends(get_current_user),
     db: Session = Depends(get_db)
@@ -172,7 +177,7 @@ async def review_loan(
     action: LoanAction = Form(...),  # 'approve' or 'reject'
     additional_notes: str = Form(None),  # For approve
     rejection_reason: str = Form(None),  # For reject
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: LoginUser = Depends(get_current_user)
 ):
     if current_user.role != "Admin":
@@ -189,10 +194,11 @@ async def review_loan(
     
     
     # 🔹 Fetch the loan and check if pending
-    loan = db.query(Loan).filter(
+    result = await db.execute(select(Loan).filter(
         Loan.loan_code == loan_code,
         Loan.status == "Pending"
-    ).first()
+    ))
+    loan = result.scalars().first()
     
     if not loan:
         raise HTTPException(
@@ -215,11 +221,12 @@ async def review_loan(
         loan.rejection_reason = rejection_reason
         message = "Loan rejected successfully."
     
-    db.commit()
-    db.refresh(loan)
+    await db.commit()
+    await db.refresh(loan)
     
     # 🔹 Optionally, fetch customer for response
-    customer = db.query(Customer).filter(Customer.customer_table_id == loan.customer_id).first()
+    result = await db.execute(select(Customer).filter(Customer.customer_table_id == loan.customer_id))
+    customer = result.scalars().first()
     
     response_data = {
         "loan_id": loan.loan_code,
@@ -240,7 +247,7 @@ async def review_loan(
         "data": response_data
     }
     
-@router.get("/all-loans", status_code=status.HTTP_200_OK)
+@router.get("/all-loans", status_code=status.HTTP_200_OK, dependencies=[Depends(query_budget(3))])
 def get_all_loans(
     db: Session = Depends(get_db),
     current_user: LoginUser = Depends(get_current_user)
@@ -251,7 +258,7 @@ def get_all_loans(
             detail="Not authorized to access this resource. Only admin allowed"
         )
 
-    loans = db.query(Loan).all()
+    loans = db.query(Loan).options(joinedload(Loan.customer)).all()
     return {"status": "success",
             "data":{
                 "total_loans": len(loans),
@@ -0,0 +1,46 @@
+from fastapi import APIRouter, Depends, HTTPException, status
+from app.models.login_user import LoginUser
+from app.core.security import get_current_user
+from app.core.hashing import password_hasher
+from app.core.principal_cache import principal_cache
+from app.core.revocation import revocation_store
+from app.core.activity_tracker import activity_tracker
+from app.core.reconciliation import reconciler
+from app.core.idempotency import idempotency_store
+from app.core.balance_cache import balance_cache
+from app.core.archive import archiver
+from app.core.interest import interest_engine
+from app.core.hot_accounts import hot_accounts
+from app.core.group_commit import group_commit
+from app.core.velocity import velocity_guard
+
+router = APIRouter()
+
+
+@router.get("/metrics", status_code=status.HTTP_200_OK)
+def get_metrics(
+    current_user: LoginUser = Depends(get_current_user)
+):
+    if current_user.role != "superadmin":
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not authorized to access this resource. only superadmin allowed"
+        )
+
+    return {
+        "status": "success",
+        "data": {
+            "password_hashing": password_hasher.stats(),
+            "principal_cache": principal_cache.stats(),
+            "token_revocation": revocation_store.stats(),
+            "activity_tracker": activity_tracker.stats(),
+            "reconciliation": reconciler.stats(),
+            "idempotency": idempotency_store.stats(),
+            "balance_cache": balance_cache.stats(),
+            "archive": archiver.stats(),
+            "interest_accrual": interest_engine.stats(),
+            "hot_accounts": hot_accounts.stats(),
+            "group_commit": group_commit.stats(),
+            "withdrawal_velocity": velocity_guard.stats(),
+        }
+    }
@@ -0,0 +1,88 @@
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.orm import Session
+from app.core.database import get_db
+from app.core.security import get_current_user
+from app.core.reconciliation import reconciler
+from app.models.login_user import LoginUser
+from app.models.AccountModel import Account
+from app.models.ReconciliationModel import ReconciliationException
+
+router = APIRouter(prefix="/reconciliation")
+
+RECONCILIATION_ROLES = ["superadmin", "Auditor"]
+
+
+def check_reconciliation_role(current_user: LoginUser):
+    if current_user.role not in RECONCILIATION_ROLES:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not authorized to access this resource. Only superadmin and Auditors are allowed."
+        )
+
+
+@router.post("/run", status_code=status.HTTP_200_OK)
+async def run_reconciliation(
+    current_user: LoginUser = Depends(get_current_user)
+):
+    check_reconciliation_role(current_user)
+    try:
+        summary = await run_in_threadpool(reconciler.run)
+    except RuntimeError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    return {
+        "status": "success",
+        "message": f"Reconciled {summary['accounts_checked']} accounts, {summary['mismatches']} mismatches",
+        "data": summary
+    }
+
+
+@router.get("/exceptions", status_code=status.HTTP_200_OK)
+def get_reconciliation_exceptions(
+    exception_status: Optional[str] = Query("Open", alias="status", description="Open or Resolved"),
+    limit: int = Query(100, ge=1, le=1000),
+    current_user: LoginUser = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    check_reconciliation_role(current_user)
+    rows = (
+        db.query(ReconciliationException, Account.account_number)
+        .join(Account, Account.account_id == ReconciliationException.account_id)
+        .filter(ReconciliationException.status == exception_status)
+        .order_by(ReconciliationException.exception_id.desc())
+        .limit(limit)
+        .all()
+    )
+    return {
+        "status": "success",
+        "data": [
+            {
+                "exception_id": e.exception_id,
+                "run_id": e.run_id,
+                "account_number": account_number,
+                "expected_balance": e.expected_balance,
+                "actual_balance": e.actual_balance,
+                "difference": e.difference,
+                "last_transaction_id": e.last_transaction_id,
+                "status": e.status,
+                "detected_at": e.detected_at,
+            }
+            for e, account_number in rows
+        ]
+    }
+
+
+@router.patch("/exceptions/{exception_id}/resolve", status_code=status.HTTP_200_OK)
+def resolve_reconciliation_exception(
+    exception_id: int,
+    current_user: LoginUser = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    check_reconciliation_role(current_user)
+    exception = db.query(ReconciliationException).filter(ReconciliationException.exception_id == exception_id).first()
+    if not exception:
+        raise HTTPException(status_code=404, detail=f"Reconciliation exception {exception_id} not found")
+    exception.status = "Resolved"
+    db.commit()
+    return {"status": "success", "message": f"Exception {exception_id} marked as resolved"}
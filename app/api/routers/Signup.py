@@ -1,14 +1,17 @@
 
 from fastapi import APIRouter, Depends, HTTPException, status, Form
 from sqlalchemy.orm import Session
-from app.core.database import get_db
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.database import get_db,get_async_db
 from app.models.login_user import LoginUser
-from app.core.security import hash_password
+from app.core.security import hash_password_async
 from datetime import datetime, date
 from enum import Enum
-from app.function.generating_id import generate_user_code
+from app.function.generating_id import generate_user_code_async
 from app.function.validation import validate_email, validate_phone_number
 from app.core.security import get_current_user
+from app.core.principal_cache import principal_cache
 
 router = APIRouter()
 
@@ -25,9 +28,17 @@ class GenderEnum(str, Enum):
     FEMALE = "FEMALE"
     OTHER = "OTHER"
 
+
+async def _save_new_user(db: AsyncSession, new_user: LoginUser, role: str) -> LoginUser:
+    new_user.user_id = await generate_user_code_async(role)
+    db.add(new_user)
+    await db.commit()
+    await db.refresh(new_user)
+    return new_user
+
     
 @router.post("/signup", status_code=status.HTTP_201_CREATED)
-def signup(
+async def signup(
     username: str = Form(...),
     email: str = Form(...),
     phone_number: str = Form(...),
@@ -37,12 +48,13 @@ def signup(
     gender: GenderEnum= Form(None),
     dob: date = Form(None),
     role: SignroleupRequestForm = Form(...),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     # Check existing user by email or phone
-    existing_user = db.query(LoginUser).filter(
+    result = await db.execute(select(LoginUser).filter(
         (LoginUser.email == email) | (LoginUser.phone_number == phone_number)
-    ).first()
+    ))
+    existing_user = result.scalars().first()
 
     if existing_user:
         raise HTTPException(
@@ -53,14 +65,11 @@ def signup(
     validate_email(email)
     validate_phone_number(phone_number)
 
-    # Hash the password
-    hashed_pw = hash_password(password)
+    # Hash the password (off the event loop, in the hashing pool)
+    hashed_pw = await hash_password_async(password)
     
-    # Generate unique user ID
-    user_id = generate_user_code(db, role)
     # Create new user entry
     new_user = LoginUser(
-        user_id=user_id,
         username=username,
         email=email,
         phone_number=phone_number,
@@ -73,10 +82,8 @@ def signup(
         role=role.value,
         
     ) 
-
-    db.add(new_user)
-    db.commit()
-    db.refresh(new_user)
+    # Generate unique user ID and save
+    new_user = await _save_new_user(db, new_user, role)
 
     return {
         "status": "success",
@@ -92,7 +99,7 @@ def signup(
 
 
 @router.post("/admin-signup", status_code=status.HTTP_201_CREATED)
-def admin_signup(
+async def admin_signup(
     username: str = Form(...),
     email: str = Form(...),
     phone_number: str = Form(...),
@@ -102,7 +109,7 @@ def admin_signup(
     gender: GenderEnum= Form(None),
     dob: date = Form(None),
     role: AdminroleupRequestForm = Form(...),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: LoginUser = Depends(get_current_user)
 ):
     # Check existing user by email or phone
@@ -111,9 +118,10 @@ def admin_signup(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Not authorized to access this resource. only superadmin allowed"
         )
-    existing_user = db.query(LoginUser).filter(
+    result = await db.execute(select(LoginUser).filter(
         (LoginUser.email == email) | (LoginUser.phone_number == phone_number)
-    ).first()
+    ))
+    existing_user = result.scalars().first()
 
     if existing_user:
         raise HTTPException(
@@ -124,14 +132,11 @@ def admin_signup(
     validate_email(email)
     validate_phone_number(phone_number)
 
-    # Hash the password
-    hashed_pw = hash_password(password)
+    # Hash the password (off the event loop, in the hashing pool)
+    hashed_pw = await hash_password_async(password)
     
-    # Generate unique user ID
-    user_id = generate_user_code(db, role)
     # Create new user entry
     new_user = LoginUser(
-        user_id=user_id,
         username=username,
         email=email,
         phone_number=phone_number,
@@ -144,10 +149,8 @@ def admin_signup(
         role=role.value,
         
     ) 
-
-    db.add(new_user)
-    db.commit()
-    db.refresh(new_user)
+    # Generate unique user ID and save
+    new_user = await _save_new_user(db, new_user, role)
 
     return {
         "status": "success",
@@ -190,7 +193,7 @@ def get_users(
     
     
 @router.put("/update/{user_id}", status_code=status.HTTP_200_OK)
-def update_user(
+async def update_user(
     user_id: str,
     username: str = Form(None),
     email: str = Form(None),
@@ -201,7 +204,7 @@ def update_user(
     gender: str = Form(None),
     dob: date = Form(None),
     role: str = Form(None),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: LoginUser = Depends(get_current_user)
 ):
     if current_user.role != "superadmin":
@@ -209,25 +212,28 @@ def update_user(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Not authorized to access this resource. only superadmin allowed"
         )
-    user = db.query(LoginUser).filter(LoginUser.user_id == user_id).first()
+    result = await db.execute(select(LoginUser).filter(LoginUser.user_id == user_id))
+    user = result.scalars().first()
     if not user:
         raise HTTPException(status_code=404, detail="User not found.")
 
     # Validate if email or phone already exists for another user
     if email:
         validate_email(email)
-        existing_email = db.query(LoginUser).filter(
+        result = await db.execute(select(LoginUser).filter(
             LoginUser.email == email, LoginUser.user_id != user_id
-        ).first()
+        ))
+        existing_email = result.scalars().first()
         if existing_email:
             raise HTTPException(status_code=400, detail="Email already in use by another user.")
         user.email = email
 
     if phone_number:
         validate_phone_number(phone_number)
-        existing_phone = db.query(LoginUser).filter(
+        result = await db.execute(select(LoginUser).filter(
             LoginUser.phone_number == phone_number, LoginUser.user_id != user_id
-        ).first()
+        ))
+        existing_phone = result.scalars().first()
         if existing_phone:
             raise HTTPException(status_code=400, detail="Phone number already in use by another user.")
         user.phone_number = phone_number
@@ -242,12 +248,13 @@ def update_user(
 
     if password:
         user.password = password
-        user.hashed_password = hash_password(password)
+        user.hashed_password = await hash_password_async(password)
 
     user.updated_at = datetime.now()
 
-    db.commit()
-    db.refresh(user)
+    await db.commit()
+    await db.refresh(user)
+    principal_cache.invalidate_user(user.user_table_id)
 
     return {
         "status": "success",
@@ -279,8 +286,10 @@ def delete_user(
     if not user:
         raise HTTPException(status_code=404, detail="User not found.")
 
+    user_table_id = user.user_table_id
     db.delete(user)
     db.commit()
+    principal_cache.invalidate_user(user_table_id)
 
     return {
         "status": "success",
@@ -0,0 +1,114 @@
+import threading
+from datetime import datetime
+from sqlalchemy import update
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.models.login_user import LoginUser
+
+
+class ActivityTracker:
+    """
+    Write-behind buffer for LoginUser.last_activity.
+
+    Requests only record the latest timestamp per user in memory; a background
+    thread writes all pending values in one batched UPDATE every
+    ACTIVITY_FLUSH_SECONDS, or sooner once ACTIVITY_FLUSH_MAX_USERS users are
+    pending. stop() performs a final flush on shutdown.
+    """
+
+    def __init__(self, flush_seconds: int, max_pending: int):
+        self.flush_seconds = flush_seconds
+        self.max_pending = max_pending
+        self._pending = {}  # user_table_id -> datetime
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stopping = threading.Event()
+        self._thread = None
+        self._flushes = 0
+        self._rows_written = 0
+
+    def touch(self, user_table_id: int, when: datetime = None):
+        when = when or datetime.now()
+        with self._lock:
+            current = self._pending.get(user_table_id)
+            if current is None or when > current:
+                self._pending[user_table_id] = when
+            full = len(self._pending) >= self.max_pending
+        if full:
+            self._wake.set()
+
+    def last_activity(self, user_table_id: int, stored: datetime = None):
+        """Newest of the stored value and any not-yet-flushed timestamp."""
+        with self._lock:
+            pending = self._pending.get(user_table_id)
+        if pending is None:
+            return stored
+        if stored is None or pending > stored:
+            return pending
+        return stored
+
+    def flush(self) -> int:
+        with self._lock:
+            if not self._pending:
+                return 0
+            batch, self._pending = self._pending, {}
+
+        db = SessionLocal()
+        try:
+            db.execute(
+                update(LoginUser),
+                [{"user_table_id": uid, "last_activity": ts} for uid, ts in batch.items()],
+            )
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            # Put the batch back so it is retried, keeping any newer values
+            with self._lock:
+                for uid, ts in batch.items():
+                    current = self._pending.get(uid)
+                    if current is None or ts > current:
+                        self._pending[uid] = ts
+            print(f"activity flush failed {e}")
+            return 0
+        finally:
+            db.close()
+
+        with self._lock:
+            self._flushes += 1
+            self._rows_written += len(batch)
+        return len(batch)
+
+    def _run(self):
+        while not self._stopping.is_set():
+            self._wake.wait(timeout=self.flush_seconds)
+            self._wake.clear()
+            self.flush()
+
+    def start(self):
+        if self._thread is not None:
+            return
+        self._stopping.clear()
+        self._thread = threading.Thread(target=self._run, name="activity-flusher", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        if self._thread is not None:
+            self._stopping.set()
+            self._wake.set()
+            self._thread.join()
+            self._thread = None
+        self.flush()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "pending_users": len(self._pending),
+                "flushes": self._flushes,
+                "rows_written": self._rows_written,
+            }
+
+
+activity_tracker = ActivityTracker(
+    flush_seconds=settings.ACTIVITY_FLUSH_SECONDS,
+    max_pending=settings.ACTIVITY_FLUSH_MAX_USERS,
+)
@@ -0,0 +1,206 @@
+"""
+Archival of old transactions into per-month tables.
+
+Transactions older than ARCHIVE_HORIZON_MONTHS whole months are moved, in
+transaction_id order and ARCHIVE_BATCH_SIZE rows at a time, from the hot
+transactions table into transactions_archive_YYYYMM (same columns, plus a
+history index). Each batch is one database transaction that copies the rows,
+deletes them from the hot table and adds their totals to the tombstone row
+for (account, month) in transaction_archive_summaries, so an interrupted run
+is simply continued by the next one.
+
+The tombstones tell readers which archive tables hold rows for an account;
+history and statements read archived months after (or before) the hot rows,
+and reconciliation adds their totals to the ledger sum.
+
+The in-process scheduler runs it monthly (ARCHIVE_DAY, ARCHIVE_HOUR); to
+run it by hand:
+
+    python -m app.core.archive
+"""
+import threading
+from datetime import date
+from sqlalchemy import Table, Column, MetaData, Index, String, select, insert, delete, update, func, case, type_coerce, bindparam
+
+import app.models  # noqa: F401  (registers every table on Base.metadata)
+from app.core.config import settings
+from app.core.database import engine
+from app.models.TransactionModel import Transaction, CREDIT_TYPES
+from app.models.TransactionArchiveModel import TransactionArchiveSummary
+
+CHUNK_SIZE = 900  # ids per IN (...) list, under SQLite's bound parameter limit
+
+archive_metadata = MetaData()
+_archive_tables = {}
+_archive_tables_lock = threading.Lock()
+
+
+def archive_table(month: str) -> Table:
+    """The archive table for "YYYY-MM", with the hot table's columns."""
+    name = f"transactions_archive_{month.replace('-', '')}"
+    with _archive_tables_lock:
+        table = _archive_tables.get(name)
+        if table is None:
+            columns = [
+                Column(c.name, c.type, primary_key=c.primary_key, autoincrement=False, nullable=c.nullable)
+                for c in Transaction.__table__.columns
+            ]
+            table = Table(
+                name, archive_metadata, *columns,
+                Index(f"ix_{name}_account_history", "account_id", "timestamp", "transaction_id"),
+            )
+            _archive_tables[name] = table
+        return table
+
+
+def archived_months(db, account_id: int, first_month: str = None, last_month: str = None) -> list:
+    """Months ("YYYY-MM", oldest first) with archived rows for the account."""
+    summary = TransactionArchiveSummary
+    query = select(summary.month).where(summary.account_id == account_id)
+    if first_month:
+        query = query.where(summary.month >= first_month)
+    if last_month:
+        query = query.where(summary.month <= last_month)
+    return list(db.execute(query.order_by(summary.month)).scalars())
+
+
+class Archiver:
+    def __init__(self, horizon_months: int, batch_size: int):
+        self.horizon_months = horizon_months
+        self.batch_size = batch_size
+        self._lock = threading.Lock()
+        self._last_run = None
+
+    def cutoff(self, today: date = None) -> str:
+        # Start of the oldest month that stays hot, as stored timestamps are written
+        today = today or date.today()
+        months = today.year * 12 + today.month - 1 - self.horizon_months
+        return f"{months // 12:04d}-{months % 12 + 1:02d}-01 00:00:00"
+
+    def run(self, bind=None) -> dict:
+        if not self._lock.acquire(blocking=False):
+            raise RuntimeError("An archive run is already in progress")
+        try:
+            return self._run(bind or engine)
+        finally:
+            self._lock.release()
+
+    def _run(self, bind) -> dict:
+        hot = Transaction.__table__
+        stored_timestamp = type_coerce(hot.c.timestamp, String)
+        cutoff = self.cutoff()
+        moved, months = 0, set()
+
+        while True:
+            with bind.connect() as conn:
+                rows = conn.execute(
+                    select(hot.c.transaction_id, stored_timestamp.label("stored_timestamp"))
+                    .order_by(hot.c.transaction_id)
+                    .limit(self.batch_size)
+                ).all()
+            due = {}
+            for row in rows:
+                if row.stored_timestamp is None or str(row.stored_timestamp) >= cutoff:
+                    break
+                due.setdefault(str(row.stored_timestamp)[:7], []).append(row.transaction_id)
+            if not due:
+                break
+
+            for month in due:
+                if month not in months:
+                    # Own transaction: DDL would implicitly commit the move on MySQL
+                    with bind.begin() as conn:
+                        archive_table(month).create(bind=conn, checkfirst=True)
+            with bind.begin() as conn:
+                for month, ids in due.items():
+                    self._move(conn, month, ids)
+
+            batch = sum(len(ids) for ids in due.values())
+            moved += batch
+            months.update(due)
+            if batch < len(rows) or len(rows) < self.batch_size:
+                break  # reached rows inside the horizon
+
+        summary = {"cutoff": cutoff, "moved": moved, "months": sorted(months)}
+        self._last_run = summary
+        print(f"archive run {summary}")
+        return summary
+
+    def _move(self, conn, month: str, ids: list):
+        hot = Transaction.__table__
+        table = archive_table(month)
+        columns = [c.name for c in hot.columns]
+        totals = {}  # account_id -> [count, credit, debit, first_id, last_id]
+
+        for start in range(0, len(ids), CHUNK_SIZE):
+            chunk = ids[start:start + CHUNK_SIZE]
+            conn.execute(
+                insert(table).from_select(columns, select(*hot.c).where(hot.c.transaction_id.in_(chunk)))
+            )
+            for row in conn.execute(
+                select(
+                    hot.c.account_id,
+                    func.count().label("n"),
+                    func.sum(case((hot.c.transaction_type.in_(CREDIT_TYPES), hot.c.amount), else_=0.0)).label("credit"),
+                    func.sum(case((hot.c.transaction_type.in_(CREDIT_TYPES), 0.0), else_=hot.c.amount)).label("debit"),
+                    func.min(hot.c.transaction_id).label("first_id"),
+                    func.max(hot.c.transaction_id).label("last_id"),
+                )
+                .where(hot.c.transaction_id.in_(chunk))
+                .group_by(hot.c.account_id)
+            ):
+                total = totals.setdefault(row.account_id, [0, 0.0, 0.0, row.first_id, row.last_id])
+                total[0] += row.n
+                total[1] += row.credit or 0.0
+                total[2] += row.debit or 0.0
+                total[3] = min(total[3], row.first_id)
+                total[4] = max(total[4], row.last_id)
+            conn.execute(delete(hot).where(hot.c.transaction_id.in_(chunk)))
+
+        summaries = TransactionArchiveSummary.__table__
+        accounts = list(totals)
+        existing = set()
+        for start in range(0, len(accounts), CHUNK_SIZE):
+            existing.update(conn.execute(
+                select(summaries.c.account_id)
+                .where(summaries.c.month == month, summaries.c.account_id.in_(accounts[start:start + CHUNK_SIZE]))
+            ).scalars())
+
+        updates = [
+            {"target_id": a, "n": t[0], "credit": t[1], "debit": t[2], "last_id": t[4]}
+            for a, t in totals.items() if a in existing
+        ]
+        if updates:
+            # Rows are archived in id order, so a later batch only extends last_transaction_id
+            conn.execute(
+                update(summaries)
+                .where(summaries.c.account_id == bindparam("target_id"), summaries.c.month == month)
+                .values(
+                    transaction_count=summaries.c.transaction_count + bindparam("n"),
+                    credit_total=summaries.c.credit_total + bindparam("credit"),
+                    debit_total=summaries.c.debit_total + bindparam("debit"),
+                    last_transaction_id=bindparam("last_id"),
+                    archived_at=func.now(),
+                ),
+                updates,
+            )
+        inserts = [
+            {"account_id": a, "month": month, "transaction_count": t[0], "credit_total": t[1],
+             "debit_total": t[2], "first_transaction_id": t[3], "last_transaction_id": t[4]}
+            for a, t in totals.items() if a not in existing
+        ]
+        if inserts:
+            conn.execute(insert(summaries), inserts)
+
+    def stats(self) -> dict:
+        return {"running": self._lock.locked(), "last_run": self._last_run}
+
+
+archiver = Archiver(horizon_months=settings.ARCHIVE_HORIZON_MONTHS, batch_size=settings.ARCHIVE_BATCH_SIZE)
+
+
+if __name__ == "__main__":
+    from app.core.migrations import run_migrations
+
+    run_migrations()
+    archiver.run()
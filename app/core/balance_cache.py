@@ -0,0 +1,102 @@
+import threading
+from collections import OrderedDict, namedtuple
+from app.core.config import settings
+
+BalanceEntry = namedtuple("BalanceEntry", ["account_id", "owner_login_id", "balance", "version"])
+
+
+class BalanceCache:
+    """
+    In-process cache of balance and owner per account number for
+    GET /accounts/balance.
+
+    Ledger write paths update it after their commit (write-through) with the
+    accounts.version their UPDATE produced; a write carrying an older version
+    than the cached one is ignored, so out-of-order updates from concurrent
+    requests never move the balance backwards. Paths that cannot report a
+    version invalidate instead, and a read that started before an
+    invalidation is not allowed to re-populate the entry.
+
+    Every ledger write bumps accounts.version, so the endpoint checks the
+    cached version against the row (a primary-key read) before serving an
+    entry. A commit made through another worker process is therefore never
+    served stale; the cache saves the balance/owner join, not the round trip.
+    """
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()  # account_number -> BalanceEntry
+        self._lock = threading.Lock()
+        self._epoch = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._stale_writes = 0
+
+    def get(self, account_number: str):
+        with self._lock:
+            entry = self._entries.get(account_number)
+            if entry is None:
+                self._misses += 1
+                return None
+            self._entries.move_to_end(account_number)
+            self._hits += 1
+            return entry
+
+    def epoch(self) -> int:
+        """Take before a database read, pass to put() afterwards."""
+        with self._lock:
+            return self._epoch
+
+    def put(self, account_number: str, entry: BalanceEntry, read_epoch: int = None):
+        with self._lock:
+            if read_epoch is not None and read_epoch != self._epoch:
+                self._stale_writes += 1
+                return
+            current = self._entries.get(account_number)
+            if current is not None and current.version > entry.version:
+                self._stale_writes += 1
+                return
+            self._entries[account_number] = entry
+            self._entries.move_to_end(account_number)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+
+    def apply(self, account_number: str, balance: float, version: int):
+        """Write-through of a committed balance change."""
+        with self._lock:
+            current = self._entries.get(account_number)
+            if current is None:
+                return  # owner unknown here; the next read loads it
+            if version <= current.version:
+                self._stale_writes += 1
+                return
+            self._entries[account_number] = current._replace(balance=balance, version=version)
+
+    def invalidate(self, *account_numbers: str):
+        with self._lock:
+            self._epoch += 1
+            for account_number in account_numbers:
+                self._entries.pop(account_number, None)
+
+    def clear(self):
+        with self._lock:
+            self._epoch += 1
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_ratio": round(self._hits / lookups, 4) if lookups else None,
+                "evictions": self._evictions,
+                "stale_writes_ignored": self._stale_writes,
+            }
+
+
+balance_cache = BalanceCache(max_entries=settings.BALANCE_CACHE_MAX_ENTRIES)
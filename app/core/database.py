@@ -1,13 +1,57 @@
 from sqlalchemy import create_engine,event
 from sqlalchemy.orm import sessionmaker,declarative_base
+from sqlalchemy.ext.asyncio import create_async_engine,async_sessionmaker
 from app.core.config import settings
 
+def sqlite_pragmas(profile: bool = True) -> list:
+    # foreign_keys is always on; the rest is the performance profile from Settings
+    pragmas = [("foreign_keys", "ON")]
+    if profile:
+        pragmas += [
+            ("journal_mode", settings.SQLITE_JOURNAL_MODE),
+            ("synchronous", settings.SQLITE_SYNCHRONOUS),
+            ("busy_timeout", settings.SQLITE_BUSY_TIMEOUT_MS),
+            ("cache_size", settings.SQLITE_CACHE_SIZE),
+            ("mmap_size", settings.SQLITE_MMAP_SIZE),
+            ("temp_store", settings.SQLITE_TEMP_STORE),
+        ]
+    return pragmas
+
+def apply_sqlite_pragmas(dbapi_connection, pragmas: list):
+    cursor = dbapi_connection.cursor()
+    try:
+        for name, value in pragmas:
+            cursor.execute(f"PRAGMA {name}={value}")
+    finally:
+        cursor.close()
+
+def log_sqlite_pragmas(bind=None):
+    # Startup check: print what SQLite actually applied (e.g. WAL is refused for :memory:)
+    bind = bind or engine
+    if bind.dialect.name != "sqlite":
+        return
+    with bind.connect() as conn:
+        effective = {
+            name: conn.exec_driver_sql(f"PRAGMA {name}").scalar()
+            for name, _ in sqlite_pragmas()
+        }
+    print(f"sqlite pragmas in effect: {effective}")
+
 # engine=create_engine(settings.DATABASE_URL)
 engine=create_engine(settings.DATABASE_URL,connect_args={"check_same_thread": False})
-@event.listens_for(engine, "connect")
-def enable_foreign_keys(dbapi_connection, connection_record):
-    dbapi_connection.execute("PRAGMA foreign_keys=ON")
+if engine.dialect.name == "sqlite":
+    @event.listens_for(engine, "connect")
+    def set_sqlite_pragmas(dbapi_connection, connection_record):
+        apply_sqlite_pragmas(dbapi_connection, sqlite_pragmas(settings.SQLITE_PRAGMA_PROFILE))
 SessionLocal=sessionmaker(autocommit=False,autoflush=False,bind=engine)
+
+# Async engine for async def handlers, so queries never block the event loop
+async_engine=create_async_engine(settings.ASYNC_DATABASE_URL)
+if async_engine.dialect.name == "sqlite":
+    @event.listens_for(async_engine.sync_engine, "connect")
+    def set_async_sqlite_pragmas(dbapi_connection, connection_record):
+        apply_sqlite_pragmas(dbapi_connection, sqlite_pragmas(settings.SQLITE_PRAGMA_PROFILE))
+AsyncSessionLocal=async_sessionmaker(bind=async_engine,autoflush=False,expire_on_commit=False)
 Base=declarative_base()
 
 def get_db():
@@ -15,6 +59,10 @@ def get_db():
     try:
         yield db
     finally:
-        db.close()    
-        
-        
\ No newline at end of file
+        db.close()
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
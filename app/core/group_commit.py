@@ -0,0 +1,145 @@
+import contextvars
+import queue
+import threading
+import time
+from concurrent.futures import Future, TimeoutError as FuturesTimeout
+from app.core.config import settings
+from app.core.database import SessionLocal
+
+
+class GroupCommitWriter:
+    """
+    Group commit for ledger postings.
+
+    Request threads submit a posting function (db -> result, no commit of its
+    own) and block on a future. A single writer thread takes up to max_batch
+    queued postings - waiting at most max_delay_ms after the first one - runs
+    them in one database transaction and commits once, so N postings share a
+    single fsync. Each future then completes with its posting's own result.
+
+    If any posting in a batch raises, the batch is rolled back and every
+    posting is retried in its own transaction, so one bad posting only fails
+    its own request.
+
+    Postings run in a copy of the submitting request's context, so their SQL
+    statements count towards that request's query stats and budget.
+    """
+
+    def __init__(self, max_batch: int, max_delay_ms: float, timeout_seconds: float, session_factory=SessionLocal):
+        self.max_batch = max_batch
+        self.max_delay = max_delay_ms / 1000.0
+        self.timeout_seconds = timeout_seconds
+        self.session_factory = session_factory
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._thread = None
+        self._batches = 0
+        self._postings = 0
+        self._largest_batch = 0
+        self._fallbacks = 0
+
+    def submit(self, posting):
+        """Run posting(db) in the next group commit and return its result (or raise its error)."""
+        self.start()
+        future = Future()
+        context = contextvars.copy_context()
+        self._queue.put((lambda db: context.run(posting, db), future))
+        try:
+            return future.result(timeout=self.timeout_seconds)
+        except FuturesTimeout:
+            if future.cancel():
+                raise  # never started, so it will not be applied
+            return future.result()  # already in a batch: wait for its outcome
+
+    def _collect(self) -> list:
+        batch = [self._queue.get()]
+        deadline = time.monotonic() + self.max_delay
+        while len(batch) < self.max_batch and batch[-1] is not None:
+            remaining = deadline - time.monotonic()
+            try:
+                batch.append(self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _apply(self, batch: list):
+        db = self.session_factory()
+        try:
+            try:
+                results = [posting(db) for posting, _ in batch]
+                db.commit()
+            except Exception:
+                db.rollback()
+                results = None
+            if results is not None:
+                for (_, future), result in zip(batch, results):
+                    future.set_result(result)
+                return
+
+            # Isolate the failing posting: one transaction each
+            with self._lock:
+                self._fallbacks += 1
+            for posting, future in batch:
+                try:
+                    result = posting(db)
+                    db.commit()
+                    future.set_result(result)
+                except Exception as e:
+                    db.rollback()
+                    future.set_exception(e)
+        finally:
+            db.close()
+
+    def _run(self):
+        while True:
+            batch = self._collect()
+            stopping = batch[-1] is None
+            batch = [item for item in batch if item is not None and item[1].set_running_or_notify_cancel()]
+            if batch:
+                try:
+                    self._apply(batch)
+                except Exception as e:
+                    print(f"group commit failed {e}")
+                    for _, future in batch:
+                        if not future.done():
+                            future.set_exception(e)
+                with self._lock:
+                    self._batches += 1
+                    self._postings += len(batch)
+                    self._largest_batch = max(self._largest_batch, len(batch))
+            if stopping:
+                return
+
+    def start(self):
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="group-commit-writer", daemon=True)
+                self._thread.start()
+
+    def stop(self):
+        # Postings queued before the sentinel are still applied
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is not None:
+            self._queue.put(None)
+            thread.join()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "queued": self._queue.qsize(),
+                "batches": self._batches,
+                "postings": self._postings,
+                "avg_batch": round(self._postings / self._batches, 2) if self._batches else 0.0,
+                "largest_batch": self._largest_batch,
+                "fallbacks": self._fallbacks,
+            }
+
+
+group_commit = GroupCommitWriter(
+    max_batch=settings.GROUP_COMMIT_MAX_BATCH,
+    max_delay_ms=settings.GROUP_COMMIT_MAX_DELAY_MS,
+    timeout_seconds=settings.GROUP_COMMIT_TIMEOUT_SECONDS,
+)
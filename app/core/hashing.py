@@ -0,0 +1,113 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from passlib.context import CryptContext
+from app.core.config import settings
+
+# Each worker process builds its own context the first time it is used
+_worker_context = None
+
+
+def _get_worker_context() -> CryptContext:
+    global _worker_context
+    if _worker_context is None:
+        _worker_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+    return _worker_context
+
+
+def _hash_in_worker(password: str) -> str:
+    return _get_worker_context().hash(password)
+
+
+def _verify_in_worker(plain_password: str, hashed_password: str) -> bool:
+    return _get_worker_context().verify(plain_password, hashed_password)
+
+
+def _warm_worker() -> None:
+    _get_worker_context()
+
+
+class PasswordHasher:
+    """
+    Runs bcrypt hashing/verification in a dedicated process pool so a burst of
+    logins cannot occupy the event loop or Starlette's shared threadpool.
+
+    start() creates the pool and forks its workers; call it first in the
+    application's startup, before any other thread exists, so no worker is
+    forked while another thread holds a lock.
+    """
+
+    def __init__(self, max_workers: int):
+        self.max_workers = max_workers
+        self._executor = None
+        self._lock = threading.Lock()
+
+        # Metrics
+        self._queued = 0
+        self._completed = 0
+        self._failed = 0
+        self._total_latency = 0.0
+        self._max_latency = 0.0
+
+    def start(self):
+        with self._lock:
+            if self._executor is not None:
+                return
+            self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+            # One task per worker makes the pool fork all of them now
+            warmups = [self._executor.submit(_warm_worker) for _ in range(self.max_workers)]
+        for warmup in warmups:
+            warmup.result()
+
+    async def _submit(self, fn, *args):
+        loop = asyncio.get_running_loop()
+        executor = self._executor
+        if executor is None:
+            raise RuntimeError("Password hasher is not started")
+        submitted = time.perf_counter()
+        with self._lock:
+            self._queued += 1
+        succeeded = False
+        try:
+            future = loop.run_in_executor(executor, fn, *args)
+            result = await future
+            succeeded = True
+        finally:
+            latency = time.perf_counter() - submitted
+            with self._lock:
+                self._queued -= 1
+                if succeeded:
+                    self._completed += 1
+                    self._total_latency += latency
+                    self._max_latency = max(self._max_latency, latency)
+                else:
+                    self._failed += 1
+        return result
+
+    async def hash(self, password: str) -> str:
+        return await self._submit(_hash_in_worker, password)
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        return await self._submit(_verify_in_worker, plain_password, hashed_password)
+
+    def stats(self) -> dict:
+        with self._lock:
+            completed = self._completed
+            return {
+                "workers": self.max_workers,
+                "queue_depth": self._queued,
+                "completed": completed,
+                "failed": self._failed,
+                "avg_latency_ms": round(self._total_latency / completed * 1000, 2) if completed else 0.0,
+                "max_latency_ms": round(self._max_latency * 1000, 2),
+            }
+
+    def shutdown(self):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True, cancel_futures=True)
+                self._executor = None
+
+
+password_hasher = PasswordHasher(max_workers=settings.HASH_POOL_WORKERS)
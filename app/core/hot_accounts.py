@@ -0,0 +1,52 @@
+import threading
+from sqlalchemy import select
+from app.core.database import SessionLocal
+from app.models.AccountModel import Account
+
+
+class HotAccountRegistry:
+    """
+    account_number -> (account_id, slots) for accounts in hot-account mode,
+    so deposits can pick the sharded path without an extra query. It is
+    loaded at startup and reloaded by the scheduler every
+    HOT_ACCOUNT_REFRESH_SECONDS; get() only reads the dict.
+
+    A stale entry is harmless: a credit aimed at a slot that no longer exists
+    updates no row and falls back to the normal balance update, and an
+    account made hot by another worker simply keeps using the main row until
+    the next reload (workers started with SCHEDULER_ENABLED=false only see
+    the startup load and their own hot-mode changes).
+    """
+
+    def __init__(self):
+        self._accounts = {}
+        self._lock = threading.Lock()
+
+    def refresh(self):
+        db = SessionLocal()
+        try:
+            rows = db.execute(
+                select(Account.account_number, Account.account_id, Account.balance_slots)
+                .where(Account.balance_slots > 0)
+            ).all()
+        finally:
+            db.close()
+        with self._lock:
+            self._accounts = {row.account_number: (row.account_id, row.balance_slots) for row in rows}
+
+    def get(self, account_number: str):
+        return self._accounts.get(account_number)  # refresh() swaps the whole dict, so no lock needed
+
+    def set(self, account_number: str, account_id: int, slots: int):
+        with self._lock:
+            if slots:
+                self._accounts[account_number] = (account_id, slots)
+            else:
+                self._accounts.pop(account_number, None)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"hot_accounts": len(self._accounts)}
+
+
+hot_accounts = HotAccountRegistry()
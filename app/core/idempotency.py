@@ -0,0 +1,228 @@
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict, namedtuple
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from fastapi import HTTPException, Response
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import select, delete
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.models.IdempotencyKeyModel import IdempotencyRecord
+
+StoredResponse = namedtuple("StoredResponse", ["request_hash", "response_hash", "status_code", "body", "expires_at"])
+
+
+def _sha256(text: str) -> str:
+    return hashlib.sha256(text.encode()).hexdigest()
+
+
+class IdempotencyGuard:
+    """Handed to the endpoint by IdempotencyStore.guard()."""
+
+    def __init__(self, store, db: Session, key_hash: str, request_hash: str, status_code: int, replay=None):
+        self.store = store
+        self.db = db
+        self.key_hash = key_hash
+        self.request_hash = request_hash
+        self.status_code = status_code
+        self.replay = replay  # stored response to return instead of running the endpoint
+        self.committed = False  # True once this request's own work was committed
+
+    def commit(self, response: dict):
+        """
+        Commit the endpoint's work together with its stored response. If
+        another worker committed the same key first, our work is rolled back
+        and its response is returned instead.
+        """
+        if self.key_hash is None:
+            self.db.commit()
+            self.committed = True
+            return response
+
+        body = json.dumps(jsonable_encoder(response), separators=(",", ":"))
+        stored = StoredResponse(
+            self.request_hash, _sha256(body), self.status_code, body,
+            datetime.utcnow() + timedelta(seconds=self.store.ttl_seconds),
+        )
+        self.db.add(IdempotencyRecord(
+            key_hash=self.key_hash,
+            request_hash=stored.request_hash,
+            response_hash=stored.response_hash,
+            status_code=stored.status_code,
+            response_body=stored.body,
+            expires_at=stored.expires_at,
+        ))
+        try:
+            self.db.commit()
+        except IntegrityError:
+            self.db.rollback()
+            existing = self.store._load(self.db, self.key_hash)
+            if existing is None:
+                raise
+            self.store._remember(self.key_hash, existing)
+            return self.store._replay(existing, self.request_hash)
+
+        self.committed = True
+        self.store._remember(self.key_hash, stored)
+        self.store._maybe_purge()
+        return response
+
+
+class IdempotencyStore:
+    """
+    Idempotency-Key support for endpoints that move money.
+
+    The stored response is inserted in the same database transaction as the
+    posting itself, so a key is recorded exactly when its effect is. Replays
+    are answered from an in-memory LRU, then from the idempotency_keys table.
+    Concurrent duplicates within a process wait for the first request to
+    finish; across workers the later commit hits the primary key, is rolled
+    back, and replays the winner's response.
+    """
+
+    def __init__(self, ttl_seconds: int, max_entries: int, wait_seconds: float, purge_seconds: int):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.wait_seconds = wait_seconds
+        self.purge_seconds = purge_seconds
+        self._cache = OrderedDict()  # key_hash -> StoredResponse
+        self._inflight = {}          # key_hash -> threading.Event
+        self._lock = threading.Lock()
+        self._last_purge = 0.0
+        self._hits = 0
+        self._db_hits = 0
+        self._misses = 0
+        self._waits = 0
+
+    @staticmethod
+    def fingerprint(**fields) -> str:
+        return _sha256(json.dumps(fields, sort_keys=True, default=str))
+
+    def _cached(self, key_hash: str):
+        with self._lock:
+            stored = self._cache.get(key_hash)
+            if stored is None:
+                return None
+            if stored.expires_at <= datetime.utcnow():
+                del self._cache[key_hash]
+                return None
+            self._cache.move_to_end(key_hash)
+            self._hits += 1
+            return stored
+
+    def _remember(self, key_hash: str, stored: StoredResponse):
+        with self._lock:
+            self._cache[key_hash] = stored
+            self._cache.move_to_end(key_hash)
+            while len(self._cache) > self.max_entries:
+                self._cache.popitem(last=False)
+
+    def _load(self, db: Session, key_hash: str):
+        record = db.execute(select(IdempotencyRecord).where(IdempotencyRecord.key_hash == key_hash)).scalar_one_or_none()
+        if record is None:
+            return None
+        if record.expires_at <= datetime.utcnow():
+            # Expired: drop it in the caller's transaction so the key can be reused
+            db.execute(delete(IdempotencyRecord).where(IdempotencyRecord.key_hash == key_hash))
+            return None
+        if _sha256(record.response_body) != record.response_hash:
+            raise HTTPException(status_code=500, detail="Stored idempotent response failed its integrity check")
+        with self._lock:
+            self._db_hits += 1
+        return StoredResponse(record.request_hash, record.response_hash, record.status_code, record.response_body, record.expires_at)
+
+    @staticmethod
+    def _replay(stored: StoredResponse, request_hash: str) -> Response:
+        if stored.request_hash != request_hash:
+            raise HTTPException(status_code=422, detail="Idempotency-Key was already used for a different request")
+        return Response(
+            content=stored.body,
+            status_code=stored.status_code,
+            media_type="application/json",
+            headers={"Idempotent-Replayed": "true"},
+        )
+
+    @contextmanager
+    def guard(self, db: Session, key: str, scope: str, request_hash: str, status_code: int):
+        """
+        Usage in a sync endpoint:
+
+            with idempotency_store.guard(db, key, "deposit", fingerprint, 200) as guard:
+                if guard.replay is not None:
+                    return guard.replay
+                ... do the work without committing ...
+                return guard.commit(response)
+        """
+        if not key:
+            yield IdempotencyGuard(self, db, None, request_hash, status_code)
+            return
+
+        key_hash = _sha256(f"{scope}:{key}")
+        deadline = time.monotonic() + self.wait_seconds
+        while True:
+            stored = self._cached(key_hash)
+            if stored is not None:
+                yield IdempotencyGuard(self, db, key_hash, request_hash, status_code, self._replay(stored, request_hash))
+                return
+            with self._lock:
+                event = self._inflight.get(key_hash)
+                if event is None:
+                    self._inflight[key_hash] = threading.Event()
+                    break
+                self._waits += 1
+            # Same key already running in this process: wait for its outcome
+            if not event.wait(max(0.0, deadline - time.monotonic())):
+                raise HTTPException(status_code=409, detail="A request with this Idempotency-Key is still in progress")
+
+        try:
+            stored = self._load(db, key_hash)
+            if stored is not None:
+                self._remember(key_hash, stored)
+                yield IdempotencyGuard(self, db, key_hash, request_hash, status_code, self._replay(stored, request_hash))
+            else:
+                with self._lock:
+                    self._misses += 1
+                yield IdempotencyGuard(self, db, key_hash, request_hash, status_code)
+        finally:
+            with self._lock:
+                self._inflight.pop(key_hash).set()
+
+    def _maybe_purge(self):
+        now = time.monotonic()
+        with self._lock:
+            if now - self._last_purge < self.purge_seconds:
+                return
+            self._last_purge = now
+        db = SessionLocal()
+        try:
+            db.execute(delete(IdempotencyRecord).where(IdempotencyRecord.expires_at <= datetime.utcnow()))
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            print(f"idempotency purge failed {e}")
+        finally:
+            db.close()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "cached_keys": len(self._cache),
+                "in_flight": len(self._inflight),
+                "memory_hits": self._hits,
+                "db_hits": self._db_hits,
+                "misses": self._misses,
+                "waits": self._waits,
+            }
+
+
+idempotency_store = IdempotencyStore(
+    ttl_seconds=settings.IDEMPOTENCY_TTL_SECONDS,
+    max_entries=settings.IDEMPOTENCY_CACHE_SIZE,
+    wait_seconds=settings.IDEMPOTENCY_WAIT_SECONDS,
+    purge_seconds=settings.IDEMPOTENCY_PURGE_SECONDS,
+)
@@ -0,0 +1,228 @@
+"""
+Daily interest accrual for Savings and FD accounts.
+
+Eligible accounts are read in account_id order, INTEREST_CHUNK_SIZE at a
+time, as columns (ids, types, balances) and the day's interest is computed
+for the whole chunk at once with NumPy:
+
+    interest = round(max(balance, 0) * annual_rate / INTEREST_DAYS_PER_YEAR, 2)
+
+Each chunk is one database transaction: an executemany balance UPDATE, an
+executemany insert of Interest transactions, and a conditional advance of the
+date's watermark in interest_accruals (last_account_id). The watermark makes
+a run restartable per chunk, and because it only advances from the value
+that was read, a chunk can never be applied twice for the same date - not by
+a retry, nor by a second worker running the same job.
+
+Run directly for a given date (default: yesterday, UTC):
+
+    python -m app.core.interest [YYYY-MM-DD]
+"""
+import sys
+import threading
+from datetime import date, datetime, timedelta
+import numpy as np
+from sqlalchemy import select, update, insert, func, bindparam
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+import app.models  # noqa: F401  (registers every table on Base.metadata)
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.core.balance_cache import balance_cache
+from app.function.ledger import slot_total
+from app.models.AccountModel import Account, AccountTypeEnum
+from app.models.TransactionModel import Transaction, TransactionTypeEnum
+from app.models.InterestAccrualModel import InterestAccrual
+
+
+class InterestEngine:
+    def __init__(self, rates: dict, days_per_year: int, chunk_size: int):
+        self.rates = rates  # account_type value -> annual rate
+        self.days_per_year = days_per_year
+        self.chunk_size = chunk_size
+        self._lock = threading.Lock()
+        self._last_run = None
+
+    def daily_interest(self, account_types, balances) -> np.ndarray:
+        types = np.asarray(account_types, dtype=object)
+        balances = np.nan_to_num(np.asarray(balances, dtype=np.float64))
+        rates = np.zeros(len(types), dtype=np.float64)
+        for account_type, rate in self.rates.items():
+            rates[types == account_type] = rate
+        return np.round(np.maximum(balances, 0.0) * rates / self.days_per_year, 2)
+
+    def _watermark(self, db: Session, accrual_date: date):
+        # Returns (last_account_id, finished), creating the date's row on first use
+        for _ in range(2):
+            row = db.execute(
+                select(InterestAccrual.last_account_id, InterestAccrual.finished_at)
+                .where(InterestAccrual.accrual_date == accrual_date)
+            ).first()
+            if row is not None:
+                db.rollback()
+                return row.last_account_id, row.finished_at is not None
+            try:
+                db.execute(insert(InterestAccrual).values(accrual_date=accrual_date, last_account_id=0))
+                db.commit()
+                return 0, False
+            except IntegrityError:
+                db.rollback()  # another worker started the same date
+        raise RuntimeError(f"Could not start interest accrual for {accrual_date}")
+
+    def _accrue_chunk(self, db: Session, accrual_date: date, after_id: int):
+        """Apply one chunk; returns the new watermark, or None when no accounts are left."""
+        rows = db.execute(
+            select(
+                Account.account_id, Account.account_number, Account.account_type,
+                Account.balance + slot_total(Account.account_id),  # hot accounts earn on unfolded credits too
+            )
+            .where(
+                Account.account_id > after_id,
+                Account.account_type.in_(list(self.rates)),
+                Account.status == "Active",
+            )
+            .order_by(Account.account_id)
+            .limit(self.chunk_size)
+        ).all()
+        if not rows:
+            return None
+
+        account_ids, account_numbers, account_types, balances = zip(*rows)
+        interest = self.daily_interest(account_types, balances)
+        credited = np.flatnonzero(interest >= 0.01)
+        last_id = account_ids[-1]
+        amounts = interest[credited]
+
+        claimed = db.execute(
+            update(InterestAccrual)
+            .where(
+                InterestAccrual.accrual_date == accrual_date,
+                InterestAccrual.last_account_id == after_id,
+                InterestAccrual.finished_at.is_(None),
+            )
+            .values(
+                last_account_id=last_id,
+                accounts_accrued=InterestAccrual.accounts_accrued + int(credited.size),
+                total_interest=InterestAccrual.total_interest + float(amounts.sum()),
+            )
+        ).rowcount
+        if claimed != 1:
+            db.rollback()
+            return self._watermark(db, accrual_date)[0]  # someone else applied this chunk
+
+        if credited.size:
+            now = datetime.now()
+            targets = [{"target_id": account_ids[i], "interest": float(a)} for i, a in zip(credited.tolist(), amounts.tolist())]
+            accounts_table = Account.__table__
+            db.execute(
+                update(accounts_table)
+                .where(accounts_table.c.account_id == bindparam("target_id"))
+                .values(
+                    balance=accounts_table.c.balance + bindparam("interest"),
+                    version=accounts_table.c.version + 1,
+                    updated_at=now,
+                ),
+                targets,
+            )
+            db.execute(
+                insert(Transaction.__table__),
+                [
+                    {
+                        "account_id": t["target_id"],
+                        "transaction_type": TransactionTypeEnum.INTEREST.value,
+                        "amount": t["interest"],
+                        "description": f"Interest for {accrual_date.isoformat()}",
+                        "reference": f"INT{accrual_date:%Y%m%d}",
+                    }
+                    for t in targets
+                ],
+            )
+        db.commit()
+        if credited.size:
+            balance_cache.invalidate(*(account_numbers[i] for i in credited.tolist()))
+        return last_id
+
+    def accrue(self, accrual_date: date) -> dict:
+        if not self._lock.acquire(blocking=False):
+            raise RuntimeError("An interest accrual run is already in progress")
+        started = datetime.now()
+        db = SessionLocal()
+        try:
+            watermark, finished = self._watermark(db, accrual_date)
+            chunks = 0
+            while not finished:
+                next_watermark = self._accrue_chunk(db, accrual_date, watermark)
+                if next_watermark is None:
+                    db.execute(
+                        update(InterestAccrual)
+                        .where(InterestAccrual.accrual_date == accrual_date, InterestAccrual.finished_at.is_(None))
+                        .values(finished_at=datetime.now())
+                    )
+                    db.commit()
+                    break
+                watermark = next_watermark
+                chunks += 1
+            totals = db.execute(
+                select(InterestAccrual.accounts_accrued, InterestAccrual.total_interest)
+                .where(InterestAccrual.accrual_date == accrual_date)
+            ).one()
+        finally:
+            db.close()
+            self._lock.release()
+
+        summary = {
+            "accrual_date": accrual_date.isoformat(),
+            "already_accrued": finished,
+            "chunks": chunks,
+            "accounts_accrued": totals.accounts_accrued,
+            "total_interest": round(totals.total_interest, 2),
+            "seconds": round((datetime.now() - started).total_seconds(), 3),
+        }
+        self._last_run = summary
+        print(f"interest accrual {summary}")
+        return summary
+
+    def run_due(self, today: date = None) -> list:
+        """Accrue every day since the last accrued date, up to yesterday (UTC)."""
+        yesterday = (today or datetime.utcnow().date()) - timedelta(days=1)
+        db = SessionLocal()
+        try:
+            unfinished = list(db.execute(
+                select(InterestAccrual.accrual_date)
+                .where(InterestAccrual.finished_at.is_(None))
+                .order_by(InterestAccrual.accrual_date)
+            ).scalars())
+            latest = db.execute(select(func.max(InterestAccrual.accrual_date))).scalar()
+        finally:
+            db.close()
+
+        due = list(unfinished)
+        day = latest + timedelta(days=1) if latest else yesterday
+        while day <= yesterday:
+            due.append(day)
+            day += timedelta(days=1)
+        return [self.accrue(accrual_date) for accrual_date in due]
+
+    def stats(self) -> dict:
+        return {"running": self._lock.locked(), "last_run": self._last_run}
+
+
+interest_engine = InterestEngine(
+    rates={
+        AccountTypeEnum.SAVINGS.value: settings.INTEREST_RATE_SAVINGS,
+        AccountTypeEnum.FD.value: settings.INTEREST_RATE_FD,
+    },
+    days_per_year=settings.INTEREST_DAYS_PER_YEAR,
+    chunk_size=settings.INTEREST_CHUNK_SIZE,
+)
+
+
+if __name__ == "__main__":
+    from app.core.migrations import run_migrations
+
+    run_migrations()
+    if len(sys.argv) > 1:
+        interest_engine.accrue(date.fromisoformat(sys.argv[1]))
+    else:
+        interest_engine.run_due()
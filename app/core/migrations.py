@@ -0,0 +1,215 @@
+"""
+Versioned schema migrations, run at startup in place of a bare
+Base.metadata.create_all.
+
+create_all still creates missing tables (and, on a fresh database, their
+indexes). Changes that create_all cannot make to an existing database -
+such as adding indexes to tables that already exist - are listed in
+MIGRATIONS and applied once each, in order, recorded in schema_migrations.
+
+Run directly to migrate and then verify that the hot router queries are
+served by an index (exits non-zero if any falls back to a full table scan):
+
+    python -m app.core.migrations
+"""
+import sys
+from datetime import datetime
+from sqlalchemy import Column, Integer, String, DateTime, MetaData, Table, Index, select, insert, inspect, literal, tuple_
+import app.models  # noqa: F401  (registers every table on Base.metadata)
+from app.core.database import Base, engine
+from app.function.customer_search import create_search_index
+
+migration_metadata = MetaData()
+schema_migrations = Table(
+    "schema_migrations",
+    migration_metadata,
+    Column("version", Integer, primary_key=True),
+    Column("name", String(200), nullable=False),
+    Column("applied_at", DateTime, nullable=False),
+)
+
+
+# Indexes that applied migrations created but the models no longer declare
+# (table, columns), so those migrations still run unchanged on a new database
+RETIRED_INDEXES = {
+    "ix_transactions_account_id_timestamp": ("transactions", ("account_id", "timestamp")),
+    "ix_transactions_account_history": (
+        "transactions", ("account_id", "timestamp", "transaction_id", "transaction_type", "amount"),
+    ),
+}
+
+
+def _retired_index(name):
+    table_name, columns = RETIRED_INDEXES[name]
+    table = Table(table_name, MetaData(), *(Column(column) for column in columns))
+    return Index(name, *(table.c[column] for column in columns))
+
+
+def create_indexes(*index_names):
+    # Build a migration step that creates model-declared (or retired) indexes if missing
+    def step(conn):
+        wanted = set(index_names)
+        for table in Base.metadata.sorted_tables:
+            for index in table.indexes:
+                if index.name in wanted:
+                    index.create(bind=conn, checkfirst=True)
+                    wanted.discard(index.name)
+        for name in sorted(wanted & set(RETIRED_INDEXES)):
+            _retired_index(name).create(bind=conn, checkfirst=True)
+            wanted.discard(name)
+        if wanted:
+            raise RuntimeError(f"Unknown indexes in migration: {sorted(wanted)}")
+    return step
+
+
+def add_columns(table_name, *column_names):
+    # Build a migration step that adds model-declared columns missing from an existing table
+    def step(conn):
+        table = Base.metadata.tables[table_name]
+        existing = {column["name"] for column in inspect(conn).get_columns(table_name)}
+        for name in column_names:
+            if name in existing:
+                continue
+            column = table.c[name]
+            ddl = f"ALTER TABLE {table_name} ADD COLUMN {name} {column.type.compile(dialect=conn.dialect)}"
+            if column.server_default is not None:
+                # Existing rows get the default, so NOT NULL columns can be added too
+                ddl += f"{'' if column.nullable else ' NOT NULL'} DEFAULT {column.server_default.arg}"
+            conn.exec_driver_sql(ddl)
+    return step
+
+
+def drop_indexes(table_name, *index_names):
+    # Build a migration step that drops indexes no longer declared on the models
+    def step(conn):
+        existing = {index["name"] for index in inspect(conn).get_indexes(table_name)}
+        for name in index_names:
+            if name not in existing:
+                continue
+            if conn.dialect.name == "mysql":
+                conn.exec_driver_sql(f"DROP INDEX {name} ON {table_name}")
+            else:
+                conn.exec_driver_sql(f"DROP INDEX {name}")
+    return step
+
+
+def steps(*migration_steps):
+    def step(conn):
+        for migration_step in migration_steps:
+            migration_step(conn)
+    return step
+
+
+MIGRATIONS = [
+    (1, "hot lookup indexes", create_indexes(
+        "ix_login_user_email",
+        "ix_customers_table_login_id",
+        "ix_customers_table_kyc_status",
+        "ix_accounts_customer_id",
+        "ix_transactions_account_id_timestamp",
+        "ix_loans_customer_id_status",
+    )),
+    (2, "transfer reference on transactions", steps(
+        add_columns("transactions", "reference"),
+        create_indexes("ix_transactions_reference"),
+    )),
+    (3, "covering index for keyset transaction history", steps(
+        create_indexes("ix_transactions_account_history"),
+        drop_indexes("transactions", "ix_transactions_account_id_timestamp"),
+    )),
+    (4, "balance version stamp on accounts", add_columns("accounts", "version")),
+    (5, "hot-account balance slots", steps(
+        add_columns("accounts", "balance_slots"),
+        create_indexes("ix_accounts_balance_slots"),
+    )),
+    (6, "keyset index for customer listing", create_indexes("ix_customers_table_created_at_id")),
+    (7, "full-text customer search", create_search_index),
+    (8, "history index covers description and reference", steps(
+        create_indexes("ix_transactions_history_covering"),
+        drop_indexes("transactions", "ix_transactions_account_history"),
+    )),
+]
+
+
+def run_migrations(bind=None):
+    bind = bind or engine
+    Base.metadata.create_all(bind=bind)
+    migration_metadata.create_all(bind=bind)
+
+    with bind.begin() as conn:
+        applied = set(conn.execute(select(schema_migrations.c.version)).scalars())
+    for version, name, step in MIGRATIONS:
+        if version in applied:
+            continue
+        with bind.begin() as conn:
+            step(conn)
+            conn.execute(insert(schema_migrations).values(version=version, name=name, applied_at=datetime.utcnow()))
+        print(f"applied migration {version}: {name}")
+
+
+def hot_queries():
+    # The lookups the routers run on every request, shaped like the router code
+    from app.models import LoginUser, Customer, Account, Transaction, Loan
+
+    return {
+        "user by email (login, get_current_user)": select(LoginUser).where(LoginUser.email == "x"),
+        "user by user_id": select(LoginUser).where(LoginUser.user_id == "x"),
+        "customer by login_id": select(Customer).where(Customer.login_id == 1),
+        "customer by customer_code": select(Customer).where(Customer.customer_code == "x"),
+        "customers by kyc_status": select(Customer).where(Customer.kyc_status == "Pending"),
+        "customer listing page": select(
+                Customer.customer_table_id, Customer.customer_code, Customer.first_name, Customer.created_at
+            )
+            .where(tuple_(Customer.created_at, Customer.customer_table_id) < tuple_(literal("x"), literal(1)))
+            .order_by(Customer.created_at.desc(), Customer.customer_table_id.desc())
+            .limit(51),
+        "account by account_number": select(Account).where(Account.account_number == "x"),
+        "accounts by customer_id": select(Account).where(Account.customer_id == 1),
+        "transaction history": select(Transaction)
+            .where(Transaction.account_id == 1)
+            .order_by(Transaction.timestamp.desc(), Transaction.transaction_id.desc())
+            .limit(21),
+        "transaction history page": select(Transaction)
+            .where(
+                Transaction.account_id == 1,
+                tuple_(Transaction.timestamp, Transaction.transaction_id) < tuple_(literal("x"), literal(1)),
+                Transaction.transaction_type == "Deposit",
+                Transaction.amount >= 1,
+            )
+            .order_by(Transaction.timestamp.desc(), Transaction.transaction_id.desc())
+            .limit(21),
+        "pending loan for customer": select(Loan).where(Loan.customer_id == 1, Loan.status == "Pending"),
+        "loan by loan_code": select(Loan).where(Loan.loan_code == "x"),
+    }
+
+
+def explain_query_plan(conn, stmt) -> list:
+    compiled = stmt.compile(dialect=conn.dialect)
+    params = tuple(compiled.params[name] for name in (compiled.positiontup or []))
+    rows = conn.exec_driver_sql("EXPLAIN QUERY PLAN " + str(compiled), params).fetchall()
+    return [row[-1] for row in rows]
+
+
+def find_full_scans(bind=None) -> dict:
+    """Return {query name: plan} for every hot query SQLite answers with a full table scan."""
+    bind = bind or engine
+    if bind.dialect.name != "sqlite":
+        return {}
+    offenders = {}
+    with bind.connect() as conn:
+        for name, stmt in hot_queries().items():
+            plan = explain_query_plan(conn, stmt)
+            # "SEARCH <table> USING INDEX" is a lookup; any "SCAN" walks a whole table or index
+            if any(detail.startswith("SCAN ") and detail != "SCAN CONSTANT ROW" for detail in plan):
+                offenders[name] = plan
+    return offenders
+
+
+if __name__ == "__main__":
+    run_migrations()
+    scans = find_full_scans()
+    for name, plan in scans.items():
+        print(f"FULL SCAN: {name}: {plan}")
+    if scans:
+        sys.exit(1)
+    print("all hot queries use an index")
@@ -0,0 +1,107 @@
+import threading
+import time
+from collections import OrderedDict
+from sqlalchemy import inspect
+from app.core.config import settings
+from app.models.login_user import LoginUser
+
+
+class UserSnapshot:
+    """Read-only copy of a LoginUser's columns, safe to share between requests."""
+
+    def __init__(self, user: LoginUser):
+        for attr in inspect(LoginUser).column_attrs:
+            object.__setattr__(self, attr.key, getattr(user, attr.key))
+
+    def __setattr__(self, name, value):
+        raise AttributeError("UserSnapshot is read-only")
+
+
+class PrincipalCache:
+    """
+    Token -> (claims, user snapshot) cache used by get_current_user.
+    An entry lives until the token's exp or the staleness window, whichever
+    comes first, and is dropped early when the user is updated or deleted.
+    """
+
+    def __init__(self, ttl_seconds: int, max_entries: int):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries = OrderedDict()  # token -> (expires_at, claims, snapshot)
+        self._tokens_by_user = {}  # user_table_id -> set(token)
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    def get(self, token: str):
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(token)
+            if entry is None:
+                self._misses += 1
+                return None
+            expires_at, claims, snapshot = entry
+            if expires_at <= now:
+                self._remove(token)
+                self._misses += 1
+                return None
+            self._entries.move_to_end(token)
+            self._hits += 1
+            return claims, snapshot
+
+    def put(self, token: str, claims: dict, user: LoginUser) -> UserSnapshot:
+        snapshot = UserSnapshot(user)
+        expires_at = time.time() + self.ttl_seconds
+        exp = claims.get("exp")
+        if exp is not None:
+            expires_at = min(expires_at, float(exp))
+        with self._lock:
+            if token in self._entries:
+                self._remove(token)
+            self._entries[token] = (expires_at, claims, snapshot)
+            self._tokens_by_user.setdefault(snapshot.user_table_id, set()).add(token)
+            while len(self._entries) > self.max_entries:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+        return snapshot
+
+    def invalidate_user(self, user_table_id: int):
+        with self._lock:
+            for token in self._tokens_by_user.pop(user_table_id, set()):
+                self._entries.pop(token, None)
+
+    def invalidate_token(self, token: str):
+        with self._lock:
+            self._remove(token)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._tokens_by_user.clear()
+
+    def _remove(self, token: str):
+        entry = self._entries.pop(token, None)
+        if entry is None:
+            return
+        user_table_id = entry[2].user_table_id
+        tokens = self._tokens_by_user.get(user_table_id)
+        if tokens is not None:
+            tokens.discard(token)
+            if not tokens:
+                del self._tokens_by_user[user_table_id]
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self._hits,
+                "misses": self._misses,
+            }
+
+
+principal_cache = PrincipalCache(
+    ttl_seconds=settings.AUTH_CACHE_TTL_SECONDS,
+    max_entries=settings.AUTH_CACHE_MAX_ENTRIES,
+)
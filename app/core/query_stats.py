@@ -0,0 +1,97 @@
+import time
+from contextvars import ContextVar
+from fastapi import HTTPException, Request
+from sqlalchemy import event
+from app.core.config import settings
+from app.core.database import engine, async_engine
+
+
+class RequestQueryStats:
+    def __init__(self):
+        self.count = 0
+        self.total_time = 0.0
+        self.budget = None
+        self.statements = []
+
+
+_request_stats: ContextVar = ContextVar("request_query_stats", default=None)
+
+
+class QueryBudgetExceeded(HTTPException):
+    def __init__(self, stats: RequestQueryStats, statement: str):
+        super().__init__(
+            status_code=500,
+            detail={
+                "message": f"Query budget exceeded: statement {stats.count + 1}, budget is {stats.budget}",
+                "statements": stats.statements + [statement],
+            },
+        )
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _request_stats.get()
+    if (
+        settings.QUERY_BUDGET_STRICT and stats is not None
+        and stats.budget is not None and stats.count >= stats.budget
+    ):
+        # Fail before the statement runs, so the request's transaction is rolled back, not committed
+        raise QueryBudgetExceeded(stats, statement)
+    conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info["query_start_time"].pop()
+    stats = _request_stats.get()
+    if stats is None:
+        return
+    stats.count += 1
+    stats.total_time += time.perf_counter() - started
+    if settings.QUERY_BUDGET_STRICT:
+        stats.statements.append(statement)
+
+
+def instrument(bind):
+    event.listen(bind, "before_cursor_execute", _before_cursor_execute)
+    event.listen(bind, "after_cursor_execute", _after_cursor_execute)
+
+
+instrument(engine)
+instrument(async_engine.sync_engine)
+
+
+def current_stats():
+    return _request_stats.get()
+
+
+def query_budget(max_queries: int):
+    """
+    Route dependency declaring how many SQL statements the endpoint may run
+    (including authentication and its postings in the group-commit writer).
+    Over budget is logged; with QUERY_BUDGET_STRICT on - meant for test runs,
+    to catch N+1 loads - the first statement over budget raises instead, so
+    the request fails with a 500 before anything is committed.
+
+    Not counted: statements run after the response headers are sent, i.e.
+    the queries behind a streamed statement download.
+    """
+    async def dependency():
+        stats = _request_stats.get()
+        if stats is not None:
+            stats.budget = max_queries
+    return dependency
+
+
+async def query_stats_middleware(request: Request, call_next):
+    stats = RequestQueryStats()
+    token = _request_stats.set(stats)
+    try:
+        response = await call_next(request)
+    finally:
+        _request_stats.reset(token)
+
+    if stats.budget is not None and stats.count > stats.budget:
+        print(f"query budget exceeded: {request.method} {request.url.path} ran {stats.count} SQL statements, "
+              f"budget is {stats.budget}")
+
+    response.headers["Server-Timing"] = f'db;dur={stats.total_time * 1000:.2f};desc="{stats.count} queries"'
+    return response
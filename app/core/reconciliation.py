@@ -0,0 +1,231 @@
+"""
+Incremental reconciliation of Account.balance against the Transaction rows.
+
+Each account has a checkpoint (last verified transaction_id and the balance
+the ledger implied at that point). A run only sums transactions newer than
+the previous run's high-water mark - a primary-key range scan - grouped by
+account, and only those accounts are joined to their balance and
+checkpoint, so nightly cost follows the day's volume, not the number of
+accounts or total history:
+
+    expected = checkpoint.verified_balance + sum(signed amounts after checkpoint)
+
+An account with no transactions since the last run is not read; a balance
+changed without a transaction row is caught on the account's next posting.
+
+Balances and sums are read in a single SELECT, so both come from one
+snapshot even while postings continue. A mismatch is re-checked against the
+account's full history before it is recorded in reconciliation_exceptions;
+the checkpoint is then re-based on the actual balance so the same drift is
+reported once, not every night.
+
+Run directly (e.g. from cron):
+
+    python -m app.core.reconciliation
+"""
+import threading
+from datetime import datetime
+from sqlalchemy import select, func, case, update, insert, bindparam
+from sqlalchemy.orm import Session, aliased
+
+import app.models  # noqa: F401  (registers every table on Base.metadata)
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.function.ledger import slot_total
+from app.models.AccountModel import Account
+from app.models.TransactionModel import Transaction, CREDIT_TYPES
+from app.models.TransactionArchiveModel import TransactionArchiveSummary
+from app.models.ReconciliationModel import ReconciliationCheckpoint, ReconciliationRun, ReconciliationException
+
+FETCH_SIZE = 5000
+
+
+def signed_amount():
+    return case((Transaction.transaction_type.in_(CREDIT_TYPES), Transaction.amount), else_=-Transaction.amount)
+
+
+class Reconciler:
+    def __init__(self, tolerance: float):
+        self.tolerance = tolerance
+        self._lock = threading.Lock()
+        self._last_run = None
+
+    def _tail_query(self, low: int):
+        # Per-account sums of transactions not yet covered by a checkpoint; only
+        # accounts that appear in them are joined to accounts and checkpoints
+        checkpoint = aliased(ReconciliationCheckpoint)
+        tail = (
+            select(
+                Transaction.account_id,
+                func.sum(signed_amount()).label("delta"),
+                func.max(Transaction.transaction_id).label("last_id"),
+                func.count().label("rows"),
+            )
+            .outerjoin(checkpoint, checkpoint.account_id == Transaction.account_id)
+            .where(
+                Transaction.transaction_id > low,
+                Transaction.transaction_id > func.coalesce(checkpoint.last_transaction_id, 0),
+            )
+            .group_by(Transaction.account_id)
+            .subquery()
+        )
+        return (
+            select(
+                tail.c.account_id,
+                (Account.balance + slot_total(Account.account_id)).label("balance"),  # hot-account slots included
+                ReconciliationCheckpoint.last_transaction_id,
+                ReconciliationCheckpoint.verified_balance,
+                tail.c.delta,
+                tail.c.last_id,
+                tail.c.rows,
+            )
+            .select_from(tail)
+            .join(Account, Account.account_id == tail.c.account_id)
+            .outerjoin(ReconciliationCheckpoint, ReconciliationCheckpoint.account_id == tail.c.account_id)
+        )
+
+    @staticmethod
+    def _full_history(db: Session, account_id: int):
+        # One statement: balance and complete ledger sum (hot rows plus archived
+        # month totals) from the same snapshot
+        archived = (
+            select(func.coalesce(func.sum(TransactionArchiveSummary.credit_total - TransactionArchiveSummary.debit_total), 0.0))
+            .where(TransactionArchiveSummary.account_id == account_id)
+            .scalar_subquery()
+        )
+        return db.execute(
+            select(
+                (Account.balance + slot_total(Account.account_id)).label("balance"),
+                (func.coalesce(func.sum(signed_amount()), 0.0) + archived).label("ledger"),
+                func.coalesce(func.max(Transaction.transaction_id), 0).label("last_id"),
+            )
+            .outerjoin(Transaction, Transaction.account_id == Account.account_id)
+            .where(Account.account_id == account_id)
+            .group_by(Account.account_id, Account.balance)
+        ).one()
+
+    def run(self) -> dict:
+        if not self._lock.acquire(blocking=False):
+            raise RuntimeError("A reconciliation run is already in progress")
+        db = SessionLocal()
+        try:
+            return self._run(db)
+        finally:
+            db.close()
+            self._lock.release()
+
+    def _run(self, db: Session) -> dict:
+        started_at = datetime.now()
+        low = db.execute(
+            select(func.coalesce(func.max(ReconciliationRun.high_water_transaction_id), 0))
+            .where(ReconciliationRun.finished_at.is_not(None))
+        ).scalar_one()
+
+        high_water = low
+        accounts_checked = transactions_checked = 0
+        checkpoint_updates, checkpoint_inserts, suspects = [], [], []
+
+        result = db.execute(self._tail_query(low).execution_options(yield_per=FETCH_SIZE))
+        for partition in result.partitions():
+            for row in partition:
+                accounts_checked += 1
+                transactions_checked += row.rows
+                has_checkpoint = row.last_transaction_id is not None
+                expected = (row.verified_balance or 0.0) + row.delta
+                if abs(row.balance - expected) > self.tolerance:
+                    suspects.append(row.account_id)
+                    continue
+                high_water = max(high_water, row.last_id)
+                values = {"target_id": row.account_id, "last_id": row.last_id, "verified": expected}
+                (checkpoint_updates if has_checkpoint else checkpoint_inserts).append(values)
+        db.rollback()  # end the read before writing
+
+        existing = set(db.execute(
+            select(ReconciliationCheckpoint.account_id)
+            .where(ReconciliationCheckpoint.account_id.in_(suspects))
+        ).scalars()) if suspects else set()
+        mismatches = []
+        for account_id in suspects:
+            state = self._full_history(db, account_id)
+            high_water = max(high_water, state.last_id)
+            if abs(state.balance - state.ledger) > self.tolerance:
+                mismatches.append((account_id, state))
+                verified = state.balance  # re-base so this drift is reported once
+            else:
+                verified = state.ledger   # checkpoint was behind (e.g. account created mid-run)
+            values = {"target_id": account_id, "last_id": state.last_id, "verified": verified}
+            (checkpoint_updates if account_id in existing else checkpoint_inserts).append(values)
+        db.rollback()
+
+        now = datetime.now()
+        run = ReconciliationRun(
+            started_at=started_at,
+            finished_at=now,
+            high_water_transaction_id=high_water,
+            accounts_checked=accounts_checked,
+            transactions_checked=transactions_checked,
+            mismatches=len(mismatches),
+        )
+        db.add(run)
+        db.flush()
+        run_id = run.run_id
+        checkpoints = ReconciliationCheckpoint.__table__
+        if checkpoint_updates:
+            db.execute(
+                update(checkpoints)
+                .where(checkpoints.c.account_id == bindparam("target_id"))
+                .values(last_transaction_id=bindparam("last_id"), verified_balance=bindparam("verified"), verified_at=now),
+                checkpoint_updates,
+            )
+        if checkpoint_inserts:
+            db.execute(
+                insert(checkpoints),
+                [
+                    {"account_id": v["target_id"], "last_transaction_id": v["last_id"],
+                     "verified_balance": v["verified"], "verified_at": now}
+                    for v in checkpoint_inserts
+                ],
+            )
+        if mismatches:
+            db.execute(
+                insert(ReconciliationException.__table__),
+                [
+                    {
+                        "run_id": run_id,
+                        "account_id": account_id,
+                        "expected_balance": state.ledger,
+                        "actual_balance": state.balance,
+                        "difference": state.balance - state.ledger,
+                        "last_transaction_id": state.last_id,
+                        "status": "Open",
+                        "detected_at": now,
+                    }
+                    for account_id, state in mismatches
+                ],
+            )
+        db.commit()
+
+        summary = {
+            "run_id": run_id,
+            "accounts_checked": accounts_checked,
+            "transactions_checked": transactions_checked,
+            "mismatches": len(mismatches),
+            "high_water_transaction_id": high_water,
+            "seconds": round((now - started_at).total_seconds(), 3),
+        }
+        self._last_run = summary
+        print(f"reconciliation run {summary}")
+        return summary
+
+    def stats(self) -> dict:
+        return {"running": self._lock.locked(), "last_run": self._last_run}
+
+
+reconciler = Reconciler(tolerance=settings.RECONCILIATION_TOLERANCE)
+
+
+if __name__ == "__main__":
+    from app.core.migrations import run_migrations
+
+    run_migrations()
+    reconciler.run()
@@ -0,0 +1,184 @@
+import hashlib
+import math
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from sqlalchemy.exc import IntegrityError
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.models.RevokedTokenModel import RevokedToken
+
+
+class BloomFilter:
+    def __init__(self, capacity: int, error_rate: float):
+        self.size = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, key: str):
+        digest = hashlib.blake2b(key.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        for i in range(self.hash_count):
+            yield (h1 + i * h2) % self.size
+
+    def add(self, key: str):
+        for pos in self._positions(key):
+            self._bits[pos >> 3] |= 1 << (pos & 7)
+
+    def __contains__(self, key: str) -> bool:
+        return all(self._bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(key))
+
+
+class RevocationStore:
+    """
+    Revoked token ids (jti) persisted in the revoked_tokens table so they
+    survive restarts and are shared by every uvicorn worker.
+
+    Each process keeps a Bloom filter of revoked ids in front of the table:
+    a "definitely not revoked" answer - the common case - needs no database
+    round trip. Bloom positives are confirmed through a small LRU and then
+    the table. A background thread pulls rows written by other workers into
+    the filter every REVOCATION_SYNC_SECONDS and purges expired rows (and
+    rebuilds the filter) every REVOCATION_PURGE_SECONDS, so requests never
+    wait on either. Until load() has run, every check goes to the table.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._bloom = None
+        self._lru = OrderedDict()  # jti -> bool (revoked)
+        self._synced_at = None
+        self._last_purge = 0.0
+        self._stopping = threading.Event()
+        self._thread = None
+        self._db_lookups = 0
+        self._bloom_negatives = 0
+
+    def _new_bloom(self) -> BloomFilter:
+        return BloomFilter(settings.REVOCATION_BLOOM_CAPACITY, settings.REVOCATION_BLOOM_ERROR_RATE)
+
+    def load(self):
+        """Purge expired rows and rebuild the Bloom filter from the table."""
+        db = SessionLocal()
+        try:
+            now = datetime.utcnow()
+            db.query(RevokedToken).filter(RevokedToken.expires_at < now).delete(synchronize_session=False)
+            db.commit()
+            bloom = self._new_bloom()
+            for (jti,) in db.query(RevokedToken.jti).yield_per(1000):
+                bloom.add(jti)
+        finally:
+            db.close()
+
+        with self._lock:
+            self._bloom = bloom
+            self._lru.clear()
+            self._synced_at = now
+            self._last_purge = time.monotonic()
+
+    def sync(self):
+        """Add tokens revoked by other workers since the last sync to the filter."""
+        if self._bloom is None:
+            self.load()
+            return
+        with self._lock:
+            since = self._synced_at - timedelta(seconds=1)
+
+        db = SessionLocal()
+        try:
+            synced_at = datetime.utcnow()
+            rows = db.query(RevokedToken.jti).filter(RevokedToken.revoked_at >= since).all()
+        finally:
+            db.close()
+        with self._lock:
+            for (jti,) in rows:
+                self._bloom.add(jti)
+                self._remember(jti, True)
+            self._synced_at = synced_at
+
+    def _run(self):
+        while not self._stopping.wait(timeout=settings.REVOCATION_SYNC_SECONDS):
+            try:
+                if time.monotonic() - self._last_purge >= settings.REVOCATION_PURGE_SECONDS:
+                    self.load()
+                else:
+                    self.sync()
+            except Exception as e:
+                print(f"revocation sync failed {e}")
+
+    def start(self):
+        if self._thread is not None:
+            return
+        self._stopping.clear()
+        self._thread = threading.Thread(target=self._run, name="revocation-sync", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        if self._thread is not None:
+            self._stopping.set()
+            self._thread.join()
+            self._thread = None
+
+    def _remember(self, jti: str, revoked: bool):
+        self._lru[jti] = revoked
+        self._lru.move_to_end(jti)
+        while len(self._lru) > settings.REVOCATION_LRU_SIZE:
+            self._lru.popitem(last=False)
+
+    def is_revoked(self, jti: str) -> bool:
+        with self._lock:
+            if self._bloom is not None and jti not in self._bloom:
+                self._bloom_negatives += 1
+                return False
+            if jti in self._lru:
+                self._lru.move_to_end(jti)
+                return self._lru[jti]
+
+        db = SessionLocal()
+        try:
+            revoked = db.query(RevokedToken.jti).filter(RevokedToken.jti == jti).first() is not None
+        finally:
+            db.close()
+        with self._lock:
+            self._db_lookups += 1
+            self._remember(jti, revoked)
+        return revoked
+
+    def revoke(self, jti: str, expires_at: datetime, user_id: str = None) -> bool:
+        """Persist a revocation. Returns False if the token was already revoked."""
+        db = SessionLocal()
+        try:
+            db.add(RevokedToken(jti=jti, user_id=user_id, expires_at=expires_at, revoked_at=datetime.utcnow()))
+            db.commit()
+            created = True
+        except IntegrityError:
+            db.rollback()
+            created = False
+        finally:
+            db.close()
+
+        with self._lock:
+            if self._bloom is not None:
+                self._bloom.add(jti)
+            self._remember(jti, True)
+        return created
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "bloom_bits": self._bloom.size if self._bloom else 0,
+                "bloom_hashes": self._bloom.hash_count if self._bloom else 0,
+                "lru_entries": len(self._lru),
+                "bloom_negatives": self._bloom_negatives,
+                "db_lookups": self._db_lookups,
+            }
+
+
+def token_jti(claims: dict, token: str) -> str:
+    # Tokens issued before jti was added are identified by their hash
+    return claims.get("jti") or hashlib.sha256(token.encode()).hexdigest()
+
+
+revocation_store = RevocationStore()
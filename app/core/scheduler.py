@@ -0,0 +1,88 @@
+from apscheduler.schedulers.background import BackgroundScheduler
+from apscheduler.triggers.cron import CronTrigger
+from apscheduler.triggers.interval import IntervalTrigger
+from app.core.archive import archiver
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.core.hot_accounts import hot_accounts
+from app.core.interest import interest_engine
+from app.function.ledger import fold_all_slots
+
+scheduler = BackgroundScheduler(timezone="UTC")
+
+
+def accrue_interest():
+    try:
+        interest_engine.run_due()
+    except Exception as e:
+        print(f"interest accrual failed {e}")
+
+
+def archive_transactions():
+    try:
+        archiver.run()
+    except Exception as e:
+        print(f"transaction archive failed {e}")
+
+
+def fold_hot_accounts():
+    db = SessionLocal()
+    try:
+        fold_all_slots(db)
+    except Exception as e:
+        db.rollback()
+        print(f"hot account fold failed {e}")
+    finally:
+        db.close()
+
+
+def refresh_hot_accounts():
+    try:
+        hot_accounts.refresh()
+    except Exception as e:
+        print(f"hot account refresh failed {e}")
+
+
+def start_scheduler():
+    if not settings.SCHEDULER_ENABLED or scheduler.running:
+        return
+    scheduler.add_job(
+        accrue_interest,
+        CronTrigger(hour=settings.INTEREST_ACCRUAL_HOUR, minute=5),
+        id="interest_accrual",
+        replace_existing=True,
+        coalesce=True,
+        max_instances=1,
+        misfire_grace_time=3600,
+    )
+    scheduler.add_job(
+        archive_transactions,
+        CronTrigger(day=settings.ARCHIVE_DAY, hour=settings.ARCHIVE_HOUR, minute=30),
+        id="transaction_archive",
+        replace_existing=True,
+        coalesce=True,
+        max_instances=1,
+        misfire_grace_time=3600,
+    )
+    scheduler.add_job(
+        fold_hot_accounts,
+        IntervalTrigger(seconds=settings.HOT_ACCOUNT_FOLD_SECONDS),
+        id="hot_account_fold",
+        replace_existing=True,
+        coalesce=True,
+        max_instances=1,
+    )
+    scheduler.add_job(
+        refresh_hot_accounts,
+        IntervalTrigger(seconds=settings.HOT_ACCOUNT_REFRESH_SECONDS),
+        id="hot_account_refresh",
+        replace_existing=True,
+        coalesce=True,
+        max_instances=1,
+    )
+    scheduler.start()
+
+
+def stop_scheduler():
+    if scheduler.running:
+        scheduler.shutdown(wait=False)
@@ -7,11 +7,14 @@ from fastapi import HTTPException,status,Depends
 from sqlalchemy.orm import Session
 from app.core.database import get_db
 from app.models.login_user import LoginUser
+from app.core.hashing import password_hasher
+from app.core.principal_cache import principal_cache
+from app.core.revocation import revocation_store, token_jti
+import uuid
 
 
 oauth2_scheme=OAuth2PasswordBearer(tokenUrl="/login")
 pwd_context=CryptContext(schemes=["bcrypt"],deprecated="auto")
-blackedlist_token=set()
 
 def hash_password(password:str) -> str:
     return pwd_context.hash(password)
@@ -19,10 +22,16 @@ def hash_password(password:str) -> str:
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
 
+async def hash_password_async(password:str) -> str:
+    return await password_hasher.hash(password)
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    return await password_hasher.verify(plain_password, hashed_password)
+
 def create_access_token(data:dict,expries_delta:timedelta=None):
     to_encode=data.copy()
     expries_time=datetime.utcnow()+(expries_delta if expries_delta else timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES))
-    to_encode.update({"exp":expries_time})
+    to_encode.update({"exp":expries_time,"jti":uuid.uuid4().hex})
     encrypt=jwt.encode(to_encode,settings.SECRET_KEY,algorithm=settings.ALGORITHM)
     return encrypt
 
@@ -52,6 +61,15 @@ def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(
         detail="Invalid authentication credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
+    # Already verified recently -> skip JWT decode and the user lookup
+    cached = principal_cache.get(token)
+    if cached is not None:
+        claims, user = cached
+        if revocation_store.is_revoked(token_jti(claims, token)):
+            principal_cache.invalidate_token(token)
+            raise credentials_exception
+        return user
+
     try:
         payload = jwt.decode(token, settings.SECRET_KEY, algorithms=["HS256"])
         email: str = payload.get("sub")
@@ -63,10 +81,13 @@ def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(
     except JWTError:
         raise credentials_exception
 
+    if revocation_store.is_revoked(token_jti(payload, token)):
+        raise credentials_exception
+
     user = db.query(LoginUser).filter(LoginUser.email == email).first()
     if user is None:
         raise credentials_exception
-    return user
+    return principal_cache.put(token, payload, user)
 
 # def allow_roles(*allowed_roles: RoleChoose):
 #     def dependency(current_user=Depends(get_current_user)):
@@ -0,0 +1,217 @@
+import threading
+import time
+from array import array
+from collections import namedtuple
+from datetime import datetime, timedelta, timezone
+from sqlalchemy import select
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.models.AccountModel import Account
+from app.models.CustomerModel import Customer
+from app.models.TransactionModel import Transaction, TransactionTypeEnum
+
+# (name, span seconds, buckets): a window covers between span - span/buckets and span seconds
+WINDOWS = (("1m", 60, 12), ("1h", 3600, 12), ("24h", 86400, 24))
+# Transaction types that count against the limits
+DEBIT_TYPES = [TransactionTypeEnum.WITHDRAWAL.value, TransactionTypeEnum.TRANSFER_OUT.value]
+SWEEP_SECONDS = 600
+
+Admission = namedtuple("Admission", ["rejected", "keys", "at", "amount"])
+
+
+class SlidingWindow:
+    """Count and sum over the last `span` seconds, kept in a ring of time buckets."""
+
+    __slots__ = ("width", "size", "counts", "sums", "count", "total", "head")
+
+    def __init__(self, span: int, buckets: int):
+        self.width = span / buckets
+        self.size = buckets
+        self.counts = array("l", [0] * buckets)
+        self.sums = array("d", [0.0] * buckets)
+        self.count = 0
+        self.total = 0.0
+        self.head = None  # newest bucket index covered
+
+    def _advance(self, index: int):
+        if self.head is None or index - self.head >= self.size:
+            for slot in range(self.size):
+                self.counts[slot] = 0
+                self.sums[slot] = 0.0
+            self.count, self.total = 0, 0.0
+        else:
+            for i in range(self.head + 1, index + 1):
+                slot = i % self.size
+                self.count -= self.counts[slot]
+                self.total -= self.sums[slot]
+                self.counts[slot] = 0
+                self.sums[slot] = 0.0
+        self.head = index
+
+    def totals(self, at: float):
+        index = int(at // self.width)
+        if self.head is None or index > self.head:
+            self._advance(index)
+        return self.count, self.total
+
+    def add(self, at: float, count: int, amount: float):
+        index = int(at // self.width)
+        if self.head is None or index > self.head:
+            self._advance(index)
+        elif index <= self.head - self.size:
+            return  # already outside the window
+        slot = index % self.size
+        self.counts[slot] += count
+        self.sums[slot] += amount
+        self.count += count
+        self.total += amount
+
+
+class VelocityCounter:
+    __slots__ = ("windows", "last_at")
+
+    def __init__(self):
+        self.windows = [SlidingWindow(span, buckets) for _, span, buckets in WINDOWS]
+        self.last_at = 0.0
+
+
+def parse_limit(value: str):
+    """"count,amount" -> (max_count, max_amount); 0 disables that half of the limit."""
+    count, amount = (value or "0,0").split(",")
+    return int(count), float(amount)
+
+
+class VelocityGuard:
+    """
+    Velocity limits on money leaving an account (withdrawals and the debit leg
+    of transfers), per account and per user over 1m/1h/24h.
+
+    Each (scope, id) has one ring buffer of time buckets per window with
+    running count and sum, so a check is O(1) with no query: admit() checks
+    every limit and, if all pass, records the withdrawal under the same lock
+    so concurrent requests cannot slip past a limit together. cancel() takes
+    it back when the withdrawal is not committed. The counters are rebuilt
+    from the last 24h of Withdrawal and TransferOut rows at startup.
+
+    Counters live in each worker process and are not shared: with N workers
+    a client spread across them can reach up to N times each limit.
+    """
+
+    def __init__(self, limits: dict, enabled: bool = True):
+        self.limits = limits  # scope -> [(max_count, max_amount) per WINDOWS entry]
+        self.enabled = enabled
+        self._counters = {}  # (scope, id) -> VelocityCounter
+        self._lock = threading.Lock()
+        self._last_sweep = time.time()
+        self._admitted = 0
+        self._rejected = 0
+
+    def _counter(self, key) -> VelocityCounter:
+        counter = self._counters.get(key)
+        if counter is None:
+            counter = self._counters[key] = VelocityCounter()
+        return counter
+
+    def _violation(self, key, amount: float, at: float):
+        counter = self._counters.get(key)
+        if counter is None:
+            return None
+        for (name, _, _), window, (max_count, max_amount) in zip(WINDOWS, counter.windows, self.limits[key[0]]):
+            count, total = window.totals(at)
+            if max_count and count + 1 > max_count:
+                return f"more than {max_count} withdrawals per {name} for this {key[0]}"
+            if max_amount and total + amount > max_amount:
+                return f"more than {max_amount:g} withdrawn per {name} for this {key[0]}"
+        return None
+
+    def _add(self, key, at: float, count: int, amount: float):
+        counter = self._counter(key)
+        for window in counter.windows:
+            window.add(at, count, amount)
+        counter.last_at = max(counter.last_at, at)
+
+    def admit(self, account_id: int, user_id: int, amount: float, at: float = None) -> Admission:
+        keys = (("account", account_id), ("user", user_id))
+        at = at or time.time()
+        if not self.enabled:
+            return Admission(None, (), at, amount)
+        with self._lock:
+            for key in keys:
+                reason = self._violation(key, amount, at)
+                if reason:
+                    self._rejected += 1
+                    return Admission(reason, (), at, amount)
+            for key in keys:
+                self._add(key, at, 1, amount)
+            self._admitted += 1
+            self._maybe_sweep(at)
+        return Admission(None, keys, at, amount)
+
+    def cancel(self, admission: Admission):
+        with self._lock:
+            for key in admission.keys:
+                if key in self._counters:
+                    self._add(key, admission.at, -1, -admission.amount)
+
+    def _maybe_sweep(self, at: float):
+        # Drop counters with no withdrawal inside the longest window
+        if at - self._last_sweep < SWEEP_SECONDS:
+            return
+        self._last_sweep = at
+        horizon = at - WINDOWS[-1][1]
+        for key in [k for k, c in self._counters.items() if c.last_at < horizon]:
+            del self._counters[key]
+
+    def load(self):
+        """Rebuild the counters from the last 24h of withdrawals and outgoing transfers."""
+        since = datetime.now(timezone.utc) - timedelta(seconds=WINDOWS[-1][1])
+        counters = {}
+        db = SessionLocal()
+        try:
+            rows = db.execute(
+                select(Transaction.account_id, Customer.login_id, Transaction.amount, Transaction.timestamp)
+                .join(Account, Account.account_id == Transaction.account_id)
+                .join(Customer, Customer.customer_table_id == Account.customer_id)
+                .where(
+                    Transaction.transaction_type.in_(DEBIT_TYPES),
+                    Transaction.timestamp >= since.replace(tzinfo=None),
+                )
+                .order_by(Transaction.timestamp)
+                .execution_options(yield_per=1000)
+            )
+            with self._lock:
+                self._counters, previous = counters, self._counters
+                try:
+                    for row in rows:
+                        stamp = row.timestamp
+                        if stamp.tzinfo is None:
+                            stamp = stamp.replace(tzinfo=timezone.utc)  # func.now() stores UTC
+                        at = stamp.timestamp()
+                        self._add(("account", row.account_id), at, 1, row.amount)
+                        self._add(("user", row.login_id), at, 1, row.amount)
+                except Exception:
+                    self._counters = previous
+                    raise
+        finally:
+            db.close()
+        print(f"velocity guard loaded {len(counters)} counters")
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "enabled": self.enabled,
+                "counters": len(self._counters),
+                "admitted": self._admitted,
+                "rejected": self._rejected,
+            }
+
+
+velocity_guard = VelocityGuard(
+    limits={
+        "account": [parse_limit(settings.VELOCITY_ACCOUNT_1M), parse_limit(settings.VELOCITY_ACCOUNT_1H),
+                    parse_limit(settings.VELOCITY_ACCOUNT_24H)],
+        "user": [parse_limit(settings.VELOCITY_USER_1M), parse_limit(settings.VELOCITY_USER_1H),
+                 parse_limit(settings.VELOCITY_USER_24H)],
+    },
+    enabled=settings.VELOCITY_ENABLED,
+)
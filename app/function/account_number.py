@@ -0,0 +1,97 @@
+import hashlib
+import hmac
+import threading
+from collections import deque
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.AccountModel import Account
+from app.function.generating_id import allocator
+
+ACCOUNT_NUMBER_LENGTH = 13   # 12-digit body + 1 Luhn check digit
+LEGACY_NUMBER_LENGTH = 12    # random numbers issued before check digits
+_BODY_FLOOR = 10 ** 11       # bodies never start with 0
+_BODY_SPAN = 9 * 10 ** 11
+_HALF = 10 ** 6              # Feistel halves; _HALF ** 2 >= _BODY_SPAN
+_ROUNDS = 4
+
+
+def luhn_check_digit(body: str) -> str:
+    total = 0
+    for i, ch in enumerate(reversed(body)):
+        d = int(ch)
+        if i % 2 == 0:
+            d *= 2
+            if d > 9:
+                d -= 9
+        total += d
+    return str((10 - total % 10) % 10)
+
+
+def is_valid_account_number(account_number: str) -> bool:
+    """Cheap format check done before touching the database."""
+    if not account_number.isdigit():
+        return False
+    if len(account_number) == LEGACY_NUMBER_LENGTH:
+        return True
+    if len(account_number) != ACCOUNT_NUMBER_LENGTH:
+        return False
+    return luhn_check_digit(account_number[:-1]) == account_number[-1]
+
+
+class AccountNumberService:
+    """
+    Issues account numbers that are unique by construction: a sequence value
+    from the hi/lo allocator is mapped through a keyed Feistel permutation
+    (so numbers are not guessable from one another) and given a Luhn check
+    digit. A pool of numbers, already checked against legacy accounts, is kept
+    in memory so create_account never has to retry.
+    """
+
+    def __init__(self, key: str, pool_size: int):
+        self._key = key.encode()
+        self.pool_size = pool_size
+        self._pool = deque()
+        self._lock = threading.Lock()
+
+    def _round(self, value: int, round_no: int) -> int:
+        digest = hmac.new(self._key, f"{round_no}:{value}".encode(), hashlib.sha256).digest()
+        return int.from_bytes(digest[:8], "big") % _HALF
+
+    def _permute(self, value: int) -> int:
+        # Feistel over [0, _HALF ** 2), cycle-walked back into [0, _BODY_SPAN)
+        while True:
+            left, right = divmod(value, _HALF)
+            for round_no in range(_ROUNDS):
+                left, right = right, (left + self._round(right, round_no)) % _HALF
+            value = left * _HALF + right
+            if value < _BODY_SPAN:
+                return value
+
+    def number_for(self, sequence_value: int) -> str:
+        body = str(_BODY_FLOOR + self._permute(sequence_value % _BODY_SPAN))
+        return body + luhn_check_digit(body)
+
+    def _refill(self, db: Session):
+        candidates = [
+            self.number_for(allocator.next_value(db, "ACCT"))
+            for _ in range(self.pool_size - len(self._pool))
+        ]
+        # Guard against an (unlikely) clash with a manually imported number
+        taken = {
+            number for (number,) in
+            db.query(Account.account_number).filter(Account.account_number.in_(candidates))
+        }
+        self._pool.extend(n for n in candidates if n not in taken)
+
+    def take(self, db: Session) -> str:
+        with self._lock:
+            while not self._pool:
+                self._refill(db)
+            return self._pool.popleft()
+
+
+account_numbers = AccountNumberService(
+    key=settings.ACCOUNT_NUMBER_KEY,
+    pool_size=settings.ACCOUNT_NUMBER_POOL_SIZE,
+)
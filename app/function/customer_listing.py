@@ -0,0 +1,93 @@
+from fastapi import HTTPException
+from sqlalchemy import String, func, literal, select, tuple_, type_coerce
+from sqlalchemy.orm import Session
+from app.models.CustomerModel import Customer
+from app.function.pagination import encode_cursor, decode_cursor
+
+# Only the columns the listing returns are loaded, never the KYC/profile columns
+LISTING_COLUMNS = (
+    Customer.customer_table_id,
+    Customer.customer_code,
+    Customer.first_name,
+    Customer.last_name,
+    Customer.email,
+    Customer.phone_number,
+    Customer.account_type,
+    Customer.status,
+    Customer.kyc_status,
+    Customer.city,
+    Customer.country,
+    Customer.created_at,
+)
+
+
+def list_customers(
+    db: Session,
+    limit: int,
+    cursor: str = None,
+    status: str = None,
+    kyc_status: str = None,
+    city: str = None,
+    country: str = None,
+    account_type: str = None,
+    include_total: bool = False,
+) -> dict:
+    """
+    One page of customers, newest first. Keyset pagination seeks past the
+    last (created_at, customer_table_id) seen on ix_customers_table_created_at_id,
+    so page N costs the same as page 1. The total is only counted on request.
+    """
+    filters = []
+    if status:
+        filters.append(Customer.status == status)
+    if kyc_status:
+        filters.append(Customer.kyc_status == kyc_status)
+    if city:
+        filters.append(Customer.city == city)
+    if country:
+        filters.append(Customer.country == country)
+    if account_type:
+        filters.append(Customer.account_type == account_type)
+
+    # Stored timestamp text is compared as-is so cursor boundaries match rows exactly
+    stored_created_at = type_coerce(Customer.created_at, String)
+    stmt = select(*LISTING_COLUMNS, stored_created_at.label("stored_created_at")).where(*filters)
+    if cursor:
+        last_created_at, last_id = decode_cursor(cursor, 2)
+        if not isinstance(last_created_at, str) or not isinstance(last_id, int):
+            raise HTTPException(status_code=400, detail="Invalid pagination cursor.")
+        stmt = stmt.where(
+            tuple_(stored_created_at, Customer.customer_table_id) < tuple_(literal(last_created_at), literal(last_id))
+        )
+    rows = db.execute(
+        stmt.order_by(Customer.created_at.desc(), Customer.customer_table_id.desc()).limit(limit + 1)
+    ).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(str(rows[-1].stored_created_at), rows[-1].customer_table_id)
+
+    total = None
+    if include_total:
+        total = db.execute(select(func.count()).select_from(Customer).where(*filters)).scalar_one()
+
+    return {
+        "total_customers": total,
+        "next_cursor": next_cursor,
+        "data": [
+            {
+                "customer_code": row.customer_code,
+                "full_name": f"{row.first_name} {row.last_name or ''}".strip(),
+                "email": row.email,
+                "phone_number": row.phone_number,
+                "account_type": row.account_type,
+                "status": row.status,
+                "kyc_status": row.kyc_status,
+                "city": row.city,
+                "country": row.country,
+                "created_at": row.created_at,
+            }
+            for row in rows
+        ],
+    }
@@ -0,0 +1,108 @@
+"""
+Full-text customer search.
+
+On SQLite, customers_fts is an FTS5 external-content table over
+customers_table (no copy of the text is stored, only the index), kept in
+sync by AFTER INSERT/UPDATE/DELETE triggers so every write path - ORM,
+Core or raw SQL - updates it in the same transaction. On MySQL the same
+columns get a FULLTEXT index instead.
+
+Each search term is matched as a prefix ("jo" finds John, Jones and
+jo@example.com), all terms must match, and results are ranked by bm25 with
+names and customer code weighted above email, phone and city.
+"""
+import re
+from fastapi import HTTPException, status
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+FTS_TABLE = "customers_fts"
+FULLTEXT_INDEX = "ft_customers_table_search"
+# Indexed columns and their bm25 weights
+SEARCH_COLUMNS = (
+    ("customer_code", 10.0),
+    ("first_name", 8.0),
+    ("last_name", 8.0),
+    ("email", 4.0),
+    ("phone_number", 4.0),
+    ("city", 1.0),
+)
+MAX_TERMS = 8
+
+_columns = ", ".join(name for name, _ in SEARCH_COLUMNS)
+_new_values = ", ".join(f"new.{name}" for name, _ in SEARCH_COLUMNS)
+_old_values = ", ".join(f"old.{name}" for name, _ in SEARCH_COLUMNS)
+
+SQLITE_DDL = [
+    f"""CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(
+        {_columns},
+        content='customers_table', content_rowid='customer_table_id',
+        tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+    )""",
+    f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ai AFTER INSERT ON customers_table BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, {_columns}) VALUES (new.customer_table_id, {_new_values});
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ad AFTER DELETE ON customers_table BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, {_columns}) VALUES ('delete', old.customer_table_id, {_old_values});
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_au AFTER UPDATE OF {_columns} ON customers_table BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, {_columns}) VALUES ('delete', old.customer_table_id, {_old_values});
+        INSERT INTO {FTS_TABLE}(rowid, {_columns}) VALUES (new.customer_table_id, {_new_values});
+    END""",
+    # Index the customers that existed before the table was created
+    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')",
+]
+
+
+def create_search_index(conn):
+    # Migration step: FTS5 table + sync triggers on SQLite, FULLTEXT index on MySQL
+    if conn.dialect.name == "sqlite":
+        for statement in SQLITE_DDL:
+            conn.exec_driver_sql(statement)
+    elif conn.dialect.name == "mysql":
+        conn.exec_driver_sql(f"ALTER TABLE customers_table ADD FULLTEXT INDEX {FULLTEXT_INDEX} ({_columns})")
+
+
+def search_terms(query: str) -> list:
+    # Split the way the unicode61 tokenizer does, so "john.doe@x" matches the stored email tokens
+    terms = re.findall(r"\w+", query.lower())[:MAX_TERMS]
+    if not terms:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Search query must contain letters or digits."
+        )
+    return terms
+
+
+def search_customers(db: Session, query: str, limit: int) -> list:
+    terms = search_terms(query)
+    dialect = db.get_bind().dialect.name
+    if dialect == "sqlite":
+        weights = ", ".join(str(weight) for _, weight in SEARCH_COLUMNS)
+        stmt = text(f"""
+            SELECT c.customer_code, c.first_name, c.last_name, c.email, c.phone_number, c.city,
+                   c.status, c.kyc_status, bm25({FTS_TABLE}, {weights}) AS score
+            FROM {FTS_TABLE}
+            JOIN customers_table AS c ON c.customer_table_id = {FTS_TABLE}.rowid
+            WHERE {FTS_TABLE} MATCH :match
+            ORDER BY score
+            LIMIT :limit
+        """)
+        # Quoted terms cannot be parsed as FTS5 operators; * makes each a prefix match
+        match = " ".join(f'"{term}"*' for term in terms)
+    elif dialect == "mysql":
+        stmt = text(f"""
+            SELECT customer_code, first_name, last_name, email, phone_number, city,
+                   status, kyc_status, MATCH({_columns}) AGAINST (:match IN BOOLEAN MODE) AS score
+            FROM customers_table
+            WHERE MATCH({_columns}) AGAINST (:match IN BOOLEAN MODE)
+            ORDER BY score DESC
+            LIMIT :limit
+        """)
+        match = " ".join(f"+{term}*" for term in terms)
+    else:
+        raise HTTPException(
+            status_code=status.HTTP_501_NOT_IMPLEMENTED,
+            detail=f"Customer search is not available on {dialect}."
+        )
+    return db.execute(stmt, {"match": match, "limit": limit}).all()
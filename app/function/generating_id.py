@@ -1,8 +1,90 @@
+import threading
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import select, update, insert
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
+from app.core.config import settings
+from app.core.database import SessionLocal
 from app.models.login_user import LoginUser
 from app.models.CustomerModel import Customer
 from app.models.LoanModel import Loan
+from app.models.IdSequenceModel import IdSequence
+
+
+class SequenceAllocator:
+    """
+    Hi/lo allocator over the id_sequences table.
+
+    Each process atomically reserves a block of ID_BLOCK_SIZE numbers per
+    prefix in its own short transaction, then hands them out from memory, so
+    most codes need no database round trip and concurrent signups (threads or
+    workers) can never receive the same number. Unused numbers in a block are
+    skipped after a restart, which only leaves gaps.
+
+    A thread lock is held while a block is reserved, so this must only run
+    on a sync session. Async handlers use the *_async helpers below, which
+    run it in a worker thread: called through AsyncSession.run_sync, the
+    reservation's I/O would yield to the event loop with the lock held and
+    the next request would block the loop on it.
+    """
+
+    def __init__(self, block_size: int):
+        self.block_size = block_size
+        self._blocks = {}  # (bind url, prefix) -> [next, end)
+        self._lock = threading.Lock()
+
+    def next_value(self, db: Session, prefix: str, column=None) -> int:
+        bind = db.get_bind()
+        key = (str(bind.url), prefix)
+        with self._lock:
+            block = self._blocks.get(key)
+            if block is None or block[0] >= block[1]:
+                block = list(self._reserve(bind, prefix, column))
+                self._blocks[key] = block
+            value = block[0]
+            block[0] += 1
+            return value
+
+    def _reserve(self, bind, prefix: str, column):
+        for _ in range(3):
+            with bind.begin() as conn:
+                # The UPDATE takes the write lock, so the read below sees our own increment
+                updated = conn.execute(
+                    update(IdSequence)
+                    .where(IdSequence.prefix == prefix)
+                    .values(next_value=IdSequence.next_value + self.block_size)
+                ).rowcount
+                if updated:
+                    end = conn.execute(
+                        select(IdSequence.next_value).where(IdSequence.prefix == prefix)
+                    ).scalar_one()
+                    return end - self.block_size, end
+            try:
+                with bind.begin() as conn:
+                    start = self._highest_existing(conn, prefix, column) + 1
+                    conn.execute(insert(IdSequence).values(prefix=prefix, next_value=start + self.block_size))
+                    return start, start + self.block_size
+            except IntegrityError:
+                continue  # another process seeded the prefix first; reserve from it
+        raise RuntimeError(f"Could not reserve ids for prefix {prefix}")
+
+    @staticmethod
+    def _highest_existing(conn, prefix: str, column) -> int:
+        # One-time seed for prefixes that predate the sequence table. Codes are
+        # compared as numbers, not strings, so CST10000 sorts after CST9999.
+        highest = 0
+        if column is None:
+            return highest
+        for (code,) in conn.execute(select(column).where(column.startswith(prefix))):
+            suffix = code[len(prefix):]
+            if suffix.isdigit():
+                highest = max(highest, int(suffix))
+        return highest
+
+
+allocator = SequenceAllocator(block_size=settings.ID_BLOCK_SIZE)
+
 
 def generate_user_code(db:Session, role:str) -> str:
     if role == "superadmin":
@@ -15,37 +97,34 @@ def generate_user_code(db:Session, role:str) -> str:
         prefix = "AUD"
     else:
         prefix = "USR"
-    
-    last_user = db.query(LoginUser).filter(LoginUser.user_id.startswith(prefix)).order_by(LoginUser.user_id.desc()).first()
-    
-    if last_user and last_user.user_id[4:].isdigit():
-        last_number = int(last_user.user_id[4:])
-        new_number = last_number + 1
-    else:
-        new_number = 1
 
+    new_number = allocator.next_value(db, prefix, LoginUser.user_id)
     return f"{prefix}{new_number:04d}"
 
 def generate_Customer_code(db:Session) -> str:
     prefix = "CUST"
-    last_user = db.query(Customer).filter(Customer.customer_code.startswith(prefix)).order_by(Customer.customer_code.desc()).first()
-
-    if last_user and last_user.customer_code[4:].isdigit():
-        last_number = int(last_user.customer_code[4:])
-        new_number = last_number + 1
-    else:
-        new_number = 1
-
+    new_number = allocator.next_value(db, prefix, Customer.customer_code)
     return f"{prefix}{new_number:04d}"
 
 def generate_Loan_code(db:Session) -> str:
     prefix = "LL"
-    last_user = db.query(Loan).filter(Loan.loan_code.startswith(prefix)).order_by(Loan.loan_code.desc()).first()
+    new_number = allocator.next_value(db, prefix, Loan.loan_code)
+    return f"{prefix}{new_number:04d}"
 
-    if last_user and last_user.loan_code[4:].isdigit():
-        last_number = int(last_user.loan_code[4:])
-        new_number = last_number + 1
-    else:
-        new_number = 1
 
-    return f"{prefix}{new_number:04d}"
\ No newline at end of file
+def _in_sync_session(generate, *args) -> str:
+    db = SessionLocal()
+    try:
+        return generate(db, *args)
+    finally:
+        db.close()
+
+
+async def generate_user_code_async(role: str) -> str:
+    return await run_in_threadpool(_in_sync_session, generate_user_code, role)
+
+async def generate_Customer_code_async() -> str:
+    return await run_in_threadpool(_in_sync_session, generate_Customer_code)
+
+async def generate_Loan_code_async() -> str:
+    return await run_in_threadpool(_in_sync_session, generate_Loan_code)
@@ -0,0 +1,384 @@
+import hashlib
+import random
+import uuid
+from collections import namedtuple
+from datetime import datetime
+from sqlalchemy import update, select, insert, delete, bindparam, func
+from sqlalchemy.orm import Session
+
+from app.core.hot_accounts import hot_accounts
+from app.models.AccountModel import Account
+from app.models.AccountBalanceSlotModel import AccountBalanceSlot
+from app.models.TransactionModel import Transaction, TransactionTypeEnum
+
+# applied is False when no row matched: unknown account, or (for debits) insufficient funds.
+# version is accounts.version after the update, bumped by every balance change.
+PostingResult = namedtuple("PostingResult", ["applied", "account_id", "balance", "transaction_id", "version"])
+
+
+def post_movement(
+    db: Session,
+    delta: float,
+    description: str,
+    account_id: int = None,
+    account_number: str = None,
+    transaction_type: str = None,
+    reference: str = None,
+    commit: bool = True,
+) -> PostingResult:
+    """
+    Apply one balance movement as a single conditional UPDATE
+
+        UPDATE accounts SET balance = balance + :delta
+        WHERE <account> AND balance + :delta >= 0
+
+    followed by the Transaction insert, in one short database transaction.
+    The balance is never read into Python first, so concurrent postings
+    cannot lose updates, and the insufficient-funds check is simply
+    "0 rows affected".
+    """
+    if account_id is not None:
+        target = Account.account_id == account_id
+    else:
+        target = Account.account_number == account_number
+    if transaction_type is None:
+        transaction_type = TransactionTypeEnum.DEPOSIT.value if delta >= 0 else TransactionTypeEnum.WITHDRAWAL.value
+
+    stmt = (
+        update(Account)
+        .where(target, Account.balance + delta >= 0)
+        .values(balance=Account.balance + delta, version=Account.version + 1, updated_at=datetime.now())
+        .execution_options(synchronize_session=False)
+    )
+    if db.get_bind().dialect.update_returning:
+        row = db.execute(stmt.returning(Account.account_id, Account.balance, Account.version)).first()
+    else:
+        row = None
+        if db.execute(stmt).rowcount == 1:
+            # Same transaction, row already write-locked by our UPDATE
+            row = db.execute(select(Account.account_id, Account.balance, Account.version).where(target)).first()
+
+    if row is None:
+        if commit:
+            db.rollback()
+        return PostingResult(False, account_id, None, None, None)
+
+    result = db.execute(
+        insert(Transaction).values(
+            account_id=row.account_id,
+            transaction_type=transaction_type,
+            amount=abs(delta),
+            description=description,
+            reference=reference,
+        )
+    )
+    if commit:
+        db.commit()
+    # SQLite returns a whole-number REAL through RETURNING as int
+    return PostingResult(True, row.account_id, float(row.balance), result.inserted_primary_key[0], row.version)
+
+
+def slot_total(account_id_column):
+    """Correlated sum of an account's credit slots (0 for accounts not in hot mode)."""
+    return (
+        select(func.coalesce(func.sum(AccountBalanceSlot.balance), 0.0))
+        .where(AccountBalanceSlot.account_id == account_id_column)
+        .scalar_subquery()
+    )
+
+
+def post_credit(
+    db: Session,
+    amount: float,
+    description: str,
+    account_number: str,
+    shard_key: str = None,
+    reference: str = None,
+    commit: bool = True,
+) -> PostingResult:
+    """
+    Credit an account by number. For a hot account the amount goes into one
+    of its balance slots (picked from shard_key, else at random), so
+    concurrent deposits lock different rows instead of queueing on
+    accounts.balance; the returned balance then includes all slots and
+    version is None. Every other account takes the post_movement path.
+    """
+    hot = hot_accounts.get(account_number)
+    if hot is not None:
+        account_id, slots = hot
+        if shard_key:
+            slot = int.from_bytes(hashlib.blake2b(shard_key.encode(), digest_size=8).digest(), "big") % slots
+        else:
+            slot = random.randrange(slots)
+        updated = db.execute(
+            update(AccountBalanceSlot)
+            .where(AccountBalanceSlot.account_id == account_id, AccountBalanceSlot.slot == slot)
+            .values(balance=AccountBalanceSlot.balance + amount)
+            .execution_options(synchronize_session=False)
+        ).rowcount
+        if updated == 1:
+            result = db.execute(
+                insert(Transaction).values(
+                    account_id=account_id,
+                    transaction_type=TransactionTypeEnum.DEPOSIT.value,
+                    amount=amount,
+                    description=description,
+                    reference=reference,
+                )
+            )
+            balance = db.execute(
+                select(Account.balance + slot_total(Account.account_id)).where(Account.account_id == account_id)
+            ).scalar_one()
+            if commit:
+                db.commit()
+            return PostingResult(True, account_id, float(balance), result.inserted_primary_key[0], None)
+        # Slot gone (hot mode switched off since the registry loaded): use the main row
+
+    return post_movement(db, amount, description, account_number=account_number, reference=reference, commit=commit)
+
+
+def fold_slots(db: Session, account_id: int) -> float:
+    """
+    Move everything credited to a hot account's slots into accounts.balance,
+    under lock, without committing. Locks are taken account row first, then
+    slots - the same order as transfers - so folding cannot deadlock with them.
+    Each slot is reduced by the amount read rather than zeroed, so a credit
+    that lands in between (SQLite has no row locks) is kept.
+    """
+    slots = AccountBalanceSlot.__table__
+    db.execute(select(Account.account_id).where(Account.account_id == account_id).with_for_update()).all()
+    rows = db.execute(
+        select(slots.c.slot, slots.c.balance)
+        .where(slots.c.account_id == account_id, slots.c.balance != 0)
+        .with_for_update()
+    ).all()
+    if not rows:
+        return 0.0
+    db.execute(
+        update(slots)
+        .where(slots.c.account_id == account_id, slots.c.slot == bindparam("target_slot"))
+        .values(balance=slots.c.balance - bindparam("folded")),
+        [{"target_slot": row.slot, "folded": row.balance} for row in rows],
+    )
+    total = sum(row.balance for row in rows)
+    db.execute(
+        update(Account)
+        .where(Account.account_id == account_id)
+        .values(balance=Account.balance + total, version=Account.version + 1, updated_at=datetime.now())
+        .execution_options(synchronize_session=False)
+    )
+    return total
+
+
+def set_balance_slots(db: Session, account_id: int, slots: int) -> float:
+    """
+    Switch an account into (slots > 0) or out of (slots == 0) hot mode, without
+    committing: pending slot credits are folded first, then the slot rows are
+    recreated empty. Returns the amount folded.
+    """
+    folded = fold_slots(db, account_id)
+    db.execute(delete(AccountBalanceSlot).where(AccountBalanceSlot.account_id == account_id))
+    if slots:
+        db.execute(
+            insert(AccountBalanceSlot),
+            [{"account_id": account_id, "slot": slot, "balance": 0.0} for slot in range(slots)],
+        )
+    db.execute(
+        update(Account)
+        .where(Account.account_id == account_id)
+        .values(balance_slots=slots, version=Account.version + 1, updated_at=datetime.now())
+        .execution_options(synchronize_session=False)
+    )
+    return folded
+
+
+def fold_all_slots(db: Session) -> int:
+    """Fold every hot account with pending slot credits, one short transaction each."""
+    account_ids = db.execute(
+        select(AccountBalanceSlot.account_id).where(AccountBalanceSlot.balance != 0).distinct()
+    ).scalars().all()
+    for account_id in account_ids:
+        fold_slots(db, account_id)
+        db.commit()
+    return len(account_ids)
+
+
+TransferResult = namedtuple(
+    "TransferResult", ["applied", "reference", "from_balance", "to_balance", "from_version", "to_version"]
+)
+
+
+def transfer(
+    db: Session, from_account_id: int, to_account_id: int, amount: float, description: str,
+    fold_source: bool = False, commit: bool = True
+) -> TransferResult:
+    """
+    Debit one account and credit another in a single transaction, writing a
+    TransferOut/TransferIn pair that shares a reference.
+
+    Both rows are locked and updated in ascending account_id order, so two
+    concurrent transfers in opposite directions take their locks in the same
+    order and cannot deadlock (SELECT ... FOR UPDATE on MySQL; on SQLite the
+    first UPDATE takes the database write lock and the order is moot).
+    With commit=False the caller commits (e.g. together with an idempotency record).
+    """
+    reference = f"TRF{uuid.uuid4().hex[:16].upper()}"
+    legs = {
+        from_account_id: (-amount, TransactionTypeEnum.TRANSFER_OUT.value),
+        to_account_id: (amount, TransactionTypeEnum.TRANSFER_IN.value),
+    }
+    ordered = sorted(legs)
+
+    db.execute(
+        select(Account.account_id)
+        .where(Account.account_id.in_(ordered))
+        .order_by(Account.account_id)
+        .with_for_update()
+    ).all()
+    if fold_source:
+        fold_slots(db, from_account_id)  # hot source: spend its slot credits too
+
+    balances = {}
+    for account_id in ordered:
+        delta, transaction_type = legs[account_id]
+        result = post_movement(
+            db, delta, description,
+            account_id=account_id,
+            transaction_type=transaction_type,
+            reference=reference,
+            commit=False,
+        )
+        if not result.applied:
+            db.rollback()
+            return TransferResult(False, None, None, None, None, None)
+        balances[account_id] = result
+
+    if commit:
+        db.commit()
+    source, target = balances[from_account_id], balances[to_account_id]
+    return TransferResult(True, reference, source.balance, target.balance, source.version, target.version)
+
+
+BatchLine = namedtuple("BatchLine", ["line", "account_number", "delta", "description"])
+# Stay under SQLite's default limit on bound parameters per statement
+IN_CHUNK = 900
+
+
+class BatchConflict(RuntimeError):
+    """Concurrent postings kept changing the batch's balances; nothing was applied."""
+
+
+def _chunks(values: list):
+    for start in range(0, len(values), IN_CHUNK):
+        yield values[start:start + IN_CHUNK]
+
+
+def post_batch(db: Session, lines: list, all_or_nothing: bool, max_attempts: int = 3) -> list:
+    """
+    Apply many postings in one database transaction.
+
+    Account numbers are resolved with IN queries (not one lookup per line),
+    every line is validated against a running balance in line order, then
+    the net delta per account and all Transaction rows are written with
+    executemany. If a concurrent posting changed a balance between the read
+    and the write (a balance went negative), the transaction is rolled back
+    and the batch is re-validated against fresh balances; after max_attempts
+    it raises BatchConflict.
+
+    Returns one result dict per input line. balance_after is read back after
+    the UPDATE in the same transaction, so it is the committed balance even
+    if other postings landed between the read and the write.
+    """
+    accounts_table = Account.__table__
+    transactions_table = Transaction.__table__
+    numbers = list({line.account_number for line in lines})
+
+    for _ in range(max_attempts):
+        accounts = {}
+        for chunk in _chunks(numbers):
+            for row in db.execute(
+                select(Account.account_id, Account.account_number, Account.balance, Account.status, Account.balance_slots)
+                .where(Account.account_number.in_(chunk))
+            ):
+                accounts[row.account_number] = row
+
+        running = {number: row.balance for number, row in accounts.items()}
+        debited = {line.account_number for line in lines if line.delta < 0}
+        for number, row in accounts.items():
+            if row.balance_slots and number in debited:
+                running[number] += fold_slots(db, row.account_id)  # debits see slot credits
+
+        results = []
+        accepted = []
+        for line in lines:
+            result = {"line": line.line, "account_number": line.account_number, "amount": abs(line.delta)}
+            account = accounts.get(line.account_number)
+            if account is None:
+                result.update(status="rejected", error="Account not found")
+            elif account.status != "Active":
+                result.update(status="rejected", error="Account is not active")
+            elif running[line.account_number] + line.delta < 0:
+                result.update(status="rejected", error="Insufficient balance")
+            else:
+                running[line.account_number] += line.delta
+                result.update(status="applied")
+                accepted.append((line, account.account_id, result))
+            results.append(result)
+
+        rejected = len(lines) - len(accepted)
+        if all_or_nothing and rejected:
+            db.rollback()
+            for result in results:
+                if result["status"] == "applied":
+                    result.update(status="not_applied", error="Batch rejected (all-or-nothing)")
+            return results
+        if not accepted:
+            db.rollback()
+            return results
+
+        net = {}
+        for line, account_id, _ in accepted:
+            net[account_id] = net.get(account_id, 0.0) + line.delta
+        db.execute(
+            update(accounts_table)
+            .where(accounts_table.c.account_id == bindparam("target_id"))
+            .values(
+                balance=accounts_table.c.balance + bindparam("delta"),
+                version=accounts_table.c.version + 1,
+                updated_at=datetime.now(),
+            ),
+            [{"target_id": account_id, "delta": delta} for account_id, delta in net.items()],
+        )
+        # Balances as written by the UPDATE (rows are write-locked by it until commit)
+        balances = {}
+        for chunk in _chunks(list(net)):
+            balances.update(db.execute(
+                select(accounts_table.c.account_id, accounts_table.c.balance)
+                .where(accounts_table.c.account_id.in_(chunk))
+            ).all())
+        if any(balance < -1e-9 for balance in balances.values()):
+            db.rollback()  # lost a race with another posting; re-read and re-validate
+            continue
+
+        db.execute(
+            insert(transactions_table),
+            [
+                {
+                    "account_id": account_id,
+                    "transaction_type": TransactionTypeEnum.DEPOSIT.value if line.delta >= 0 else TransactionTypeEnum.WITHDRAWAL.value,
+                    "amount": abs(line.delta),
+                    "description": line.description,
+                }
+                for line, account_id, _ in accepted
+            ],
+        )
+        db.commit()
+
+        # Walk back from each account's final balance to get the balance after every line
+        after = {account_id: float(balance) for account_id, balance in balances.items()}
+        for line, account_id, result in reversed(accepted):
+            result["balance_after"] = after[account_id]
+            after[account_id] -= line.delta
+        return results
+
+    raise BatchConflict("Batch could not be applied because of concurrent balance changes")
@@ -0,0 +1,102 @@
+import csv
+import io
+import json
+import tempfile
+from datetime import datetime
+from enum import Enum
+from openpyxl import Workbook
+
+from app.core.database import SessionLocal
+
+STATEMENT_COLUMNS = ["transaction_id", "timestamp", "transaction_type", "amount", "description", "reference"]
+FETCH_SIZE = 1000
+XLSX_MAX_ROWS = 1_048_575  # Excel sheet limit, minus the header row
+XLSX_CHUNK_BYTES = 64 * 1024
+
+
+class StatementFormat(str, Enum):
+    CSV = "csv"
+    NDJSON = "ndjson"
+    XLSX = "xlsx"
+
+
+MEDIA_TYPES = {
+    StatementFormat.CSV: "text/csv",
+    StatementFormat.NDJSON: "application/x-ndjson",
+    StatementFormat.XLSX: "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+}
+
+
+def _fetch(statements):
+    """
+    Yield result partitions of at most FETCH_SIZE rows from a server-side
+    cursor, running the statements (archive months, then hot rows) in order.
+
+    The generator owns its session: a StreamingResponse body runs after the
+    request's get_db session has been closed.
+    """
+    db = SessionLocal()
+    try:
+        for stmt in statements:
+            result = db.execute(stmt.execution_options(yield_per=FETCH_SIZE))
+            for partition in result.partitions():
+                yield partition
+    finally:
+        db.close()
+
+
+def _csv_stream(statements):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(STATEMENT_COLUMNS)
+    for partition in _fetch(statements):
+        writer.writerows(partition)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    yield buffer.getvalue()
+
+
+def _ndjson_stream(statements):
+    for partition in _fetch(statements):
+        yield "".join(
+            json.dumps(dict(zip(STATEMENT_COLUMNS, row)), default=str) + "\n"
+            for row in partition
+        )
+
+
+def _xlsx_stream(statements):
+    # The zip container can only be written once all rows are known, so rows go
+    # through openpyxl's write-only mode (streamed to a temp file, not kept in
+    # memory) and the finished file is then sent in chunks.
+    workbook = Workbook(write_only=True)
+    sheet, rows_in_sheet = None, XLSX_MAX_ROWS
+    for partition in _fetch(statements):
+        for row in partition:
+            if rows_in_sheet >= XLSX_MAX_ROWS:
+                sheet = workbook.create_sheet(f"Statement {len(workbook.worksheets) + 1}")
+                sheet.append(STATEMENT_COLUMNS)
+                rows_in_sheet = 0
+            # Excel cannot store timezone-aware datetimes
+            sheet.append([
+                value.replace(tzinfo=None) if isinstance(value, datetime) else value
+                for value in row
+            ])
+            rows_in_sheet += 1
+    if sheet is None:
+        workbook.create_sheet("Statement 1").append(STATEMENT_COLUMNS)
+
+    with tempfile.TemporaryFile() as tmp:
+        workbook.save(tmp)
+        tmp.seek(0)
+        while chunk := tmp.read(XLSX_CHUNK_BYTES):
+            yield chunk
+
+
+def stream_statement(statements: list, statement_format: StatementFormat):
+    """Return a generator of response chunks for selects of STATEMENT_COLUMNS."""
+    if statement_format == StatementFormat.CSV:
+        return _csv_stream(statements)
+    if statement_format == StatementFormat.NDJSON:
+        return _ndjson_stream(statements)
+    return _xlsx_stream(statements)
@@ -1,20 +1,42 @@
 from fastapi import FastAPI
 from app.api.pre_start.init__db import init
-from app.core.database import Base ,engine
+from app.core.database import async_engine,log_sqlite_pragmas
+from app.core.migrations import run_migrations
 from fastapi.middleware.cors import CORSMiddleware
 import uvicorn
 from contextlib import asynccontextmanager
 from app.api.main import api_router
-# from app.functions.schedulars_on import start_scheduler
+from app.core.hashing import password_hasher
+from app.core.revocation import revocation_store
+from app.core.activity_tracker import activity_tracker
+from app.core.query_stats import query_stats_middleware
+from app.core.scheduler import start_scheduler, stop_scheduler
+from app.core.group_commit import group_commit
+from app.core.velocity import velocity_guard
+from app.core.hot_accounts import hot_accounts
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     
-    Base.metadata.create_all(bind=engine)
+    password_hasher.start()  # forks the hashing workers before any other thread starts
+    run_migrations()  # create_all + versioned index migrations
+    log_sqlite_pragmas()
     init()
+    revocation_store.load()
+    revocation_store.start()  # syncs and purges revoked tokens off the request path
+    velocity_guard.load()  # withdrawal counters from the last 24h
+    hot_accounts.refresh()  # the scheduler reloads it every HOT_ACCOUNT_REFRESH_SECONDS
+    activity_tracker.start()
+    start_scheduler()  # daily interest accrual
     
     yield  # startup complete, app is running
-    # Optionally, add shutdown logic here if needed
+
+    stop_scheduler()
+    group_commit.stop()  # applies postings still queued
+    activity_tracker.stop()  # flushes pending last_activity values
+    revocation_store.stop()
+    password_hasher.shutdown()
+    await async_engine.dispose()
 
 
 app=FastAPI(
@@ -32,6 +54,9 @@ app=FastAPI(
 
 app.include_router(api_router)
 
+# SQL statement count / DB time per request -> Server-Timing header
+app.middleware("http")(query_stats_middleware)
+
 origins = [
     "http://localhost:3000",  
     "http://127.0.0.1:3000",
@@ -43,7 +68,8 @@ app.add_middleware(
     allow_origins=origins,
     allow_credentials=False,
     allow_methods=["*"],
-    allow_headers=["*"]
+    allow_headers=["*"],
+    expose_headers=["Server-Timing", "Idempotent-Replayed"]
 )
 
 @app.get("/")
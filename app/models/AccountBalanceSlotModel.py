@@ -0,0 +1,11 @@
+from sqlalchemy import Column, Integer, Float, ForeignKey
+from app.core.database import Base
+
+
+class AccountBalanceSlot(Base):
+    # Credit shards of a hot account; its balance is accounts.balance + sum(slots)
+    __tablename__ = "account_balance_slots"
+
+    account_id = Column(Integer, ForeignKey("accounts.account_id"), primary_key=True)
+    slot = Column(Integer, primary_key=True, autoincrement=False)
+    balance = Column(Float, nullable=False, default=0.0)
@@ -13,9 +13,11 @@ class Account(Base):
 
     account_id = Column(Integer, primary_key=True, index=True)
     account_number = Column(String(20), unique=True, nullable=False)
-    customer_id = Column(Integer, ForeignKey("customers_table.customer_table_id"), nullable=False)
+    customer_id = Column(Integer, ForeignKey("customers_table.customer_table_id"), nullable=False, index=True)
     account_type = Column(String(20), nullable=False)
     balance = Column(Float, default=0.0)
+    version = Column(Integer, nullable=False, default=0, server_default="0")  # bumped on every balance change
+    balance_slots = Column(Integer, nullable=False, default=0, server_default="0", index=True)  # >0: hot-account mode
     secret_code = Column(String(10), nullable=True)
     status = Column(String(20), default="Active")
     created_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Date, DateTime, Enum, Float, ForeignKey, func, Text
+from sqlalchemy import Column, Integer, String, Date, DateTime, Enum, Float, ForeignKey, func, Text, Index
 
 from sqlalchemy.orm import relationship
 from app.core.database import Base
@@ -7,6 +7,10 @@ import enum
 
 class Customer(Base):
     __tablename__ = "customers_table"
+    __table_args__ = (
+        # Keyset order of the admin customer listing (newest first)
+        Index("ix_customers_table_created_at_id", "created_at", "customer_table_id"),
+    )
 
     customer_table_id = Column(Integer, primary_key=True, index=True)
     customer_code = Column(String(50), unique=True, nullable=False)
@@ -41,7 +45,7 @@ class Customer(Base):
     driving_license_path = Column(String(255), nullable=True)
     voter_id_path = Column(String(255), nullable=True)
     pan_number = Column(String(20), nullable=True)
-    kyc_status = Column(String(20), default="Pending")
+    kyc_status = Column(String(20), default="Pending", index=True)
     kyc_verified_date = Column(DateTime, nullable=True)
     kyc_verified_id=Column(Integer, ForeignKey("login_user.user_table_id"), nullable=True)
     # Account Info
@@ -56,7 +60,7 @@ class Customer(Base):
     risk_category = Column(String(20), default="Low")
     notes = Column(Text, nullable=True)
 
-    login_id = Column(Integer, ForeignKey("login_user.user_table_id"), nullable=False)
+    login_id = Column(Integer, ForeignKey("login_user.user_table_id"), nullable=False, index=True)
 
     # Audit
     created_at = Column(DateTime(timezone=True), server_default=func.now())
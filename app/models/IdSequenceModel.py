@@ -0,0 +1,9 @@
+from sqlalchemy import Column, Integer, String
+from app.core.database import Base
+
+
+class IdSequence(Base):
+    __tablename__ = "id_sequences"
+
+    prefix = Column(String(10), primary_key=True)
+    next_value = Column(Integer, nullable=False)  # first number not yet handed out to any process
@@ -0,0 +1,14 @@
+from sqlalchemy import Column, Integer, String, Text, DateTime, func
+from app.core.database import Base
+
+
+class IdempotencyRecord(Base):
+    __tablename__ = "idempotency_keys"
+
+    key_hash = Column(String(64), primary_key=True)       # sha256 of endpoint scope + Idempotency-Key
+    request_hash = Column(String(64), nullable=False)     # fingerprint of the original request
+    response_hash = Column(String(64), nullable=False)    # sha256 of response_body
+    status_code = Column(Integer, nullable=False)
+    response_body = Column(Text, nullable=False)
+    created_at = Column(DateTime, server_default=func.now(), nullable=False)
+    expires_at = Column(DateTime, nullable=False, index=True)
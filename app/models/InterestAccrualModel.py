@@ -0,0 +1,14 @@
+from sqlalchemy import Column, Integer, Float, Date, DateTime, func
+from app.core.database import Base
+
+
+class InterestAccrual(Base):
+    # One row per accrual date; last_account_id is the chunk watermark
+    __tablename__ = "interest_accruals"
+
+    accrual_date = Column(Date, primary_key=True)
+    last_account_id = Column(Integer, nullable=False, default=0)
+    accounts_accrued = Column(Integer, nullable=False, default=0)
+    total_interest = Column(Float, nullable=False, default=0.0)
+    started_at = Column(DateTime, server_default=func.now(), nullable=False)
+    finished_at = Column(DateTime, nullable=True)
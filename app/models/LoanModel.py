@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Float, ForeignKey, DateTime, func
+from sqlalchemy import Column, Integer, String, Float, ForeignKey, DateTime, func, Index
 from sqlalchemy.orm import relationship
 from app.core.database import Base
 import enum
@@ -10,6 +10,9 @@ class LoanStatusEnum(str, enum.Enum):
 
 class Loan(Base):
     __tablename__ = "loans"
+    __table_args__ = (
+        Index("ix_loans_customer_id_status", "customer_id", "status"),
+    )
 
     loan_table_id = Column(Integer, primary_key=True, index=True)
     loan_code = Column(String(20), unique=True, nullable=False)
@@ -0,0 +1,39 @@
+from sqlalchemy import Column, Integer, Float, String, DateTime, ForeignKey, func
+from app.core.database import Base
+
+
+class ReconciliationCheckpoint(Base):
+    # Ledger state already verified for one account: everything up to
+    # last_transaction_id sums to verified_balance
+    __tablename__ = "reconciliation_checkpoints"
+
+    account_id = Column(Integer, ForeignKey("accounts.account_id"), primary_key=True)
+    last_transaction_id = Column(Integer, nullable=False, default=0)
+    verified_balance = Column(Float, nullable=False, default=0.0)
+    verified_at = Column(DateTime, server_default=func.now(), nullable=False)
+
+
+class ReconciliationRun(Base):
+    __tablename__ = "reconciliation_runs"
+
+    run_id = Column(Integer, primary_key=True)
+    started_at = Column(DateTime, nullable=False)
+    finished_at = Column(DateTime, nullable=True)
+    high_water_transaction_id = Column(Integer, nullable=False, default=0)
+    accounts_checked = Column(Integer, nullable=False, default=0)
+    transactions_checked = Column(Integer, nullable=False, default=0)
+    mismatches = Column(Integer, nullable=False, default=0)
+
+
+class ReconciliationException(Base):
+    __tablename__ = "reconciliation_exceptions"
+
+    exception_id = Column(Integer, primary_key=True)
+    run_id = Column(Integer, ForeignKey("reconciliation_runs.run_id"), nullable=False)
+    account_id = Column(Integer, ForeignKey("accounts.account_id"), nullable=False, index=True)
+    expected_balance = Column(Float, nullable=False)   # sum of the account's transactions
+    actual_balance = Column(Float, nullable=False)     # accounts.balance
+    difference = Column(Float, nullable=False)
+    last_transaction_id = Column(Integer, nullable=False, default=0)
+    status = Column(String(20), nullable=False, default="Open", index=True)
+    detected_at = Column(DateTime, server_default=func.now(), nullable=False)
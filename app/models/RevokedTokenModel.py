@@ -0,0 +1,11 @@
+from sqlalchemy import Column, String, DateTime, func
+from app.core.database import Base
+
+
+class RevokedToken(Base):
+    __tablename__ = "revoked_tokens"
+
+    jti = Column(String(64), primary_key=True)
+    user_id = Column(String(20), nullable=True)
+    expires_at = Column(DateTime, nullable=False, index=True)  # UTC, copied from the token's exp
+    revoked_at = Column(DateTime, server_default=func.now(), nullable=False, index=True)
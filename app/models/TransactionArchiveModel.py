@@ -0,0 +1,17 @@
+from sqlalchemy import Column, Integer, Float, String, DateTime, ForeignKey, func
+from app.core.database import Base
+
+
+class TransactionArchiveSummary(Base):
+    # Tombstone left in the hot database for each account and archived month;
+    # the rows themselves live in transactions_archive_YYYYMM
+    __tablename__ = "transaction_archive_summaries"
+
+    account_id = Column(Integer, ForeignKey("accounts.account_id"), primary_key=True)
+    month = Column(String(7), primary_key=True)  # "YYYY-MM"
+    transaction_count = Column(Integer, nullable=False, default=0)
+    credit_total = Column(Float, nullable=False, default=0.0)
+    debit_total = Column(Float, nullable=False, default=0.0)
+    first_transaction_id = Column(Integer, nullable=False)
+    last_transaction_id = Column(Integer, nullable=False)
+    archived_at = Column(DateTime, server_default=func.now(), nullable=False)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Float, ForeignKey, DateTime, func, Enum
+from sqlalchemy import Column, Integer, String, Float, ForeignKey, DateTime, func, Enum, Index
 from sqlalchemy.orm import relationship
 from app.core.database import Base
 import enum
@@ -6,9 +6,27 @@ import enum
 class TransactionTypeEnum(str, enum.Enum):
     DEPOSIT = "Deposit"
     WITHDRAWAL = "Withdrawal"
+    TRANSFER_IN = "TransferIn"
+    TRANSFER_OUT = "TransferOut"
+    INTEREST = "Interest"
+
+# Types that add to the balance; every other type is a debit
+CREDIT_TYPES = [
+    TransactionTypeEnum.DEPOSIT.value,
+    TransactionTypeEnum.TRANSFER_IN.value,
+    TransactionTypeEnum.INTEREST.value,
+]
 
 class Transaction(Base):
     __tablename__ = "transactions"
+    __table_args__ = (
+        # Covers history paging, its filters and every column a page returns,
+        # so the keyset seek never touches the table
+        Index(
+            "ix_transactions_history_covering",
+            "account_id", "timestamp", "transaction_id", "transaction_type", "amount", "description", "reference",
+        ),
+    )
 
     transaction_id = Column(Integer, primary_key=True, index=True)
     account_id = Column(Integer, ForeignKey("accounts.account_id"), nullable=False)
@@ -16,5 +34,6 @@ class Transaction(Base):
     amount = Column(Float, nullable=False)
     timestamp = Column(DateTime(timezone=True), server_default=func.now())
     description = Column(String(255), nullable=True)
+    reference = Column(String(40), nullable=True, index=True)  # shared by both legs of a transfer
 
     account = relationship("Account", back_populates="transactions")
@@ -2,4 +2,11 @@ from app.models.login_user import LoginUser
 from app.models.CustomerModel import Customer
 from app.models.AccountModel import Account
 from app.models.TransactionModel import Transaction
-from app.models.LoanModel import Loan
\ No newline at end of file
+from app.models.LoanModel import Loan
+from app.models.RevokedTokenModel import RevokedToken
+from app.models.IdSequenceModel import IdSequence
+from app.models.ReconciliationModel import ReconciliationCheckpoint, ReconciliationRun, ReconciliationException
+from app.models.IdempotencyKeyModel import IdempotencyRecord
+from app.models.TransactionArchiveModel import TransactionArchiveSummary
+from app.models.InterestAccrualModel import InterestAccrual
+from app.models.AccountBalanceSlotModel import AccountBalanceSlot
@@ -9,7 +9,7 @@ class LoginUser(Base):
     user_table_id = Column(Integer, primary_key=True, autoincrement=True)
     user_id = Column(String(20), unique=True, index=True)
     username = Column(String(150), nullable=True)
-    email = Column(String(60), nullable=False)
+    email = Column(String(60), nullable=False, index=True)
     phone_number = Column(String(20), nullable=False)
     password = Column(String(200), nullable=False)
     hashed_password = Column(String(300), nullable=False)
@@ -0,0 +1,91 @@
+"""
+Deposit/withdraw throughput on SQLite: one commit per posting (as
+deposit_amount / withdraw_amount do with an Idempotency-Key) versus the
+group-commit writer, which applies queued postings in one transaction per
+batch. Both runs use the pragma profile from Settings.
+
+Run from the repository root:
+
+    python -m benchmarks.group_commit --ops 4000 --threads 32 --max-batch 256 --max-delay-ms 2
+"""
+import argparse
+import os
+import random
+import tempfile
+import threading
+import time
+from sqlalchemy import func
+from sqlalchemy.orm import sessionmaker
+from app.core.database import Base
+from app.core.group_commit import GroupCommitWriter
+from app.models import Transaction
+from app.function.ledger import post_movement
+from benchmarks.sqlite_pragmas import make_engine, seed, post
+
+
+def run(grouped: bool, ops: int, threads: int, accounts: int, max_batch: int, max_delay_ms: float) -> dict:
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = make_engine(os.path.join(tmp, "bench.db"), profile=True)
+        Base.metadata.create_all(bind=engine)
+        Session = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+        numbers = seed(Session, accounts)
+        writer = GroupCommitWriter(max_batch, max_delay_ms, timeout_seconds=60, session_factory=Session)
+
+        errors = []
+        per_thread = ops // threads
+
+        def worker():
+            rng = random.Random()
+            for _ in range(per_thread):
+                number = rng.choice(numbers)
+                amount = rng.choice([1.0, -1.0]) * rng.randint(1, 100)
+                try:
+                    if grouped:
+                        writer.submit(lambda db: post_movement(db, amount, "bench", account_number=number, commit=False))
+                    else:
+                        post(Session, number, amount)
+                except Exception as e:
+                    errors.append(e)
+
+        pool = [threading.Thread(target=worker) for _ in range(threads)]
+        start = time.perf_counter()
+        for t in pool:
+            t.start()
+        for t in pool:
+            t.join()
+        elapsed = time.perf_counter() - start
+        writer.stop()
+
+        db = Session()
+        rows = db.query(func.count(Transaction.transaction_id)).scalar()
+        db.close()
+        engine.dispose()
+
+    done = per_thread * threads - len(errors)
+    return {
+        "ops": done, "errors": len(errors), "seconds": elapsed, "ops_per_sec": done / elapsed,
+        "rows": rows, "writer": writer.stats(),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--ops", type=int, default=4000)
+    parser.add_argument("--threads", type=int, default=32)
+    parser.add_argument("--accounts", type=int, default=100)
+    parser.add_argument("--max-batch", type=int, default=256)
+    parser.add_argument("--max-delay-ms", type=float, default=2.0)
+    args = parser.parse_args()
+
+    for label, grouped in (("per-request commit", False), ("group commit", True)):
+        result = run(grouped, args.ops, args.threads, args.accounts, args.max_batch, args.max_delay_ms)
+        line = (f"{label:20} {result['ops_per_sec']:9.1f} ops/s  "
+                f"({result['ops']} ops in {result['seconds']:.2f}s, {result['errors']} errors, "
+                f"{result['rows']} transaction rows)")
+        if grouped:
+            line += f"  avg batch {result['writer']['avg_batch']}, largest {result['writer']['largest_batch']}"
+        print(line)
+
+
+if __name__ == "__main__":
+    main()
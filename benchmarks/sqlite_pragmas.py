@@ -0,0 +1,118 @@
+"""
+Deposit/withdraw throughput on SQLite: plain connection (foreign_keys only)
+versus the pragma profile from Settings (WAL, synchronous, busy_timeout,
+cache_size, mmap_size, temp_store).
+
+Run from the repository root:
+
+    python -m benchmarks.sqlite_pragmas --ops 2000 --threads 8
+"""
+import argparse
+import os
+import random
+import tempfile
+import threading
+import time
+from datetime import date
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from app.core.database import Base, apply_sqlite_pragmas, sqlite_pragmas
+from app.models import LoginUser, Customer, Account
+from app.function.ledger import post_movement
+
+
+def make_engine(path: str, profile: bool):
+    engine = create_engine(f"sqlite:///{path}", connect_args={"check_same_thread": False})
+
+    @event.listens_for(engine, "connect")
+    def set_pragmas(dbapi_connection, connection_record):
+        apply_sqlite_pragmas(dbapi_connection, sqlite_pragmas(profile))
+
+    return engine
+
+
+def seed(Session, accounts: int) -> list:
+    db = Session()
+    try:
+        user = LoginUser(
+            user_id="CST0001", email="bench@example.com", phone_number="9000000000",
+            password="x", hashed_password="x", Gender="OTHER", role="Customer",
+        )
+        db.add(user)
+        db.flush()
+        customer = Customer(
+            customer_code="CUST0001", first_name="Bench", date_of_birth=date(1990, 1, 1),
+            email="bench@example.com", phone_number="9000000000", address_line1="-",
+            city="-", state="-", country="-", postal_code="-", account_type="Savings",
+            login_id=user.user_table_id,
+        )
+        db.add(customer)
+        db.flush()
+        numbers = [f"{100000000000 + i}" for i in range(accounts)]
+        db.add_all(
+            Account(account_number=n, customer_id=customer.customer_table_id,
+                    account_type="Savings", balance=1_000_000.0, secret_code="0000")
+            for n in numbers
+        )
+        db.commit()
+        return numbers
+    finally:
+        db.close()
+
+
+def post(Session, account_number: str, amount: float):
+    # Same posting path as deposit_amount / withdraw_amount in AccountRouter
+    db = Session()
+    try:
+        post_movement(db, amount, "bench", account_number=account_number)
+    finally:
+        db.close()
+
+
+def run(profile: bool, ops: int, threads: int, accounts: int) -> dict:
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = make_engine(os.path.join(tmp, "bench.db"), profile)
+        Base.metadata.create_all(bind=engine)
+        Session = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+        numbers = seed(Session, accounts)
+
+        errors = []
+        per_thread = ops // threads
+
+        def worker():
+            rng = random.Random()
+            for _ in range(per_thread):
+                amount = rng.choice([1.0, -1.0]) * rng.randint(1, 100)
+                try:
+                    post(Session, rng.choice(numbers), amount)
+                except Exception as e:
+                    errors.append(e)
+
+        pool = [threading.Thread(target=worker) for _ in range(threads)]
+        start = time.perf_counter()
+        for t in pool:
+            t.start()
+        for t in pool:
+            t.join()
+        elapsed = time.perf_counter() - start
+        engine.dispose()
+
+    done = per_thread * threads - len(errors)
+    return {"ops": done, "errors": len(errors), "seconds": elapsed, "ops_per_sec": done / elapsed}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--ops", type=int, default=2000)
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--accounts", type=int, default=100)
+    args = parser.parse_args()
+
+    for label, profile in (("before (foreign_keys only)", False), ("after (pragma profile)", True)):
+        result = run(profile, args.ops, args.threads, args.accounts)
+        print(f"{label:28} {result['ops_per_sec']:9.1f} ops/s  "
+              f"({result['ops']} ops in {result['seconds']:.2f}s, {result['errors']} errors)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+import os
+import tempfile
+
+# Settings are read at import time: point the app at a throwaway SQLite database first
+_tmp = tempfile.mkdtemp(prefix="hackathon-tests-")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{os.path.join(_tmp, 'app.db')}")
+os.environ.setdefault("SCHEDULER_ENABLED", "false")
+
+import itertools
+import pytest
+from sqlalchemy.orm import sessionmaker
+from app.core.database import Base
+from benchmarks.sqlite_pragmas import make_engine, seed
+
+# Unique suffixes for users and customers across the whole session
+_ids = itertools.count(1)
+
+
+@pytest.fixture
+def ledger_db(tmp_path):
+    """Fresh SQLite database (pragma profile on) seeded with 4 accounts; yields (Session, account_numbers)."""
+    engine = make_engine(str(tmp_path / "ledger.db"), profile=True)
+    Base.metadata.create_all(bind=engine)
+    Session = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    numbers = seed(Session, 4)
+    yield Session, numbers
+    engine.dispose()
+
+
+@pytest.fixture(scope="session")
+def client():
+    """TestClient over the real app; the lifespan migrates the test database."""
+    from fastapi.testclient import TestClient
+    from app.main import app
+
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+@pytest.fixture
+def make_user(client):
+    """make_user(role) -> (LoginUser, auth headers), inserted directly."""
+    from app.core.database import SessionLocal
+    from app.core.security import create_access_token
+    from app.models import LoginUser
+
+    def factory(role: str = "Customer"):
+        n = f"{next(_ids):09d}"
+        db = SessionLocal()
+        try:
+            user = LoginUser(
+                user_id=f"T{n}"[:20], email=f"user{n}@example.com", phone_number=f"9{n}"[:10],
+                password="x", hashed_password="x", Gender="OTHER", role=role,
+            )
+            db.add(user)
+            db.commit()
+            db.refresh(user)
+            db.expunge(user)
+        finally:
+            db.close()
+        token = create_access_token({"sub": user.email, "role": role, "user_id": user.user_id})
+        return user, {"Authorization": f"Bearer {token}"}
+
+    return factory
+
+
+@pytest.fixture
+def make_account(client):
+    """make_account(owner, balance) -> account_number of a new active Savings account (secret code 1234)."""
+    from datetime import date
+    from app.core.database import SessionLocal
+    from app.function.account_number import account_numbers
+    from app.models import Customer, Account
+
+    def factory(owner, balance: float = 10000.0, city: str = "Chennai"):
+        n = f"{next(_ids):09d}"
+        db = SessionLocal()
+        try:
+            number = account_numbers.take(db)  # before any write: a refill commits on its own connection
+            customer = Customer(
+                customer_code=f"CT{n}", first_name="Test", last_name=f"Owner{n}", date_of_birth=date(1990, 1, 1),
+                email=f"cust{n}@example.com", phone_number=f"8{n}", address_line1="-", city=city,
+                state="-", country="India", postal_code="-", account_type="Savings",
+                kyc_status="Verified", login_id=owner.user_table_id,
+            )
+            db.add(customer)
+            db.flush()
+            db.add(Account(
+                account_number=number, customer_id=customer.customer_table_id, account_type="Savings",
+                balance=balance, secret_code="1234",
+            ))
+            db.commit()
+            return number
+        finally:
+            db.close()
+
+    return factory
+
+
+@pytest.fixture
+def add_transactions(client):
+    """add_transactions(account_number, [(type, amount, timestamp), ...]) -> transaction ids; balances untouched."""
+    from sqlalchemy import insert, select
+    from app.core.database import SessionLocal
+    from app.models import Account, Transaction
+
+    def factory(account_number: str, rows: list) -> list:
+        db = SessionLocal()
+        try:
+            account_id = db.execute(
+                select(Account.account_id).where(Account.account_number == account_number)
+            ).scalar_one()
+            ids = [
+                db.execute(insert(Transaction).values(
+                    account_id=account_id, transaction_type=transaction_type, amount=amount,
+                    timestamp=timestamp, description=f"{transaction_type} {amount:g}",
+                )).inserted_primary_key[0]
+                for transaction_type, amount, timestamp in rows
+            ]
+            db.commit()
+            return ids
+        finally:
+            db.close()
+
+    return factory
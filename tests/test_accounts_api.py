@@ -0,0 +1,88 @@
+from sqlalchemy import func, select
+from app.core.database import SessionLocal
+from app.models import Account, Transaction
+
+
+def balance_of(account_number: str) -> float:
+    db = SessionLocal()
+    try:
+        return db.execute(select(Account.balance).where(Account.account_number == account_number)).scalar_one()
+    finally:
+        db.close()
+
+
+def test_transfer_with_idempotency_key_posts_once(client, make_user, make_account):
+    user, headers = make_user()
+    source, target = make_account(user, 5000.0), make_account(user, 0.0)
+    form = {"from_account_number": source, "to_account_number": target, "amount": "100", "secret_code": "1234"}
+    headers = {**headers, "Idempotency-Key": "transfer-once"}
+
+    first = client.post("/accounts/transfer", data=form, headers=headers)
+    second = client.post("/accounts/transfer", data=form, headers=headers)
+
+    assert first.status_code == 200, first.text
+    assert second.status_code == 200
+    assert second.headers.get("Idempotent-Replayed") == "true"
+    assert second.json() == first.json()
+    assert balance_of(source) == 4900.0
+    assert balance_of(target) == 100.0
+
+    db = SessionLocal()
+    try:
+        legs = db.execute(
+            select(func.count()).select_from(Transaction).where(Transaction.reference == first.json()["data"]["reference"])
+        ).scalar_one()
+    finally:
+        db.close()
+    assert legs == 2
+
+
+def test_transfer_key_reused_for_other_transfer_is_rejected(client, make_user, make_account):
+    user, headers = make_user()
+    source, target = make_account(user, 5000.0), make_account(user, 0.0)
+    headers = {**headers, "Idempotency-Key": "transfer-reused"}
+    form = {"from_account_number": source, "to_account_number": target, "amount": "100", "secret_code": "1234"}
+
+    assert client.post("/accounts/transfer", data=form, headers=headers).status_code == 200
+    reused = client.post("/accounts/transfer", data={**form, "amount": "200"}, headers=headers)
+
+    assert reused.status_code == 422
+    assert balance_of(source) == 4900.0
+
+
+def test_balance_cache_never_serves_a_balance_committed_elsewhere(client, make_user, make_account):
+    from sqlalchemy import update
+
+    user, headers = make_user()
+    number = make_account(user, 1000.0)
+    assert client.get(f"/accounts/balance/{number}", headers=headers).json()["data"]["balance"] == 1000.0
+
+    # Another worker commits a posting: this process' cache is not told
+    db = SessionLocal()
+    try:
+        db.execute(
+            update(Account).where(Account.account_number == number)
+            .values(balance=Account.balance + 250, version=Account.version + 1)
+        )
+        db.commit()
+    finally:
+        db.close()
+
+    assert client.get(f"/accounts/balance/{number}", headers=headers).json()["data"]["balance"] == 1250.0
+
+
+def test_deposit_keys_are_scoped_to_the_account(client, make_user, make_account):
+    user, _ = make_user()
+    first, second = make_account(user, 0.0), make_account(user, 0.0)
+    headers = {"Idempotency-Key": "deposit-shared-key"}
+
+    # Another client picking the same key for a different account is not a replay
+    assert client.post("/accounts/deposit", data={"account_number": first, "amount": "50"}, headers=headers).status_code == 200
+    other = client.post("/accounts/deposit", data={"account_number": second, "amount": "50"}, headers=headers)
+    assert other.status_code == 200, other.text
+    assert other.headers.get("Idempotent-Replayed") is None
+
+    replay = client.post("/accounts/deposit", data={"account_number": first, "amount": "50"}, headers=headers)
+    assert replay.headers.get("Idempotent-Replayed") == "true"
+    assert balance_of(first) == 50.0
+    assert balance_of(second) == 50.0
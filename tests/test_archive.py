@@ -0,0 +1,155 @@
+import csv
+import io
+from datetime import datetime, timedelta
+import pytest
+from sqlalchemy import insert, select
+from app.core.archive import Archiver, archive_table
+from app.core.config import settings
+from app.core.database import engine
+from app.models import Account, Transaction, TransactionArchiveSummary
+
+
+@pytest.fixture
+def archive_db(ledger_db):
+    """(engine, account_id, add) on a fresh database: the archiver expects ids to grow with time."""
+    Session, numbers = ledger_db
+    bind = Session.kw["bind"]
+    with bind.connect() as conn:
+        account_id = conn.execute(select(Account.account_id).where(Account.account_number == numbers[0])).scalar_one()
+
+    def add(rows: list) -> list:
+        with bind.begin() as conn:
+            return [
+                conn.execute(insert(Transaction).values(
+                    account_id=account_id, transaction_type=transaction_type, amount=amount, timestamp=timestamp,
+                )).inserted_primary_key[0]
+                for transaction_type, amount, timestamp in rows
+            ]
+
+    return bind, account_id, add
+
+
+def archived_ids(bind, month: str) -> list:
+    table = archive_table(month)
+    with bind.connect() as conn:
+        return list(conn.execute(select(table.c.transaction_id).order_by(table.c.transaction_id)).scalars())
+
+
+def hot_ids(bind) -> list:
+    with bind.connect() as conn:
+        return list(conn.execute(select(Transaction.transaction_id).order_by(Transaction.transaction_id)).scalars())
+
+
+def summary_of(bind, account_id: int, month: str):
+    with bind.connect() as conn:
+        return conn.execute(
+            select(TransactionArchiveSummary.__table__)
+            .where(TransactionArchiveSummary.account_id == account_id, TransactionArchiveSummary.month == month)
+        ).one()
+
+
+def test_old_rows_move_to_monthly_tables_with_matching_tombstones(archive_db):
+    bind, account_id, add = archive_db
+    january = add([
+        ("Deposit", 100.0, datetime(2020, 1, 5, 9)),
+        ("Withdrawal", 30.0, datetime(2020, 1, 20, 9)),
+        ("Interest", 0.5, datetime(2020, 1, 31, 23)),
+    ])
+    february = add([("TransferOut", 40.0, datetime(2020, 2, 1, 8))])
+    recent = add([("Deposit", 10.0, datetime.now())])
+
+    summary = Archiver(horizon_months=12, batch_size=2).run(bind)
+
+    assert (summary["moved"], summary["months"]) == (4, ["2020-01", "2020-02"])
+    assert archived_ids(bind, "2020-01") == january
+    assert archived_ids(bind, "2020-02") == february
+    assert hot_ids(bind) == recent
+
+    tombstone = summary_of(bind, account_id, "2020-01")
+    assert tombstone.transaction_count == 3
+    assert tombstone.credit_total == pytest.approx(100.5)
+    assert tombstone.debit_total == pytest.approx(30.0)
+    assert (tombstone.first_transaction_id, tombstone.last_transaction_id) == (january[0], january[-1])
+    tombstone = summary_of(bind, account_id, "2020-02")
+    assert (tombstone.transaction_count, tombstone.credit_total, tombstone.debit_total) == (1, 0.0, 40.0)
+
+
+def test_interrupted_run_is_resumed_without_duplicates_or_losses(archive_db, monkeypatch):
+    bind, account_id, add = archive_db
+    start = datetime(2019, 3, 1, 12)
+    ids = add([("Deposit", float(i + 1), start + timedelta(hours=i)) for i in range(7)])
+    move, calls = Archiver._move, []
+
+    def move_then_fail(self, conn, month, batch_ids):
+        calls.append(batch_ids)
+        move(self, conn, month, batch_ids)
+        if len(calls) == 2:
+            raise RuntimeError("interrupted")  # the second batch rolls back with its transaction
+
+    monkeypatch.setattr(Archiver, "_move", move_then_fail)
+    with pytest.raises(RuntimeError):
+        Archiver(horizon_months=12, batch_size=3).run(bind)
+    monkeypatch.setattr(Archiver, "_move", move)
+
+    assert archived_ids(bind, "2019-03") == ids[:3]
+    assert hot_ids(bind) == ids[3:]
+    assert summary_of(bind, account_id, "2019-03").transaction_count == 3
+
+    Archiver(horizon_months=12, batch_size=3).run(bind)
+
+    assert archived_ids(bind, "2019-03") == ids
+    assert hot_ids(bind) == []
+    tombstone = summary_of(bind, account_id, "2019-03")
+    assert tombstone.transaction_count == 7
+    assert tombstone.credit_total == pytest.approx(sum(range(1, 8)))
+    assert (tombstone.first_transaction_id, tombstone.last_transaction_id) == (ids[0], ids[-1])
+
+
+def archive_rows(month: str, ids: list):
+    # What a run does for one batch, applied to chosen rows of the app database
+    with engine.begin() as conn:
+        archive_table(month).create(bind=conn, checkfirst=True)
+    with engine.begin() as conn:
+        Archiver(horizon_months=12, batch_size=100)._move(conn, month, ids)
+
+
+def test_history_and_statement_read_across_the_archive(client, make_user, make_account, add_transactions):
+    owner, headers = make_user()
+    number = make_account(owner)
+    archived = add_transactions(number, [
+        ("Deposit", 1.0, datetime(2018, 6, 1, 10)),
+        ("Deposit", 2.0, datetime(2018, 6, 15, 10)),
+        ("Withdrawal", 3.0, datetime(2018, 7, 1, 10)),
+    ])
+    hot = add_transactions(number, [
+        ("Deposit", 4.0, datetime.now() - timedelta(minutes=2)),
+        ("Deposit", 5.0, datetime.now() - timedelta(minutes=1)),
+    ])
+    archive_rows("2018-06", archived[:2])
+    archive_rows("2018-07", archived[2:])
+
+    seen, cursor = [], None
+    while True:
+        params = {"limit": 2, **({"cursor": cursor} if cursor else {})}
+        page = client.get(f"/accounts/transactions/{number}", params=params, headers=headers).json()
+        seen += [row["transaction_id"] for row in page["data"]]
+        cursor = page["next_cursor"]
+        if not cursor:
+            break
+    assert seen == list(reversed(archived + hot))  # newest first, hot rows then archived months
+
+    response = client.get(f"/accounts/{number}/statement", params={"format": "csv"}, headers=headers)
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert [int(row["transaction_id"]) for row in rows] == archived + hot  # oldest first
+
+
+def test_archive_job_is_scheduled(monkeypatch):
+    from app.core import scheduler
+
+    monkeypatch.setattr(settings, "SCHEDULER_ENABLED", True)
+    scheduler.start_scheduler()
+    try:
+        job = scheduler.scheduler.get_job("transaction_archive")
+        assert job is not None and job.func is scheduler.archive_transactions
+    finally:
+        scheduler.stop_scheduler()
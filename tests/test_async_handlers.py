@@ -0,0 +1,102 @@
+"""
+API tests for the handlers that run on the async session: signup, login,
+customer create and loan apply.
+"""
+import itertools
+import threading
+import pytest
+from app.function import generating_id
+
+_numbers = itertools.count(1)
+
+
+@pytest.fixture(autouse=True)
+def upload_dir(tmp_path, monkeypatch):
+    # Customer and loan uploads go to a relative directory
+    monkeypatch.chdir(tmp_path)
+
+
+def signup_form(**fields) -> dict:
+    n = next(_numbers)
+    return {
+        "username": f"async{n}", "email": f"async{n}@example.com", "phone_number": f"70000{n:05d}",
+        "password": "Secret@123", "gender": "MALE", "role": "Customer", **fields,
+    }
+
+
+def customer_form(**fields) -> dict:
+    n = next(_numbers)
+    return {
+        "first_name": "Async", "last_name": f"Customer{n}", "date_of_birth": "1990-01-01", "gender": "MALE",
+        "marital_status": "Single", "email": f"asynccust{n}@example.com", "phone_number": f"60000{n:05d}",
+        "address_line1": "-", "city": "Chennai", "state": "TN", "country": "India", "postal_code": "600001",
+        "account_type": "Savings", **fields,
+    }
+
+
+def run_concurrently(calls: list, timeout: float = 30) -> list:
+    # Requests from several threads run concurrently on the TestClient's event loop
+    responses = [None] * len(calls)
+    barrier = threading.Barrier(len(calls))
+
+    def worker(i):
+        barrier.wait()
+        responses[i] = calls[i]()
+
+    pool = [threading.Thread(target=worker, args=(i,), daemon=True) for i in range(len(calls))]
+    for t in pool:
+        t.start()
+    for t in pool:
+        t.join(timeout)
+    assert not any(t.is_alive() for t in pool), "requests did not finish: event loop blocked"
+    return responses
+
+
+def test_signup_then_login(client):
+    form = signup_form()
+    created = client.post("/signup", data=form)
+    assert created.status_code == 201, created.text
+    assert created.json()["data"]["user_id"].startswith("CST")
+
+    token = client.post("/login", data={"username": form["email"], "password": form["password"]})
+    assert token.status_code == 200, token.text
+    assert token.json()["token_type"] == "Bearer"
+
+    wrong = client.post("/login", data={"username": form["email"], "password": "nope"})
+    assert wrong.status_code == 401
+
+
+def test_concurrent_signups_and_customer_creates_get_unique_codes(client, make_user, monkeypatch):
+    # Empty blocks: every prefix reserves from id_sequences during these requests
+    monkeypatch.setattr(generating_id.allocator, "_blocks", {})
+    _, headers = make_user()
+
+    calls = [lambda: client.post("/signup", data=signup_form()) for _ in range(4)]
+    calls += [lambda: client.post("/create", data=customer_form(), headers=headers) for _ in range(4)]
+    responses = run_concurrently(calls)
+
+    assert [response.status_code for response in responses] == [201] * 8, [r.text for r in responses]
+    user_ids = [response.json()["data"]["user_id"] for response in responses[:4]]
+    customer_codes = [response.json()["data"]["customer_code"] for response in responses[4:]]
+    assert len(set(user_ids)) == 4 and len(set(customer_codes)) == 4
+
+
+def test_create_customer_requires_customer_role(client, make_user):
+    _, admin = make_user("Admin")
+    assert client.post("/create", data=customer_form(), headers=admin).status_code == 403
+
+
+def test_apply_for_loan(client, make_user, make_account):
+    owner, headers = make_user()
+    make_account(owner)
+    form = {"loan_type": "Personal", "amount": "120000", "tenure_months": "12", "interest_rate_annual": "12",
+            "loan_reason": "Test"}
+
+    applied = client.post("/loans/apply", data=form, headers=headers)
+    assert applied.status_code == 201, applied.text
+    loan = applied.json()["data"]
+    assert loan["loan_id"].startswith("LL") and loan["status"] == "Pending"
+    assert loan["emi"] == pytest.approx(10661.85, abs=0.01)
+
+    # One pending application at a time
+    assert client.post("/loans/apply", data=form, headers=headers).status_code == 400
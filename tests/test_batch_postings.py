@@ -0,0 +1,73 @@
+import re
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.function import ledger
+from tests.test_accounts_api import balance_of
+
+
+def queries_in(response) -> int:
+    return int(re.search(r'desc="(\d+) queries"', response.headers["Server-Timing"]).group(1))
+
+
+def test_batch_reports_committed_balances_within_budget(client, make_user, make_account, monkeypatch):
+    monkeypatch.setattr(settings, "QUERY_BUDGET_STRICT", True)
+    owner, _ = make_user()
+    first, second = make_account(owner, 1000.0), make_account(owner, 0.0)
+    _, admin = make_user("Admin")
+    postings = [
+        {"account_number": first, "amount": 100, "type": "withdrawal"},
+        {"account_number": second, "amount": 40, "type": "deposit"},
+        {"account_number": first, "amount": 25, "type": "deposit"},
+        {"account_number": second, "amount": 500, "type": "withdrawal"},
+    ]
+
+    response = client.post("/accounts/postings/batch", json={"postings": postings}, headers=admin)
+
+    assert response.status_code == 200, response.text
+    results = response.json()["data"]["results"]
+    assert [result["status"] for result in results] == ["applied", "applied", "applied", "rejected"]
+    assert [result.get("balance_after") for result in results[:3]] == [900.0, 40.0, 925.0]
+    assert balance_of(first) == 925.0 and balance_of(second) == 40.0
+    assert queries_in(response) == 5  # user, accounts, UPDATE, read-back, INSERT
+
+
+def test_batch_balance_after_includes_postings_that_landed_before_the_write(client, make_user, make_account, monkeypatch):
+    owner, _ = make_user()
+    number = make_account(owner, 1000.0)
+    _, admin = make_user("Admin")
+    chunks = ledger._chunks
+
+    def chunks_then_concurrent_deposit(values):
+        # The batch has read its balances; another request's deposit commits before the UPDATE
+        yield from chunks(values)
+        monkeypatch.setattr(ledger, "_chunks", chunks)
+        db = SessionLocal()
+        try:
+            ledger.post_credit(db, 300.0, "Deposit", number)
+        finally:
+            db.close()
+
+    monkeypatch.setattr(ledger, "_chunks", chunks_then_concurrent_deposit)
+    response = client.post(
+        "/accounts/postings/batch", json=[{"account_number": number, "amount": 100, "type": "deposit"}], headers=admin
+    )
+
+    assert response.status_code == 200, response.text
+    assert response.json()["data"]["results"][0]["balance_after"] == 1400.0 == balance_of(number)
+
+
+def test_batch_conflict_returns_409(client, make_user, make_account, monkeypatch):
+    owner, _ = make_user()
+    number = make_account(owner, 1000.0)
+    _, admin = make_user("Admin")
+
+    def always_conflicts(db, lines, all_or_nothing, max_attempts=3):
+        raise ledger.BatchConflict("Batch could not be applied because of concurrent balance changes")
+
+    monkeypatch.setattr("app.api.routers.AccountRouter.post_batch", always_conflicts)
+    response = client.post(
+        "/accounts/postings/batch", json=[{"account_number": number, "amount": 10, "type": "deposit"}], headers=admin
+    )
+
+    assert response.status_code == 409
+    assert balance_of(number) == 1000.0
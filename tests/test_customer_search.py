@@ -0,0 +1,116 @@
+import itertools
+from datetime import date
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import Session
+from app.core.database import SessionLocal
+from app.function.customer_search import search_customers
+from app.models import Customer
+
+_tokens = itertools.count(1)
+
+
+@pytest.fixture
+def token():
+    # A word no other test's customers contain, so results only hold this test's rows
+    return f"qzv{next(_tokens):04d}x"
+
+
+@pytest.fixture
+def make_customer(make_user):
+    owner, _ = make_user()
+
+    def factory(**fields) -> str:
+        n = next(_tokens)
+        code = fields.pop("customer_code", f"CS{n:08d}")
+        db = SessionLocal()
+        try:
+            db.add(Customer(**{
+                "customer_code": code, "first_name": "Plain", "last_name": "Person", "date_of_birth": date(1990, 1, 1),
+                "email": f"search{n}@example.com", "phone_number": f"5{n:09d}", "address_line1": "-",
+                "city": "Chennai", "state": "-", "country": "India", "postal_code": "-", "account_type": "Savings",
+                "login_id": owner.user_table_id, **fields,
+            }))
+            db.commit()
+        finally:
+            db.close()
+        return code
+
+    return factory
+
+
+def codes_for(query: str, limit: int = 20) -> list:
+    db = SessionLocal()
+    try:
+        return [row.customer_code for row in search_customers(db, query, limit)]
+    finally:
+        db.close()
+
+
+def test_index_follows_insert_update_and_delete(make_customer, token):
+    code = make_customer(first_name=token)
+    assert codes_for(token) == [code]
+
+    renamed = f"re{token}"
+    db = SessionLocal()
+    try:
+        # Core/raw SQL writes go through the same triggers as the ORM
+        db.execute(text("UPDATE customers_table SET first_name = :name WHERE customer_code = :code"),
+                   {"name": renamed, "code": code})
+        db.commit()
+        assert codes_for(renamed) == [code]
+        assert codes_for(token) == []  # the old first name is gone from the index
+
+        db.execute(text("DELETE FROM customers_table WHERE customer_code = :code"), {"code": code})
+        db.commit()
+    finally:
+        db.close()
+    assert codes_for(renamed) == []
+
+
+def test_terms_match_as_prefixes_and_all_must_match(make_customer, token):
+    chennai = make_customer(first_name=f"{token}john", city="Chennai")
+    mumbai = make_customer(first_name=f"{token}jones", city="Mumbai")
+    email = make_customer(email=f"{token}.doe@example.com")
+
+    assert sorted(codes_for(token[:-1])) == sorted([chennai, mumbai, email])
+    assert sorted(codes_for(f"{token}jo")) == sorted([chennai, mumbai])
+    assert codes_for(f"{token}jo mum") == [mumbai]
+    assert codes_for(f"{token}.doe@exa") == [email]  # split like the tokenizer splits the stored email
+
+
+def test_results_rank_names_above_email_above_city(make_customer, token):
+    by_city = make_customer(city=token)
+    by_email = make_customer(email=f"{token}@example.com")
+    by_name = make_customer(last_name=token)
+    by_code = make_customer(customer_code=token.upper())
+
+    assert codes_for(token) == [by_code, by_name, by_email, by_city]
+    assert codes_for(token, limit=2) == [by_code, by_name]
+
+
+def test_search_endpoint(client, make_user, make_customer, token):
+    code = make_customer(first_name=token, last_name="Kumar")
+    _, auditor = make_user("Auditor")
+    _, customer = make_user()
+
+    response = client.get("/customers/search", params={"q": token}, headers=auditor)
+    assert response.status_code == 200, response.text
+    [row] = response.json()["data"]
+    assert (row["customer_code"], row["full_name"]) == (code, f"{token} Kumar")
+    assert row["score"] > 0
+
+    assert client.get("/customers/search", params={"q": "!!!"}, headers=auditor).status_code == 400
+    assert client.get("/customers/search", params={"q": token}, headers=customer).status_code == 403
+
+
+def test_search_is_refused_where_no_full_text_index_exists(monkeypatch):
+    # Neither FTS5 nor a MySQL FULLTEXT index: 501 instead of a LIKE scan over every customer
+    engine = create_engine("sqlite://")
+    monkeypatch.setattr(engine.dialect, "name", "postgresql")
+    with Session(bind=engine) as db:
+        with pytest.raises(HTTPException) as raised:
+            search_customers(db, "john", 20)
+    assert raised.value.status_code == 501
+    engine.dispose()
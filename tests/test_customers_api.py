@@ -0,0 +1,30 @@
+from app.main import app
+
+
+def test_customer_listing_has_a_single_handler():
+    routes = [route for route in app.routes if getattr(route, "path", None) == "/get-all-customer"]
+    assert len(routes) == 1
+
+
+def test_customer_listing_pages_with_cursor(client, make_user, make_account):
+    owner, _ = make_user()
+    for _ in range(3):
+        make_account(owner)
+    _, admin = make_user("Admin")
+
+    first = client.get("/get-all-customer", params={"limit": 2, "include_total": True}, headers=admin)
+    assert first.status_code == 200, first.text
+    body = first.json()
+    assert len(body["data"]) == 2
+    assert body["total_customers"] >= 3
+    assert body["next_cursor"]
+
+    second = client.get("/get-all-customer", params={"limit": 2, "cursor": body["next_cursor"]}, headers=admin)
+    assert second.status_code == 200, second.text
+    first_codes = {row["customer_code"] for row in body["data"]}
+    assert not first_codes & {row["customer_code"] for row in second.json()["data"]}
+
+
+def test_customer_listing_requires_admin(client, make_user):
+    _, headers = make_user()
+    assert client.get("/get-all-customer", headers=headers).status_code == 403
@@ -0,0 +1,97 @@
+"""
+GroupCommitWriter: concurrent postings share batches (one commit each) and
+a posting that raises fails alone - the rest of its batch is retried one
+transaction per posting and still applied.
+"""
+import threading
+from sqlalchemy import func
+from app.core.group_commit import GroupCommitWriter
+from app.function.ledger import post_movement
+from app.models import Account, Transaction
+
+THREADS = 8
+POSTINGS_PER_THREAD = 25
+
+
+def run_concurrently(count: int, target):
+    barrier = threading.Barrier(count)
+    results, errors = [None] * count, [None] * count
+
+    def worker(i):
+        barrier.wait()
+        try:
+            results[i] = target(i)
+        except Exception as e:
+            errors[i] = e
+
+    pool = [threading.Thread(target=worker, args=(i,)) for i in range(count)]
+    for t in pool:
+        t.start()
+    for t in pool:
+        t.join()
+    return results, errors
+
+
+def test_concurrent_postings_share_batches(ledger_db):
+    Session, numbers = ledger_db
+    writer = GroupCommitWriter(max_batch=64, max_delay_ms=20, timeout_seconds=30, session_factory=Session)
+
+    def deposits(i):
+        return [
+            writer.submit(lambda db: post_movement(db, 1.0, "grouped", account_number=numbers[i % len(numbers)], commit=False))
+            for _ in range(POSTINGS_PER_THREAD)
+        ]
+
+    try:
+        results, errors = run_concurrently(THREADS, deposits)
+    finally:
+        writer.stop()
+
+    assert errors == [None] * THREADS
+    assert all(result.applied for batch in results for result in batch)
+    stats = writer.stats()
+    assert stats["postings"] == THREADS * POSTINGS_PER_THREAD
+    assert stats["batches"] < stats["postings"]
+    assert stats["largest_batch"] > 1
+    assert stats["fallbacks"] == 0
+
+    db = Session()
+    try:
+        assert db.query(func.count(Transaction.transaction_id)).scalar() == THREADS * POSTINGS_PER_THREAD
+        assert db.query(func.sum(Account.balance)).scalar() == len(numbers) * 1_000_000.0 + THREADS * POSTINGS_PER_THREAD
+    finally:
+        db.close()
+
+
+def test_failing_posting_falls_back_to_one_transaction_each(ledger_db):
+    Session, numbers = ledger_db
+    writer = GroupCommitWriter(max_batch=64, max_delay_ms=200, timeout_seconds=30, session_factory=Session)
+
+    def failing(db):
+        post_movement(db, 500.0, "rolled back", account_number=numbers[0], commit=False)
+        raise ValueError("bad posting")
+
+    def submit(i):
+        if i == 0:
+            return writer.submit(failing)
+        return writer.submit(lambda db: post_movement(db, 10.0, "kept", account_number=numbers[1], commit=False))
+
+    try:
+        results, errors = run_concurrently(THREADS, submit)
+    finally:
+        writer.stop()
+
+    assert isinstance(errors[0], ValueError)
+    assert errors[1:] == [None] * (THREADS - 1)
+    assert all(result.applied for result in results[1:])
+    assert writer.stats()["fallbacks"] >= 1
+
+    db = Session()
+    try:
+        balances = dict(db.query(Account.account_number, Account.balance))
+        assert balances[numbers[0]] == 1_000_000.0
+        assert balances[numbers[1]] == 1_000_000.0 + 10.0 * (THREADS - 1)
+        assert db.query(func.count(Transaction.transaction_id)).filter(Transaction.description == "rolled back").scalar() == 0
+    finally:
+        db.close()
+
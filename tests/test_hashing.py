@@ -0,0 +1,30 @@
+import asyncio
+import pytest
+from app.core.hashing import PasswordHasher
+
+
+@pytest.fixture
+def hasher():
+    hasher = PasswordHasher(max_workers=2)
+    hasher.start()
+    yield hasher
+    hasher.shutdown()
+
+
+def test_start_forks_every_worker(hasher):
+    assert len(hasher._executor._processes) == 2
+
+
+def test_only_successful_calls_count_as_completed(hasher):
+    hashed = asyncio.run(hasher.hash("s3cret"))
+    assert asyncio.run(hasher.verify("s3cret", hashed))
+    with pytest.raises(ValueError):
+        asyncio.run(hasher.verify("s3cret", "not-a-bcrypt-hash"))
+
+    stats = hasher.stats()
+    assert (stats["completed"], stats["failed"], stats["queue_depth"]) == (2, 1, 0)
+
+
+def test_submit_requires_start():
+    with pytest.raises(RuntimeError):
+        asyncio.run(PasswordHasher(max_workers=1).hash("s3cret"))
@@ -0,0 +1,158 @@
+import pytest
+from sqlalchemy import select
+from app.core.config import settings
+from app.core.hot_accounts import HotAccountRegistry
+from app.function import ledger
+from app.models import Account, AccountBalanceSlot
+from tests.test_accounts_api import balance_of
+
+
+@pytest.fixture
+def hot_db(ledger_db, monkeypatch):
+    """(Session, numbers, make_hot) with a registry of its own, so the app's stays untouched."""
+    Session, numbers = ledger_db
+    registry = HotAccountRegistry()
+    monkeypatch.setattr(ledger, "hot_accounts", registry)
+
+    def make_hot(number: str, slots: int) -> int:
+        db = Session()
+        try:
+            account_id = db.execute(select(Account.account_id).where(Account.account_number == number)).scalar_one()
+            ledger.set_balance_slots(db, account_id, slots)
+            db.commit()
+        finally:
+            db.close()
+        registry.set(number, account_id, slots)
+        return account_id
+
+    return Session, numbers, make_hot
+
+
+def slot_balances(db, account_id: int) -> dict:
+    return dict(db.execute(
+        select(AccountBalanceSlot.slot, AccountBalanceSlot.balance).where(AccountBalanceSlot.account_id == account_id)
+    ).all())
+
+
+def test_credit_to_hot_account_lands_in_its_slot(hot_db):
+    Session, numbers, make_hot = hot_db
+    account_id = make_hot(numbers[0], 4)
+    db = Session()
+    try:
+        first = ledger.post_credit(db, 50.0, "Deposit", numbers[0], shard_key="key-1")
+        again = ledger.post_credit(db, 25.0, "Deposit", numbers[0], shard_key="key-1")
+
+        assert (first.applied, first.version) == (True, None)
+        assert first.balance == 1_000_050.0 and again.balance == 1_000_075.0
+        slots = slot_balances(db, account_id)
+        assert sorted(slots.values()) == [0.0, 0.0, 0.0, 75.0]  # same key, same slot
+        assert db.execute(select(Account.balance).where(Account.account_id == account_id)).scalar_one() == 1_000_000.0
+    finally:
+        db.close()
+
+
+def test_credit_falls_back_to_main_row_when_slots_are_gone(hot_db):
+    Session, numbers, make_hot = hot_db
+    account_id = make_hot(numbers[0], 2)
+    db = Session()
+    try:
+        ledger.set_balance_slots(db, account_id, 0)  # switched off by another worker: registry still lists it
+        db.commit()
+        result = ledger.post_credit(db, 10.0, "Deposit", numbers[0], shard_key="key-1")
+
+        assert result.version is not None and result.balance == 1_000_010.0
+        assert slot_balances(db, account_id) == {}
+    finally:
+        db.close()
+
+
+def test_fold_slots_moves_slot_credits_into_the_balance(hot_db):
+    Session, numbers, make_hot = hot_db
+    account_id = make_hot(numbers[0], 4)
+    db = Session()
+    try:
+        for i in range(8):
+            ledger.post_credit(db, 10.0, "Deposit", numbers[0], shard_key=f"key-{i}")
+        version = db.execute(select(Account.version).where(Account.account_id == account_id)).scalar_one()
+
+        assert ledger.fold_slots(db, account_id) == 80.0
+        db.commit()
+
+        assert set(slot_balances(db, account_id).values()) == {0.0}
+        row = db.execute(select(Account.balance, Account.version).where(Account.account_id == account_id)).one()
+        assert (row.balance, row.version) == (1_000_080.0, version + 1)
+        assert ledger.fold_slots(db, account_id) == 0.0  # nothing pending
+    finally:
+        db.close()
+
+
+def test_fold_all_slots_folds_every_hot_account_with_credits(hot_db):
+    Session, numbers, make_hot = hot_db
+    first, second, idle = make_hot(numbers[0], 2), make_hot(numbers[1], 3), make_hot(numbers[2], 2)
+    db = Session()
+    try:
+        ledger.post_credit(db, 5.0, "Deposit", numbers[0])
+        ledger.post_credit(db, 7.0, "Deposit", numbers[1])
+        ledger.post_credit(db, 8.0, "Deposit", numbers[1])
+
+        assert ledger.fold_all_slots(db) == 2  # the idle account has nothing to fold
+
+        balances = dict(db.execute(select(Account.account_id, Account.balance)).all())
+        assert (balances[first], balances[second], balances[idle]) == (1_000_005.0, 1_000_015.0, 1_000_000.0)
+        for account_id in (first, second):
+            assert set(slot_balances(db, account_id).values()) == {0.0}
+    finally:
+        db.close()
+
+
+def test_withdrawal_from_hot_account_folds_slot_credits_first(client, make_user, make_account):
+    owner, headers = make_user()
+    number = make_account(owner, 100.0)
+    _, admin = make_user("Admin")
+    response = client.put(f"/accounts/{number}/hot-mode", data={"slots": "4"}, headers=admin)
+    assert response.status_code == 200, response.text
+    try:
+        for i in range(5):
+            deposit = client.post(
+                "/accounts/deposit", data={"account_number": number, "amount": "100"},
+                headers={"Idempotency-Key": f"hot-{number}-{i}"},
+            )
+            assert deposit.status_code == 200, deposit.text
+        assert balance_of(number) == 100.0  # credits are still in the slots
+        balance = client.get(f"/accounts/balance/{number}", headers=headers).json()["data"]["balance"]
+        assert balance == 600.0
+
+        # More than the main row holds: only succeeds because the slots are folded first
+        withdrawal = client.post(
+            "/accounts/withdraw", data={"account_number": number, "amount": "550", "secret_code": "1234"}, headers=headers
+        )
+        assert withdrawal.status_code == 200, withdrawal.text
+        assert withdrawal.json()["data"]["balance"] == 50.0
+        assert balance_of(number) == 50.0
+    finally:
+        client.put(f"/accounts/{number}/hot-mode", data={"slots": "0"}, headers=admin)
+
+
+def test_registry_get_does_not_query(monkeypatch):
+    registry = HotAccountRegistry()
+    registry.set("100000000001", 1, 4)
+
+    def no_queries():
+        raise AssertionError("get() must not reload the registry")
+
+    monkeypatch.setattr(registry, "refresh", no_queries)
+    assert registry.get("100000000001") == (1, 4)
+    assert registry.get("100000000002") is None
+
+
+def test_hot_account_refresh_is_scheduled_next_to_the_fold(monkeypatch):
+    from app.core import scheduler
+
+    monkeypatch.setattr(settings, "SCHEDULER_ENABLED", True)
+    scheduler.start_scheduler()
+    try:
+        refresh = scheduler.scheduler.get_job("hot_account_refresh")
+        assert refresh is not None and refresh.func is scheduler.refresh_hot_accounts
+        assert scheduler.scheduler.get_job("hot_account_fold") is not None
+    finally:
+        scheduler.stop_scheduler()
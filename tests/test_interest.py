@@ -0,0 +1,152 @@
+from datetime import date, timedelta
+import pytest
+from sqlalchemy import delete, func, select
+from app.core import interest
+from app.core.interest import InterestEngine
+from app.models import Account, InterestAccrual, Transaction
+
+DAY = date(2024, 3, 1)
+
+# account_type, status, balance -> expected interest at 3.65% (Savings) / 7.3% (FD) over 365 days
+ACCOUNTS = [
+    ("Savings", "Active", 1_000_000.0, 100.0),
+    ("FD", "Active", 10_000.0, 2.0),
+    ("Current", "Active", 1_000_000.0, None),  # not an interest-bearing type
+    ("Savings", "Active", 0.0, None),
+    ("Savings", "Active", -500.0, None),
+    ("Savings", "Closed", 1_000_000.0, None),
+    ("Savings", "Active", 123.45, 0.01),  # 0.012345 rounds down
+    ("Savings", "Active", 40.0, None),  # 0.004 rounds to nothing
+    ("FD", "Active", 1_234.56, 0.25),  # 0.246912 rounds up
+]
+
+
+@pytest.fixture
+def interest_db(ledger_db, monkeypatch):
+    """(Session, engine, expected) on a fresh database holding exactly ACCOUNTS, in account_id order."""
+    Session, numbers = ledger_db
+    monkeypatch.setattr(interest, "SessionLocal", Session)
+    db = Session()
+    try:
+        customer_id = db.execute(select(Account.customer_id)).scalars().first()
+        db.execute(delete(Account))
+        rows = [
+            Account(account_number=f"2000000000{i:02d}", customer_id=customer_id, account_type=account_type,
+                    status=status, balance=balance, secret_code="0000")
+            for i, (account_type, status, balance, _) in enumerate(ACCOUNTS)
+        ]
+        db.add_all(rows)
+        db.commit()
+        expected = {row.account_id: credit for row, (*_, credit) in zip(rows, ACCOUNTS)}
+    finally:
+        db.close()
+    engine = InterestEngine(rates={"Savings": 0.0365, "FD": 0.073}, days_per_year=365, chunk_size=2)
+    return Session, engine, expected
+
+
+def interest_postings(Session) -> dict:
+    db = Session()
+    try:
+        return {
+            row.account_id: (row.count, round(row.total, 2))
+            for row in db.execute(
+                select(Transaction.account_id, func.count().label("count"), func.sum(Transaction.amount).label("total"))
+                .where(Transaction.transaction_type == "Interest")
+                .group_by(Transaction.account_id)
+            )
+        }
+    finally:
+        db.close()
+
+
+def balances(Session) -> dict:
+    db = Session()
+    try:
+        return dict(db.execute(select(Account.account_id, Account.balance)).all())
+    finally:
+        db.close()
+
+
+def test_only_eligible_accounts_are_credited_with_rounded_interest(interest_db):
+    Session, engine, expected = interest_db
+    before = balances(Session)
+
+    summary = engine.accrue(DAY)
+
+    credited = {account_id: credit for account_id, credit in expected.items() if credit is not None}
+    assert interest_postings(Session) == {account_id: (1, credit) for account_id, credit in credited.items()}
+    after = balances(Session)
+    for account_id, balance in before.items():
+        assert after[account_id] == pytest.approx(balance + credited.get(account_id, 0.0))
+    assert summary["accounts_accrued"] == len(credited)
+    assert summary["total_interest"] == round(sum(credited.values()), 2)
+    assert summary["already_accrued"] is False
+
+
+def test_daily_interest_rounds_to_cents_and_ignores_negative_balances():
+    engine = InterestEngine(rates={"Savings": 0.0365}, days_per_year=365, chunk_size=10)
+    interest = engine.daily_interest(
+        ["Savings", "Savings", "Savings", "Savings", "Current"], [123.45, 1_234.56, -500.0, None, 1_000.0]
+    )
+    assert interest.tolist() == [0.01, 0.12, 0.0, 0.0, 0.0]
+
+
+def test_second_run_for_the_same_date_posts_nothing(interest_db):
+    Session, engine, _ = interest_db
+    engine.accrue(DAY)
+    postings, after_first = interest_postings(Session), balances(Session)
+
+    again = engine.accrue(DAY)
+
+    assert again["already_accrued"] is True and again["chunks"] == 0
+    assert interest_postings(Session) == postings
+    assert balances(Session) == after_first
+
+    engine.accrue(DAY + timedelta(days=1))  # the next date is a new accrual
+    assert all(count == 2 for count, _ in interest_postings(Session).values())
+
+
+def test_failed_run_restarts_at_the_next_chunk(interest_db, monkeypatch):
+    Session, engine, expected = interest_db
+    accrue_chunk, calls = InterestEngine._accrue_chunk, []
+
+    def fail_on_third_chunk(self, db, accrual_date, after_id):
+        calls.append(after_id)
+        if len(calls) == 3:
+            raise RuntimeError("worker died")
+        return accrue_chunk(self, db, accrual_date, after_id)
+
+    monkeypatch.setattr(InterestEngine, "_accrue_chunk", fail_on_third_chunk)
+    with pytest.raises(RuntimeError):
+        engine.accrue(DAY)
+    monkeypatch.setattr(InterestEngine, "_accrue_chunk", accrue_chunk)
+
+    db = Session()
+    try:
+        watermark = db.execute(
+            select(InterestAccrual.last_account_id, InterestAccrual.finished_at).where(InterestAccrual.accrual_date == DAY)
+        ).one()
+    finally:
+        db.close()
+    assert watermark.finished_at is None
+    assert watermark.last_account_id == calls[-1]  # two chunks committed, the third never ran
+    assert set(interest_postings(Session)) == {
+        account_id for account_id, credit in expected.items() if credit is not None and account_id <= calls[-1]
+    }
+
+    summary = engine.run_due(today=DAY + timedelta(days=1))  # picks up the unfinished date
+
+    assert [run["accrual_date"] for run in summary] == [DAY.isoformat()]
+    credited = {account_id: credit for account_id, credit in expected.items() if credit is not None}
+    assert interest_postings(Session) == {account_id: (1, credit) for account_id, credit in credited.items()}
+    assert summary[0]["accounts_accrued"] == len(credited)
+
+
+def test_run_due_catches_up_every_missed_day(interest_db):
+    Session, engine, _ = interest_db
+    engine.accrue(DAY)
+
+    runs = engine.run_due(today=DAY + timedelta(days=4))
+
+    assert [run["accrual_date"] for run in runs] == [(DAY + timedelta(days=n)).isoformat() for n in (1, 2, 3)]
+    assert engine.run_due(today=DAY + timedelta(days=4)) == []
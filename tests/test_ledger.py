@@ -0,0 +1,19 @@
+from sqlalchemy import select
+from app.function.ledger import post_movement, transfer
+from app.models import Account
+
+
+def test_posting_balances_are_floats(ledger_db):
+    # SQLite's RETURNING hands back 1000100 for a REAL column holding 1000100.0
+    Session, numbers = ledger_db
+    db = Session()
+    try:
+        result = post_movement(db, 100, "Deposit", account_number=numbers[0])
+        assert type(result.balance) is float and result.balance == 1_000_100.0
+
+        target_id = db.execute(select(Account.account_id).where(Account.account_number == numbers[1])).scalar_one()
+        moved = transfer(db, result.account_id, target_id, 100, "Transfer")
+        assert (type(moved.from_balance), type(moved.to_balance)) == (float, float)
+        assert (moved.from_balance, moved.to_balance) == (1_000_000.0, 1_000_100.0)
+    finally:
+        db.close()
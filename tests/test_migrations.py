@@ -0,0 +1,38 @@
+from sqlalchemy import create_engine, inspect, select
+from app.core.migrations import MIGRATIONS, explain_query_plan, find_full_scans, hot_queries, run_migrations, schema_migrations
+
+
+def test_hot_queries_use_an_index(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'migrated.db'}")
+    run_migrations(bind=engine)
+
+    assert find_full_scans(bind=engine) == {}
+    engine.dispose()
+
+
+def test_every_migration_applies_on_a_new_database(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'migrated.db'}")
+    run_migrations(bind=engine)
+    run_migrations(bind=engine)  # second run is a no-op
+
+    with engine.connect() as conn:
+        applied = list(conn.execute(select(schema_migrations.c.version).order_by(schema_migrations.c.version)).scalars())
+    indexes = {index["name"] for index in inspect(engine).get_indexes("transactions")}
+    engine.dispose()
+
+    assert applied == [version for version, _, _ in MIGRATIONS]
+    # Created by migration 1, replaced by migration 3, replaced again by migration 8
+    assert "ix_transactions_account_id_timestamp" not in indexes
+    assert "ix_transactions_account_history" not in indexes
+    assert "ix_transactions_history_covering" in indexes
+
+
+def test_history_page_is_answered_from_the_index_alone(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'migrated.db'}")
+    run_migrations(bind=engine)
+
+    with engine.connect() as conn:
+        plan = explain_query_plan(conn, hot_queries()["transaction history page"])
+    engine.dispose()
+
+    assert any("USING COVERING INDEX ix_transactions_history_covering" in detail for detail in plan), plan
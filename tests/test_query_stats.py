@@ -0,0 +1,68 @@
+import re
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import insert, select, text
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.core.database import get_db, SessionLocal
+from app.core.query_stats import query_budget, query_stats_middleware
+from app.models import IdSequence
+
+
+def budget_app() -> FastAPI:
+    app = FastAPI()
+    app.middleware("http")(query_stats_middleware)
+
+    @app.post("/write", dependencies=[Depends(query_budget(2))])
+    def write(prefix: str, db: Session = Depends(get_db)):
+        db.execute(text("SELECT 1"))
+        db.execute(text("SELECT 2"))
+        db.execute(insert(IdSequence).values(prefix=prefix, next_value=1))  # statement 3: over budget
+        db.commit()
+        return {"ok": True}
+
+    return app
+
+
+def sequence_exists(prefix: str) -> bool:
+    db = SessionLocal()
+    try:
+        return db.execute(select(IdSequence.prefix).where(IdSequence.prefix == prefix)).first() is not None
+    finally:
+        db.close()
+
+
+def queries_in(response) -> int:
+    return int(re.search(r'desc="(\d+) queries"', response.headers["Server-Timing"]).group(1))
+
+
+def test_strict_budget_fails_before_commit(client, monkeypatch):
+    monkeypatch.setattr(settings, "QUERY_BUDGET_STRICT", True)
+
+    response = TestClient(budget_app()).post("/write", params={"prefix": "STRICT"})
+
+    assert response.status_code == 500
+    assert "Query budget exceeded" in response.json()["detail"]["message"]
+    assert not sequence_exists("STRICT")
+
+
+def test_over_budget_is_only_logged_when_not_strict(client, monkeypatch):
+    monkeypatch.setattr(settings, "QUERY_BUDGET_STRICT", False)
+
+    response = TestClient(budget_app()).post("/write", params={"prefix": "LENIENT"})
+
+    assert response.status_code == 200
+    assert queries_in(response) == 3
+    assert sequence_exists("LENIENT")
+
+
+def test_group_commit_postings_count_towards_the_request(client, make_user, make_account, monkeypatch):
+    user, _ = make_user()
+    number = make_account(user)
+    form = {"account_number": number, "amount": "50"}
+
+    monkeypatch.setattr(settings, "GROUP_COMMIT_ENABLED", True)
+    response = client.post("/accounts/deposit", data=form)
+
+    assert response.status_code == 200
+    assert queries_in(response) >= 2  # balance UPDATE ... RETURNING + transaction INSERT, run by the writer thread
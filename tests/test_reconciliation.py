@@ -0,0 +1,48 @@
+from sqlalchemy import select, update
+from app.core.database import SessionLocal
+from app.core.reconciliation import Reconciler
+from app.function.ledger import post_credit
+from app.models import Account, ReconciliationException
+
+
+def deposit(account_number: str, amount: float):
+    db = SessionLocal()
+    try:
+        assert post_credit(db, amount, "Deposit", account_number).applied
+    finally:
+        db.close()
+
+
+def test_run_checks_only_accounts_with_new_transactions(client, make_user, make_account):
+    reconciler = Reconciler(tolerance=0.01)
+    reconciler.run()  # checkpoint everything earlier tests wrote
+    owner, _ = make_user()
+    first, second = make_account(owner, 0.0), make_account(owner, 0.0)
+
+    deposit(first, 100.0)
+    deposit(second, 50.0)
+    summary = reconciler.run()
+    assert (summary["accounts_checked"], summary["transactions_checked"], summary["mismatches"]) == (2, 2, 0)
+
+    # Drift with no transaction row: not seen until the account posts again
+    db = SessionLocal()
+    try:
+        db.execute(update(Account).where(Account.account_number == second).values(balance=Account.balance + 5))
+        db.commit()
+    finally:
+        db.close()
+    deposit(first, 10.0)
+    summary = reconciler.run()
+    assert (summary["accounts_checked"], summary["mismatches"]) == (1, 0)
+
+    deposit(second, 1.0)
+    summary = reconciler.run()
+    assert (summary["accounts_checked"], summary["mismatches"]) == (1, 1)
+    db = SessionLocal()
+    try:
+        difference = db.execute(
+            select(ReconciliationException.difference).where(ReconciliationException.run_id == summary["run_id"])
+        ).scalar_one()
+    finally:
+        db.close()
+    assert abs(difference - 5.0) < 0.01
@@ -0,0 +1,57 @@
+import time
+import uuid
+from datetime import datetime, timedelta
+from app.core import revocation
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.core.revocation import RevocationStore
+from app.models.RevokedTokenModel import RevokedToken
+
+
+def revoke_elsewhere(jti: str):
+    # Another worker's logout: the row exists, this process' filter has not seen it
+    db = SessionLocal()
+    try:
+        now = datetime.utcnow()
+        db.add(RevokedToken(jti=jti, expires_at=now + timedelta(hours=1), revoked_at=now))
+        db.commit()
+    finally:
+        db.close()
+
+
+def test_checks_never_touch_the_database_for_unknown_tokens(client, monkeypatch):
+    store = RevocationStore()
+    store.load()
+
+    def no_sessions():
+        raise AssertionError("request path opened a database session")
+
+    monkeypatch.setattr(revocation, "SessionLocal", no_sessions)
+    monkeypatch.setattr(settings, "REVOCATION_SYNC_SECONDS", 0)
+    monkeypatch.setattr(settings, "REVOCATION_PURGE_SECONDS", 0)
+    assert not store.is_revoked(uuid.uuid4().hex)
+    assert store.stats()["db_lookups"] == 0
+
+
+def test_background_sync_picks_up_other_workers_revocations(client, monkeypatch):
+    monkeypatch.setattr(settings, "REVOCATION_SYNC_SECONDS", 0.05)
+    store = RevocationStore()
+    store.load()
+    store.start()
+    try:
+        jti = uuid.uuid4().hex
+        revoke_elsewhere(jti)
+        deadline = time.monotonic() + 5
+        while not store.is_revoked(jti) and time.monotonic() < deadline:
+            time.sleep(0.05)
+        assert store.is_revoked(jti)
+    finally:
+        store.stop()
+
+
+def test_unloaded_store_answers_from_the_table(client):
+    jti = uuid.uuid4().hex
+    revoke_elsewhere(jti)
+    store = RevocationStore()
+    assert store.is_revoked(jti)
+    assert not store.is_revoked(uuid.uuid4().hex)
@@ -0,0 +1,121 @@
+import csv
+import io
+import json
+from datetime import datetime, timedelta
+import pytest
+from openpyxl import load_workbook
+from app.function import statement
+from app.function.statement import STATEMENT_COLUMNS
+from app.models.TransactionModel import CREDIT_TYPES
+
+BASE = datetime(2026, 2, 1, 8)
+TYPES = ["Deposit", "Withdrawal", "TransferIn", "TransferOut", "Interest"]
+
+
+@pytest.fixture
+def statement_account(make_user, make_account, add_transactions, monkeypatch):
+    """(number, headers, rows) for an account with 11 transactions, oldest first; rows are (id, type, amount, timestamp)."""
+    monkeypatch.setattr(statement, "FETCH_SIZE", 3)  # several partitions per download
+    owner, headers = make_user()
+    number = make_account(owner)
+    specs = [(TYPES[i % len(TYPES)], round(12.5 * (i + 1), 2), BASE + timedelta(days=i)) for i in range(11)]
+    ids = add_transactions(number, specs)
+    return number, headers, [(id_, *spec) for id_, spec in zip(ids, specs)]
+
+
+def signed(transaction_type: str, amount: float) -> float:
+    return amount if transaction_type in CREDIT_TYPES else -amount
+
+
+def download(client, number, headers, statement_format, **params):
+    response = client.get(
+        f"/accounts/{number}/statement", params={"format": statement_format, **params}, headers=headers
+    )
+    assert response.status_code == 200, response.text
+    assert response.headers["content-disposition"] == f'attachment; filename="statement_{number}.{statement_format}"'
+    return response
+
+
+def test_csv_statement(client, statement_account):
+    number, headers, rows = statement_account
+
+    response = download(client, number, headers, "csv")
+
+    assert response.headers["content-type"].startswith("text/csv")
+    reader = csv.reader(io.StringIO(response.text))
+    assert next(reader) == STATEMENT_COLUMNS
+    lines = list(reader)
+    assert [int(line[0]) for line in lines] == [row[0] for row in rows]
+    assert sum(signed(line[2], float(line[3])) for line in lines) == pytest.approx(
+        sum(signed(row[1], row[2]) for row in rows)
+    )
+
+
+def test_ndjson_statement(client, statement_account):
+    number, headers, rows = statement_account
+
+    response = download(client, number, headers, "ndjson")
+
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    records = [json.loads(line) for line in response.text.splitlines()]
+    assert all(list(record) == STATEMENT_COLUMNS for record in records)
+    assert [record["transaction_id"] for record in records] == [row[0] for row in rows]
+    assert sum(signed(r["transaction_type"], r["amount"]) for r in records) == pytest.approx(
+        sum(signed(row[1], row[2]) for row in rows)
+    )
+
+
+def test_xlsx_statement_splits_sheets(client, statement_account, monkeypatch):
+    number, headers, rows = statement_account
+    monkeypatch.setattr(statement, "XLSX_MAX_ROWS", 4)
+
+    response = download(client, number, headers, "xlsx")
+
+    workbook = load_workbook(io.BytesIO(response.content), read_only=True)
+    assert workbook.sheetnames == ["Statement 1", "Statement 2", "Statement 3"]
+    lines = []
+    for sheet in workbook.worksheets:
+        header, *body = sheet.iter_rows(values_only=True)
+        assert list(header) == STATEMENT_COLUMNS
+        assert len(body) <= 4
+        lines += body
+    assert [line[0] for line in lines] == [row[0] for row in rows]
+    assert [line[1] for line in lines] == [row[3] for row in rows]
+    assert sum(signed(line[2], line[3]) for line in lines) == pytest.approx(
+        sum(signed(row[1], row[2]) for row in rows)
+    )
+
+
+def test_date_range_limits_the_rows(client, statement_account):
+    number, headers, rows = statement_account
+    from_date, to_date = BASE + timedelta(days=2), BASE + timedelta(days=6)
+
+    response = download(client, number, headers, "ndjson", from_date=from_date.isoformat(), to_date=to_date.isoformat())
+
+    ids = [json.loads(line)["transaction_id"] for line in response.text.splitlines()]
+    assert ids == [row[0] for row in rows if from_date <= row[3] < to_date] and len(ids) == 4
+
+
+@pytest.mark.parametrize("statement_format", ["csv", "ndjson", "xlsx"])
+def test_empty_statement(client, make_user, make_account, statement_format):
+    owner, headers = make_user()
+    number = make_account(owner)
+
+    response = download(client, number, headers, statement_format)
+
+    if statement_format == "csv":
+        assert response.text.splitlines() == [",".join(STATEMENT_COLUMNS)]
+    elif statement_format == "ndjson":
+        assert response.text == ""
+    else:
+        sheet = load_workbook(io.BytesIO(response.content), read_only=True)["Statement 1"]
+        assert [list(row) for row in sheet.iter_rows(values_only=True)] == [STATEMENT_COLUMNS]
+
+
+def test_statement_of_another_customer_is_forbidden(client, statement_account, make_user):
+    number, _, _ = statement_account
+    _, stranger = make_user()
+    _, auditor = make_user("Auditor")
+
+    assert client.get(f"/accounts/{number}/statement", headers=stranger).status_code == 403
+    assert client.get(f"/accounts/{number}/statement", headers=auditor).status_code == 200
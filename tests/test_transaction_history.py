@@ -0,0 +1,105 @@
+from datetime import datetime, timedelta
+import pytest
+
+BASE = datetime(2026, 1, 10, 9)
+
+
+@pytest.fixture
+def history(make_user, make_account, add_transactions):
+    """(number, headers, rows) for an account with 23 transactions; rows are (id, type, amount, timestamp)."""
+    owner, headers = make_user()
+    number = make_account(owner)
+    types = ["Deposit", "Withdrawal", "TransferIn", "TransferOut", "Interest"]
+    specs = [
+        # Pairs share a timestamp, so pages have to break ties on transaction_id
+        (types[i % len(types)], float(10 * (i + 1)), BASE + timedelta(hours=i // 2))
+        for i in range(23)
+    ]
+    ids = add_transactions(number, specs)
+    return number, headers, [(id_, *spec) for id_, spec in zip(ids, specs)]
+
+
+def read_all(client, number, headers, limit, **params) -> list:
+    seen, cursor, pages = [], None, 0
+    while True:
+        response = client.get(
+            f"/accounts/transactions/{number}",
+            params={"limit": limit, **params, **({"cursor": cursor} if cursor else {})}, headers=headers,
+        )
+        assert response.status_code == 200, response.text
+        page = response.json()
+        assert len(page["data"]) <= limit
+        seen += page["data"]
+        pages += 1
+        cursor = page["next_cursor"]
+        if not cursor:
+            return seen
+        assert pages < 100, "cursor never ran out"
+
+
+def newest_first(rows) -> list:
+    return [row[0] for row in sorted(rows, key=lambda row: (row[3], row[0]), reverse=True)]
+
+
+@pytest.mark.parametrize("limit", [1, 4, 5, 23, 50])
+def test_cursor_pages_have_no_duplicates_or_gaps(client, history, limit):
+    number, headers, rows = history
+
+    seen = read_all(client, number, headers, limit)
+
+    assert [row["transaction_id"] for row in seen] == newest_first(rows)
+
+
+def test_pages_return_description_and_reference(client, history):
+    number, headers, rows = history
+    first = read_all(client, number, headers, 50)[-1]
+    assert first["transaction_id"] == rows[0][0]
+    assert (first["description"], first["reference"]) == ("Deposit 10", None)
+
+
+def test_type_filter(client, history):
+    number, headers, rows = history
+
+    seen = read_all(client, number, headers, 2, transaction_type="TransferIn")
+
+    assert [row["transaction_id"] for row in seen] == newest_first(r for r in rows if r[1] == "TransferIn")
+    assert {row["transaction_type"] for row in seen} == {"TransferIn"}
+
+
+def test_date_filter_includes_from_and_excludes_to(client, history):
+    number, headers, rows = history
+    from_date, to_date = BASE + timedelta(hours=3), BASE + timedelta(hours=7)
+
+    seen = read_all(client, number, headers, 3, from_date=from_date.isoformat(), to_date=to_date.isoformat())
+
+    assert [row["transaction_id"] for row in seen] == newest_first(r for r in rows if from_date <= r[3] < to_date)
+    assert len(seen) == 8
+
+
+def test_amount_filter_is_inclusive(client, history):
+    number, headers, rows = history
+
+    seen = read_all(client, number, headers, 3, min_amount=50, max_amount=120)
+
+    assert [row["transaction_id"] for row in seen] == newest_first(r for r in rows if 50 <= r[2] <= 120)
+    assert len(seen) == 8
+
+
+def test_filters_combine(client, history):
+    number, headers, rows = history
+
+    seen = read_all(
+        client, number, headers, 1,
+        transaction_type="Deposit", min_amount=100, to_date=(BASE + timedelta(hours=10)).isoformat(),
+    )
+
+    expected = newest_first(
+        r for r in rows if r[1] == "Deposit" and r[2] >= 100 and r[3] < BASE + timedelta(hours=10)
+    )
+    assert [row["transaction_id"] for row in seen] == expected and len(expected) == 2
+
+
+def test_invalid_cursor_is_rejected(client, history):
+    number, headers, _ = history
+    response = client.get(f"/accounts/transactions/{number}", params={"cursor": "not-a-cursor"}, headers=headers)
+    assert response.status_code == 400
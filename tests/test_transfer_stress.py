@@ -0,0 +1,67 @@
+"""
+Concurrency stress test for ledger.transfer: many threads move money back
+and forth between a few accounts (including A->B and B->A at the same
+time). Money must be conserved, no balance may go negative and every
+transfer must have both legs.
+"""
+import random
+import threading
+from sqlalchemy import func
+from app.models import Account, Transaction
+from app.function.ledger import transfer
+
+THREADS = 16
+TRANSFERS_PER_THREAD = 50
+
+
+def test_concurrent_transfers_conserve_money(ledger_db):
+    Session, _ = ledger_db
+    db = Session()
+    ids = [row.account_id for row in db.query(Account.account_id)]
+    total_before = db.query(func.sum(Account.balance)).scalar()
+    db.close()
+
+    errors, applied = [], []
+
+    def worker():
+        rng = random.Random()
+        for _ in range(TRANSFERS_PER_THREAD):
+            source, target = rng.sample(ids, 2)
+            db = Session()
+            try:
+                # Large amounts so some transfers hit insufficient funds
+                result = transfer(db, source, target, float(rng.randint(1, 500_000)), "stress")
+                applied.append(result.applied)
+            except Exception as e:
+                errors.append(e)
+            finally:
+                db.close()
+
+    pool = [threading.Thread(target=worker) for _ in range(THREADS)]
+    for t in pool:
+        t.start()
+    for t in pool:
+        t.join()
+
+    db = Session()
+    try:
+        total_after = db.query(func.sum(Account.balance)).scalar()
+        negative = db.query(func.count()).select_from(Account).filter(Account.balance < 0).scalar()
+        unpaired = (
+            db.query(Transaction.reference)
+            .filter(Transaction.reference.isnot(None))
+            .group_by(Transaction.reference)
+            .having(func.count() != 2)
+            .count()
+        )
+        legs = db.query(func.count()).select_from(Transaction).scalar()
+    finally:
+        db.close()
+
+    assert errors == []
+    assert len(applied) == THREADS * TRANSFERS_PER_THREAD
+    assert any(applied)
+    assert total_after == total_before
+    assert negative == 0
+    assert unpaired == 0
+    assert legs == 2 * sum(applied)
@@ -0,0 +1,50 @@
+from app.core.velocity import VelocityGuard, velocity_guard
+
+
+def test_limits_count_and_amount_per_window():
+    guard = VelocityGuard({"account": [(2, 0), (0, 0), (0, 0)], "user": [(0, 0), (0, 250.0), (0, 0)]})
+
+    assert guard.admit(1, 10, 100.0, at=1000.0).rejected is None
+    assert guard.admit(1, 10, 100.0, at=1001.0).rejected is None
+    assert "withdrawals per 1m" in guard.admit(1, 10, 1.0, at=1002.0).rejected       # 3rd in a minute
+    assert "withdrawn per 1h" in guard.admit(2, 10, 100.0, at=1003.0).rejected       # user sum over 250
+    assert guard.admit(1, 10, 10.0, at=1070.0).rejected is None                      # 1m window moved on
+
+
+def test_cancel_takes_a_withdrawal_back():
+    guard = VelocityGuard({"account": [(1, 0), (0, 0), (0, 0)], "user": [(0, 0), (0, 0), (0, 0)]})
+
+    admission = guard.admit(1, 10, 50.0, at=1000.0)
+    guard.cancel(admission)
+
+    assert guard.admit(1, 10, 50.0, at=1001.0).rejected is None
+
+
+def test_transfer_counts_against_withdrawal_limits(client, make_user, make_account):
+    user, headers = make_user()
+    source, target = make_account(user, 10000.0), make_account(user, 0.0)
+    limits = velocity_guard.limits["account"]
+    velocity_guard.limits["account"] = [(1, 0), (0, 0), (0, 0)]
+    try:
+        form = {"from_account_number": source, "to_account_number": target, "amount": "10", "secret_code": "1234"}
+        assert client.post("/accounts/transfer", data=form, headers=headers).status_code == 200
+        blocked = client.post("/accounts/transfer", data=form, headers=headers)
+        withdrawal = client.post(
+            "/accounts/withdraw", data={"account_number": source, "amount": "10", "secret_code": "1234"}, headers=headers
+        )
+    finally:
+        velocity_guard.limits["account"] = limits
+
+    assert blocked.status_code == 429
+    assert withdrawal.status_code == 429
+
+
+def test_load_counts_outgoing_transfers(client, make_user, make_account):
+    user, headers = make_user()
+    source, target = make_account(user, 10000.0), make_account(user, 0.0)
+    form = {"from_account_number": source, "to_account_number": target, "amount": "10", "secret_code": "1234"}
+    assert client.post("/accounts/transfer", data=form, headers=headers).status_code == 200
+
+    velocity_guard.load()
+
+    assert velocity_guard._counters[("user", user.user_table_id)].windows[-1].count == 1